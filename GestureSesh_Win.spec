@@ -10,7 +10,7 @@ project_root = Path(".").resolve()
 
 
 a = Analysis(
-    ['src/gesturesesh/main.py'],
+    ['run.py'],
     pathex=[str(project_root), str(project_root / "src")],
     binaries=[],
     datas=[('sounds/*.mp3', 'sounds')],
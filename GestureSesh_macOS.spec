@@ -9,7 +9,7 @@ block_cipher = None
 hiddenimports = collect_submodules('pygame')
 
 a = Analysis(
-    ['src/gesturesesh/main.py'],
+    ['run.py'],
     pathex=['src'],
     binaries=[],
     datas=[('sounds/*.mp3', 'sounds')],
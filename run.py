@@ -12,8 +12,8 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-# Import and run the main function
-from gesturesesh.main import main
+# Import and run the command-line entry point (opens the setup window by default)
+from gesturesesh.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# __main__.py - python -m gesturesesh
+import sys
+
+from gesturesesh.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+# animation.py - Streaming playback of multi-frame references (GIF, WebP, APNG)
+from __future__ import annotations
+
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PyQt5 import QtGui
+
+# Browsers treat tiny GIF delays as "as fast as possible" and clamp them.
+MIN_FRAME_DELAY_MS = 20
+DEFAULT_FRAME_DELAY_MS = 100
+# Decoded frames kept in memory per animation.
+DEFAULT_CACHE_BYTES = 128 * 1024 * 1024
+# Frames decoded per call on the OpenCV (APNG) backend.
+OPENCV_CHUNK_FRAMES = 8
+# Extensions APNG files go by; these are read with OpenCV, not Qt.
+APNG_EXTENSIONS = (".png", ".apng")
+
+
+def qimage_to_cv(image: QtGui.QImage) -> np.ndarray:
+    """Copy a QImage into a BGR(A) numpy array, the layout the modifiers expect."""
+    has_alpha = image.hasAlphaChannel()
+    image = image.convertToFormat(QtGui.QImage.Format_ARGB32)
+    width, height = image.width(), image.height()
+    ptr = image.constBits()
+    ptr.setsize(image.byteCount())
+    # ARGB32 is stored as B, G, R, A bytes on little-endian machines
+    arr = np.frombuffer(ptr, np.uint8).reshape(height, image.bytesPerLine())
+    bgra = arr[:, : width * 4].reshape(height, width, 4)
+    if has_alpha:
+        return bgra.copy()
+    return np.ascontiguousarray(bgra[..., :3])
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _apng_frames(f) -> int:
+    """Frame count in the acTL chunk of the PNG open as *f*, 0 if none."""
+    f.seek(len(PNG_SIGNATURE))
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return 0
+        length = int.from_bytes(header[:4], "big")
+        kind = header[4:]
+        if kind == b"acTL":
+            return int.from_bytes(f.read(4), "big")
+        if kind in (b"IDAT", b"IEND"):
+            return 0
+        f.seek(length + 4, os.SEEK_CUR)  # data + CRC
+
+
+def _skip_gif_sub_blocks(f) -> None:
+    while True:
+        size = f.read(1)
+        if not size or not size[0]:
+            return
+        f.seek(size[0], os.SEEK_CUR)
+
+
+def _gif_has_frames(f, wanted: int) -> bool:
+    """True if the GIF open as *f* has at least *wanted* images."""
+    f.seek(10)
+    screen = f.read(3)
+    if len(screen) < 3:
+        return False
+    if screen[0] & 0x80:  # global colour table
+        f.seek(3 << ((screen[0] & 7) + 1), os.SEEK_CUR)
+    images = 0
+    while True:
+        block = f.read(1)
+        if block == b",":  # image descriptor
+            images += 1
+            if images >= wanted:
+                return True
+            descriptor = f.read(9)
+            if len(descriptor) < 9:
+                return False
+            if descriptor[8] & 0x80:  # local colour table
+                f.seek(3 << ((descriptor[8] & 7) + 1), os.SEEK_CUR)
+            f.seek(1, os.SEEK_CUR)  # LZW code size
+            _skip_gif_sub_blocks(f)
+        elif block == b"!":  # extension
+            f.seek(1, os.SEEK_CUR)
+            _skip_gif_sub_blocks(f)
+        else:  # trailer, or the file ends
+            return False
+
+
+def is_apng(path: str) -> bool:
+    """True if *path* is a PNG with an animation control (acTL) chunk."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(8) == PNG_SIGNATURE and _apng_frames(f) > 0
+    except OSError:
+        return False
+
+
+def is_multi_frame(path: str) -> bool:
+    """
+    True if *path* is an animation with more than one frame. Only headers
+    are read: PNG chunks up to the image data, GIF blocks up to the second
+    image and the WebP extended header; no frame is decoded.
+    """
+    if path.startswith(":/"):
+        return False
+    try:
+        with open(path, "rb") as f:
+            head = f.read(30)
+            if head.startswith(PNG_SIGNATURE):
+                return (
+                    os.path.splitext(path)[1].lower() in APNG_EXTENSIONS
+                    and hasattr(cv2, "imreadanimation")
+                    and _apng_frames(f) > 1
+                )
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return _gif_has_frames(f, 2)
+            if head[:4] == b"RIFF" and head[8:16] == b"WEBPVP8X" and len(head) > 20:
+                return bool(head[20] & 0x02)  # animation flag
+    except OSError:
+        pass
+    return False
+
+
+class FrameCache:
+    """LRU cache of decoded frames, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._frames: OrderedDict[int, np.ndarray] = OrderedDict()
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get(self, index: int) -> np.ndarray | None:
+        frame = self._frames.get(index)
+        if frame is not None:
+            self._frames.move_to_end(index)
+        return frame
+
+    def put(self, index: int, frame: np.ndarray) -> None:
+        if index in self._frames:
+            return
+        self._frames[index] = frame
+        self.bytes += frame.nbytes
+        # Always keep the newest frame, even if it alone exceeds the budget
+        while self.bytes > self.max_bytes and len(self._frames) > 1:
+            _, evicted = self._frames.popitem(last=False)
+            self.bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self.bytes = 0
+
+
+class _QtFrameSource:
+    """Sequential frame reader backed by QImageReader (GIF, WebP)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rewind()
+
+    def rewind(self):
+        self.reader = QtGui.QImageReader(self.path)
+        self.loop_count = self.reader.loopCount()
+
+    def read(self):
+        """Return (frame, delay_ms) for the next frame or None at the end."""
+        if not self.reader.canRead():
+            return None
+        image = self.reader.read()
+        if image.isNull():
+            return None
+        return qimage_to_cv(image), self.reader.nextImageDelay()
+
+
+class _OpenCVFrameSource:
+    """Chunked frame reader backed by cv2.imreadanimation (APNG)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rewind()
+
+    def rewind(self):
+        self._next = 0
+        self._pending = []
+        self._exhausted = False
+        self.loop_count = -1
+
+    def read(self):
+        if not self._pending and not self._exhausted:
+            ok, anim = cv2.imreadanimation(self.path, self._next, OPENCV_CHUNK_FRAMES)
+            frames = list(anim.frames) if ok else []
+            if self._next == 0 and ok:
+                # APNG stores 0 for "loop forever"
+                self.loop_count = anim.loop_count or -1
+            self._pending = list(zip(frames, list(anim.durations)))
+            self._next += len(frames)
+            if len(frames) < OPENCV_CHUNK_FRAMES:
+                self._exhausted = True
+        if not self._pending:
+            return None
+        frame, delay = self._pending.pop(0)
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGRA)
+        elif frame.shape[2] == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+        return frame, int(delay)
+
+
+class AnimatedImage:
+    """
+    Streams the frames of an animated image.
+
+    Frames are decoded incrementally in file order and kept in a bounded
+    FrameCache, so long animations never sit fully decoded in memory.
+    Callers ask for the frame to show at a given elapsed time; the clock
+    itself belongs to the caller (the session timer), which keeps pausing
+    and playback in step with the session.
+    """
+
+    def __init__(self, path: str, cache_bytes: int = DEFAULT_CACHE_BYTES):
+        self.path = path
+        if os.path.splitext(path)[1].lower() in APNG_EXTENSIONS:
+            self._source = _OpenCVFrameSource(path)
+        else:
+            self._source = _QtFrameSource(path)
+        self.cache = FrameCache(cache_bytes)
+        self._next_index = 0  # index of the frame the source reads next
+        self._offsets = [0]  # start time of every frame decoded so far
+        self._complete = False  # all frames seen, total duration known
+
+    @property
+    def duration_ms(self) -> int | None:
+        """Length of one loop, or None until the last frame was decoded."""
+        return self._offsets[-1] if self._complete else None
+
+    def _read_next(self) -> bool:
+        result = self._source.read()
+        if result is None:
+            self._complete = True
+            return False
+        frame, delay = result
+        if delay <= 0:
+            delay = DEFAULT_FRAME_DELAY_MS
+        delay = max(delay, MIN_FRAME_DELAY_MS)
+        index = self._next_index
+        if index == len(self._offsets) - 1:
+            self._offsets.append(self._offsets[-1] + delay)
+        self.cache.put(index, frame)
+        self._next_index += 1
+        return True
+
+    def frame(self, index: int) -> np.ndarray | None:
+        """Return frame *index*, decoding forward (or rewinding) as needed."""
+        cached = self.cache.get(index)
+        if cached is not None:
+            return cached
+        if index < self._next_index:
+            # Evicted earlier frame: restart the stream from the beginning
+            self._source.rewind()
+            self._next_index = 0
+        while self._next_index <= index:
+            if not self._read_next():
+                return None
+        return self.cache.get(index)
+
+    def index_at(self, elapsed_ms: float) -> int:
+        """Frame index to show *elapsed_ms* after the animation started."""
+        elapsed_ms = max(0.0, elapsed_ms)
+        # Decode ahead until the requested time is covered or the stream ends
+        while not self._complete and self._offsets[-1] <= elapsed_ms:
+            if not self._read_next():
+                break
+        total = self._offsets[-1]
+        if self._complete and total > 0 and elapsed_ms >= total:
+            if self._source.loop_count == 0:
+                return len(self._offsets) - 2  # play once, hold last frame
+            elapsed_ms %= total
+        return max(0, bisect_right(self._offsets, elapsed_ms) - 1)
+
+    def frame_at(self, elapsed_ms: float) -> tuple[int, np.ndarray | None]:
+        index = self.index_at(elapsed_ms)
+        return index, self.frame(index)
+
+    def time_to_next_frame(self, elapsed_ms: float) -> int:
+        """Milliseconds until the frame shown at *elapsed_ms* should change."""
+        index = self.index_at(elapsed_ms)
+        if self._complete and self._offsets[-1] > 0:
+            if self._source.loop_count == 0 and elapsed_ms >= self._offsets[-1]:
+                return DEFAULT_FRAME_DELAY_MS  # holding the last frame
+            elapsed_ms %= self._offsets[-1]
+        if index + 1 < len(self._offsets):
+            return max(1, int(self._offsets[index + 1] - elapsed_ms))
+        return DEFAULT_FRAME_DELAY_MS
@@ -0,0 +1,349 @@
+# cli.py - Start a session straight from the command line
+"""
+Usage::
+
+    python -m gesturesesh --folders refs/poses refs/hands --preset "Warmup" \\
+        --shuffle --seed 42
+    python -m gesturesesh --files a.jpg b.png --plan "ladder(30s, 2m, 5)" --dry-run
+
+    python -m gesturesesh --send next
+
+With --folders or --files the selection and schedule are built from the
+arguments and the session window opens directly, skipping the setup
+window; --dry-run prints the playlist with each slot's start time and
+length instead. Without either, the usual setup window opens.
+
+Only one copy runs per user: when GestureSesh is already running, a new
+launch hands its arguments to it (see gesturesesh.instance) and exits,
+and --send passes a session command such as "next" or "+30s".
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+
+from PyQt5.QtWidgets import QApplication
+
+from gesturesesh.decoders import supported_extensions
+from gesturesesh.instance import InstanceServer, send_message
+from gesturesesh.main import MainApp, SessionDisplay, create_application
+from gesturesesh.memory_budget import budget_from_config
+from gesturesesh.playlist import Playlist
+from gesturesesh.scanner import scan_folders
+from gesturesesh.schedule import ScheduleEntry, preset_entries
+from gesturesesh.schedule_plan import expand_plan
+from gesturesesh.timeline import SessionTimeline, format_duration
+from gesturesesh.tracing import DEFAULT_TRACE_FILE
+from gesturesesh.update_checker import get_config_dir, load_config
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gesturesesh",
+        description="Start a GestureSesh session. Without --folders or "
+        "--files the setup window opens.",
+    )
+    selection = parser.add_argument_group("images")
+    selection.add_argument(
+        "--folders", nargs="+", default=[], metavar="FOLDER",
+        help="folders to scan for images, recursively",
+    )
+    selection.add_argument(
+        "--files", nargs="+", default=[], metavar="FILE", help="individual images"
+    )
+    schedule = parser.add_argument_group("schedule").add_mutually_exclusive_group()
+    schedule.add_argument(
+        "--preset",
+        help="name of a preset saved in config.json (default: the one last used)",
+    )
+    schedule.add_argument(
+        "--plan",
+        help='one-line plan such as "breaks(5m, 3*(ladder(30s, 10m, 10m)))"',
+    )
+    parser.add_argument("--shuffle", action="store_true", help="shuffle the images")
+    parser.add_argument(
+        "--seed", type=int, help="seed for --shuffle, for a repeatable order"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="print the playlist and timings instead of starting the session",
+    )
+    parser.add_argument(
+        "--send", metavar="COMMAND",
+        help="send a command to the running session and exit: "
+        + ", ".join(SessionDisplay.REMOTE_COMMANDS),
+    )
+    parser.add_argument(
+        "--new-instance", action="store_true",
+        help="start a separate copy even if GestureSesh is already running",
+    )
+    # Read by gesturesesh.tracing at import; listed here for --help
+    parser.add_argument(
+        "--trace", nargs="?", const=DEFAULT_TRACE_FILE, metavar="FILE",
+        help="record a timing trace of the session",
+    )
+    return parser
+
+
+def read_config() -> dict:
+    config_path = get_config_dir() / "config.json"
+    return load_config(config_path) if config_path.exists() else {}
+
+
+def resolve_schedule(args, config: dict) -> list[ScheduleEntry]:
+    """
+    The session schedule from --plan or --preset, or else the preset the
+    setup window last used. Raises ValueError (PlanError included) for a
+    missing or malformed preset or plan.
+    """
+    if args.plan is not None:
+        return expand_plan(args.plan)
+    presets = config.get("presets", {})
+    name = args.preset
+    if name is None:
+        recent = config.get("recent_session", {}).get("recent_preset")
+        names = list(presets)
+        if not isinstance(recent, int) or not 0 <= recent < len(names):
+            raise ValueError("no schedule: give --preset or --plan")
+        name = names[recent]
+    if name not in presets:
+        known = ", ".join(sorted(presets)) or "none saved"
+        raise ValueError(f"no preset named {name!r} (presets: {known})")
+    preset = presets[name]
+    try:
+        if isinstance(preset, str):
+            return expand_plan(preset)
+        return preset_entries(preset)
+    except (TypeError, AttributeError) as e:
+        raise ValueError(f"preset {name!r} is malformed: {e}") from None
+
+
+def collect_files(args) -> tuple[list[str], list[str]]:
+    """
+    (selected files in order, notices about folders and files left out)
+    from --folders and --files.
+    """
+    extensions = supported_extensions()
+    result = scan_folders(args.folders, extensions)
+    notices = [f"Not a folder, skipped: {folder}" for folder in result.missing]
+    files, rejected = result.files, result.invalid
+    for file in args.files:
+        if os.path.splitext(file)[1].lower() in extensions and os.path.isfile(file):
+            files.append(file)
+        else:
+            rejected += 1
+    if rejected:
+        notices.append(f"{rejected} file(s) not added (unsupported or missing)")
+    return files, notices
+
+
+def prepare_session(
+    args, config: dict, files: list[str]
+) -> tuple[list[ScheduleEntry], Playlist, SessionTimeline]:
+    """
+    The schedule, playlist and timeline for a session over *files*.
+    Raises ValueError when the schedule can't be resolved or needs more
+    images than there are.
+    """
+    schedule = resolve_schedule(args, config)
+    if not schedule:
+        raise ValueError("the schedule is empty")
+    scheduled = sum(entry.images_shown for entry in schedule)
+    if scheduled > len(files):
+        raise ValueError(f"{scheduled} image(s) scheduled but only {len(files)} found")
+    playlist = Playlist(
+        files, schedule, shuffle=args.shuffle, rng=random.Random(args.seed)
+    )
+    return schedule, playlist, SessionTimeline(schedule)
+
+
+def format_playlist(playlist: Playlist, timeline: SessionTimeline) -> list[str]:
+    """One line per scheduled slot: number, start, length, image(s)."""
+    breaks = sum(1 for slot in range(len(timeline)) if timeline.is_break(slot))
+    images = sum(
+        len(playlist.slot_files(slot))
+        for slot in range(len(timeline))
+        if not timeline.is_break(slot)
+    )
+    lines = [
+        f"{images} image(s), {breaks} break(s), "
+        f"{format_duration(timeline.total)} total",
+        f"{'slot':>5} {'start':>8} {'length':>8}  image",
+    ]
+    for slot in range(len(timeline)):
+        image = "(break)" if playlist.is_break(slot) else " | ".join(playlist.slot_files(slot))
+        lines.append(
+            f"{slot + 1:>5} {format_duration(timeline.start(slot)):>8} "
+            f"{format_duration(timeline.duration(slot)):>8}  {image}"
+        )
+    return lines
+
+
+# Arguments a launch hands to the running instance
+OPEN_FIELDS = ("folders", "files", "preset", "plan", "shuffle", "seed")
+# The running instance scans the folders before replying
+OPEN_TIMEOUT_MS = 60_000
+
+
+def open_message(args) -> dict:
+    """The "open" request for *args*, with paths made absolute."""
+    message = {"cmd": "open"}
+    for field in OPEN_FIELDS:
+        message[field] = getattr(args, field)
+    message["folders"] = [os.path.abspath(path) for path in args.folders]
+    message["files"] = [os.path.abspath(path) for path in args.files]
+    return message
+
+
+def args_from_message(message: dict) -> argparse.Namespace:
+    """Parsed arguments for an "open" request; ValueError if malformed."""
+    args = build_parser().parse_args([])
+    for field in OPEN_FIELDS:
+        if field not in message:
+            continue
+        value = message[field]
+        default = getattr(args, field)
+        if isinstance(default, list):
+            valid = isinstance(value, list) and all(isinstance(v, str) for v in value)
+        elif isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif field == "seed":
+            valid = value is None or isinstance(value, int)
+        else:
+            valid = value is None or isinstance(value, str)
+        if not valid:
+            raise ValueError(f"invalid {field!r} in open request")
+        setattr(args, field, value)
+    return args
+
+
+def open_sessions() -> list[SessionDisplay]:
+    return [
+        widget
+        for widget in QApplication.topLevelWidgets()
+        if isinstance(widget, SessionDisplay) and widget.isVisible()
+    ]
+
+
+class RemoteControl:
+    """
+    Carries out requests from later launches and control scripts in the
+    running instance: "open" and "show" start a session or raise the
+    setup window, anything else goes to the session window in front.
+    """
+
+    def __init__(self):
+        self.setup_window = None
+        # Sessions started here have no setup window holding on to them
+        self.session = None
+
+    def handle(self, message: dict) -> str:
+        command = message["cmd"]
+        if command == "open":
+            return self.open(args_from_message(message))
+        if command == "show":
+            self.show_setup_window()
+            return ""
+        session = self.active_session()
+        if session is None:
+            raise ValueError("no session is running")
+        session.run_remote_command(command)
+        return ""
+
+    def active_session(self) -> SessionDisplay | None:
+        sessions = open_sessions()
+        if QApplication.activeWindow() in sessions:
+            return QApplication.activeWindow()
+        return sessions[-1] if sessions else None
+
+    def open(self, args) -> str:
+        if not (args.folders or args.files):
+            self.show_setup_window()
+            return ""
+        files, notices = collect_files(args)
+        config = read_config()
+        schedule, playlist, timeline = prepare_session(args, config, files)
+        # One session at a time: the new one replaces any running
+        for session in open_sessions():
+            session.close()
+        self.start_session(schedule, playlist, timeline, config)
+        return "\n".join(notices)
+
+    def start_session(self, schedule, playlist, timeline, config):
+        self.session = SessionDisplay(
+            schedule=schedule,
+            items=playlist,
+            total=sum(entry.images for entry in schedule),
+            timeline=timeline,
+            memory_budget=budget_from_config(config),
+        )
+        self.session.show()
+        self.session.raise_()
+        self.session.activateWindow()
+
+    def show_setup_window(self):
+        if self.setup_window is None:
+            self.setup_window = MainApp()
+        self.setup_window.show_and_activate()
+
+
+def report(reply: dict) -> int:
+    """Prints the running instance's reply; the exit status for it."""
+    if not reply.get("ok"):
+        print(f"gesturesesh: {reply.get('error')}", file=sys.stderr)
+        return 1
+    if reply.get("message"):
+        print(reply["message"])
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    # Duplicate scans hash images in worker processes; frozen builds need this
+    multiprocessing.freeze_support()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.send:
+        reply = send_message({"cmd": args.send})
+        if reply is None:
+            print("gesturesesh: GestureSesh is not running", file=sys.stderr)
+            return 1
+        return report(reply)
+    if not (args.dry_run or args.new_instance):
+        reply = send_message(open_message(args), timeout_ms=OPEN_TIMEOUT_MS)
+        if reply is not None:
+            return report(reply)
+
+    session = None
+    if args.folders or args.files:
+        files, notices = collect_files(args)
+        for notice in notices:
+            print(notice, file=sys.stderr)
+        config = read_config()
+        try:
+            session = prepare_session(args, config, files)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.dry_run:
+            print("\n".join(format_playlist(*session[1:])))
+            return 0
+    elif args.dry_run:
+        parser.error("--dry-run needs --folders or --files")
+
+    app = create_application()
+    control = RemoteControl()
+    server = InstanceServer(control.handle)
+    # Another copy may have started meanwhile; this one then runs unreachable
+    if not args.new_instance:
+        server.listen()
+    if session is None:
+        control.show_setup_window()
+    else:
+        control.start_session(*session, config)
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
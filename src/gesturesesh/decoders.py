@@ -0,0 +1,428 @@
+# decoders.py - Pluggable image decoder registry
+"""
+Decoders are registered with the file extensions and magic bytes they
+understand, a relative cost (lower is faster) and whether they can decode
+straight to a reduced size. For each file the cheapest available decoder
+whose signature matches the content is used; the extension is only a
+fallback for formats without a reliable signature.
+
+Every decoder takes a bytes-like buffer and returns a BGR, BGRA or
+single-channel uint8 numpy array (or None), the layout the session's
+image modifiers work on.
+"""
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+import cv2
+import numpy as np
+from PyQt5 import QtCore, QtGui
+
+from gesturesesh.animation import qimage_to_cv
+
+# Bytes of the file needed to match every registered signature.
+MAGIC_BYTES = 32
+
+
+@dataclass(frozen=True)
+class Decoder:
+    name: str
+    extensions: frozenset[str]
+    # decode(data, reduce) -> image; reduce is 1, 2, 4 or 8
+    decode: Callable[[object, int], np.ndarray | None]
+    cost: int = 10
+    can_reduce: bool = False
+    # head -> True if the content is in this decoder's format
+    sniff: Callable[[bytes], bool] | None = None
+    # Probed lazily, so optional libraries are only imported when needed
+    available: Callable[[], bool] = lambda: True
+
+
+_registry: list[Decoder] = []
+
+
+def register_decoder(decoder: Decoder) -> None:
+    """Add *decoder*, replacing any decoder registered under the same name."""
+    _registry[:] = [d for d in _registry if d.name != decoder.name]
+    _registry.append(decoder)
+    _registry.sort(key=lambda d: d.cost)
+    supported_extensions.cache_clear()
+
+
+def registered_decoders() -> list[Decoder]:
+    return list(_registry)
+
+
+@lru_cache(maxsize=None)
+def supported_extensions() -> frozenset[str]:
+    """Extensions at least one available decoder can read."""
+    return frozenset(
+        ext for decoder in _registry if decoder.available() for ext in decoder.extensions
+    )
+
+
+def candidates(ext: str, head: bytes) -> list[Decoder]:
+    """
+    Available decoders for a file, cheapest first. Content signatures win
+    over the extension, so a PNG saved as .jpg still decodes.
+    """
+    ext = ext.lower()
+    sniffed = [
+        d for d in _registry if d.sniff is not None and d.sniff(head) and d.available()
+    ]
+    if sniffed:
+        return sniffed
+    return [d for d in _registry if ext in d.extensions and d.available()]
+
+
+def choose_decoder(ext: str, head: bytes, reduce: int = 1) -> Decoder | None:
+    """Fastest decoder for the file; for reduce > 1, prefer one that can reduce."""
+    found = candidates(ext, head)
+    if not found:
+        return None
+    if reduce > 1:
+        reducing = [d for d in found if d.can_reduce]
+        if reducing:
+            return reducing[0]
+    return found[0]
+
+
+def decode_buffer(
+    data, ext: str, reduce: int = 1, require_reduce: bool = False
+) -> np.ndarray | None:
+    """
+    Decode the bytes-like *data* of a file with extension *ext*. Falls
+    through to the next candidate if a decoder fails. With
+    *require_reduce* only decoders that can decode at reduced size are
+    tried (used for previews, where a full decode is too slow).
+    """
+    head = bytes(data[:MAGIC_BYTES])
+    found = candidates(ext, head)
+    if reduce > 1:
+        found = [d for d in found if d.can_reduce] + (
+            [] if require_reduce else [d for d in found if not d.can_reduce]
+        )
+    for decoder in found:
+        try:
+            image = decoder.decode(data, reduce if decoder.can_reduce else 1)
+        except Exception as e:  # any decoder bug means "this one failed"
+            print(f"{decoder.name} decoder failed: {e!r}")
+            continue
+        if image is not None and image.size:
+            return to_8bit(image)
+    return None
+
+
+def to_8bit(image: np.ndarray) -> np.ndarray:
+    """Scale 16-bit and float images down to uint8."""
+    if image.dtype == np.uint8:
+        return image
+    if image.dtype == np.uint16:
+        return (image >> 8).astype(np.uint8)
+    return np.clip(image * 255.0, 0, 255).astype(np.uint8)
+
+
+# ---------------------------------------------------------------------------
+#                              OpenCV
+# ---------------------------------------------------------------------------
+_REDUCED_COLOR = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def _decode_jpeg(data, reduce):
+    # IMREAD_COLOR applies EXIF orientation; libjpeg scales in the DCT
+    flag = _REDUCED_COLOR.get(reduce, cv2.IMREAD_COLOR)
+    return cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+
+
+def _decode_opencv(data, reduce):
+    # IMREAD_UNCHANGED keeps the alpha channel
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+
+
+@lru_cache(maxsize=None)
+def opencv_can_read(ext: str) -> bool:
+    """True if this OpenCV build round-trips *ext* (codecs are build options)."""
+    try:
+        ok, encoded = cv2.imencode(ext, np.zeros((8, 8, 3), np.uint8))
+        return bool(ok) and cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED) is not None
+    except cv2.error:
+        return False
+
+
+def _is_jpeg(head):
+    return head[:3] == b"\xff\xd8\xff"
+
+
+def _is_png(head):
+    return head[:8] == b"\x89PNG\r\n\x1a\n"
+
+
+def _is_bmp(head):
+    return head[:2] == b"BM"
+
+
+def _is_webp(head):
+    return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+
+
+def _is_tiff(head):
+    return head[:4] in (b"II*\0", b"MM\0*")
+
+
+def _is_gif(head):
+    return head[:6] in (b"GIF87a", b"GIF89a")
+
+
+def _is_psd(head):
+    return head[:4] == b"8BPS"
+
+
+def _isobmff_brand(head):
+    """Major brand of an ISO-BMFF file (HEIF/AVIF), or b''."""
+    if head[4:8] != b"ftyp":
+        return b""
+    return head[8:12]
+
+
+def _is_avif(head):
+    return _isobmff_brand(head) in (b"avif", b"avis")
+
+
+def _is_heic(head):
+    return _isobmff_brand(head) in (b"heic", b"heix", b"hevc", b"heim", b"heis", b"mif1", b"msf1")
+
+
+# ---------------------------------------------------------------------------
+#                                Qt
+# ---------------------------------------------------------------------------
+def _decode_qt(data, reduce):
+    image = QtGui.QImage.fromData(QtCore.QByteArray(bytes(data)))
+    if image.isNull():
+        return None
+    return qimage_to_cv(image)
+
+
+@lru_cache(maxsize=None)
+def qt_formats() -> frozenset[str]:
+    return frozenset(
+        "." + bytes(fmt).decode() for fmt in QtGui.QImageReader.supportedImageFormats()
+    )
+
+
+def _qt_can(ext):
+    return lambda: ext in qt_formats()
+
+
+# ---------------------------------------------------------------------------
+#                    Pillow (optional: HEIC / AVIF plugins)
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def pillow_can_read(fmt: str) -> bool:
+    """True if Pillow (with pillow-heif/AVIF support if needed) is installed."""
+    try:
+        from PIL import Image, features
+    except ImportError:
+        return False
+    if fmt == "avif" and features.check("avif"):
+        return True
+    try:
+        import pillow_heif
+    except ImportError:
+        return False
+    if fmt == "avif":
+        if not hasattr(pillow_heif, "register_avif_opener"):
+            return False
+        pillow_heif.register_avif_opener()
+    else:
+        pillow_heif.register_heif_opener()
+    return True
+
+
+def _decode_pillow(data, reduce):
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        rgb = np.asarray(image)
+    if rgb.shape[2] == 4:
+        return cv2.cvtColor(rgb, cv2.COLOR_RGBA2BGRA)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+# ---------------------------------------------------------------------------
+#                     PSD / PSB (merged composite image)
+# ---------------------------------------------------------------------------
+def _unpack_bits(data: bytes, size: int) -> bytes:
+    """Decode one PackBits-compressed row."""
+    out = bytearray()
+    pos, end = 0, len(data)
+    while pos < end and len(out) < size:
+        n = data[pos]
+        pos += 1
+        if n < 128:  # literal run of n + 1 bytes
+            out += data[pos : pos + n + 1]
+            pos += n + 1
+        elif n > 128:  # next byte repeated 257 - n times
+            out += data[pos : pos + 1] * (257 - n)
+            pos += 1
+    return bytes(out[:size])
+
+
+# Channels a PSD colour mode needs: gray, RGB, CMYK
+PSD_MODE_CHANNELS = {1: 1, 3: 3, 4: 4}
+
+
+def decode_psd(data, reduce=1) -> np.ndarray | None:
+    """
+    Decode the flattened composite stored at the end of a PSD/PSB file.
+    Layers are ignored; Photoshop saves this composite unless
+    "Maximize compatibility" was turned off.
+    """
+    data = memoryview(data)
+    if bytes(data[:4]) != b"8BPS":
+        return None
+    version = int.from_bytes(data[4:6], "big")
+    channels = int.from_bytes(data[12:14], "big")
+    height = int.from_bytes(data[14:18], "big")
+    width = int.from_bytes(data[18:22], "big")
+    depth = int.from_bytes(data[22:24], "big")
+    mode = int.from_bytes(data[24:26], "big")
+    if depth not in (8, 16) or mode not in (1, 3, 4):  # gray, RGB, CMYK
+        raise ValueError(f"unsupported PSD depth {depth} / mode {mode}")
+    if channels < PSD_MODE_CHANNELS[mode]:
+        raise ValueError(f"PSD mode {mode} with only {channels} channels")
+    pos = 26
+    # Colour mode data, image resources, layer & mask info
+    for length_bytes in (4, 4, 8 if version == 2 else 4):
+        length = int.from_bytes(data[pos : pos + length_bytes], "big")
+        pos += length_bytes + length
+    compression = int.from_bytes(data[pos : pos + 2], "big")
+    pos += 2
+    row_bytes = width * depth // 8
+    plane_bytes = row_bytes * height
+    if compression == 0:
+        raw = bytes(data[pos : pos + plane_bytes * channels])
+    elif compression == 1:
+        count_bytes = 4 if version == 2 else 2
+        counts = np.frombuffer(
+            data[pos : pos + count_bytes * channels * height],
+            dtype=">u4" if version == 2 else ">u2",
+        )
+        pos += count_bytes * channels * height
+        rows = []
+        for count in counts.tolist():
+            rows.append(_unpack_bits(data[pos : pos + count], row_bytes))
+            pos += count
+        raw = b"".join(rows)
+    else:
+        raise ValueError(f"unsupported PSD compression {compression}")
+    dtype = np.uint8 if depth == 8 else np.dtype(">u2")
+    planes = np.frombuffer(raw, dtype=dtype, count=channels * width * height)
+    planes = to_8bit(planes.reshape(channels, height, width).astype(
+        np.uint8 if depth == 8 else np.uint16
+    ))
+    if mode == 1:
+        return planes[0].copy()
+    if mode == 4:
+        # PSD stores CMYK inverted (255 = no ink)
+        c, m, y, k = (planes[i].astype(np.uint16) for i in range(4))
+        bgr = [(ch * k // 255).astype(np.uint8) for ch in (y, m, c)]
+        return cv2.merge(bgr)
+    bgr = [planes[2], planes[1], planes[0]]
+    if channels >= 4:
+        bgr.append(planes[3])
+    return cv2.merge(bgr)
+
+
+# ---------------------------------------------------------------------------
+#                          Built-in registrations
+# ---------------------------------------------------------------------------
+def _opencv_can(ext):
+    return lambda: opencv_can_read(ext)
+
+
+# Extra extensions served by the decoder for a format
+_ALIASES = {".png": {".png", ".apng"}, ".tif": {".tif", ".tiff"}}
+
+
+register_decoder(
+    Decoder(
+        "opencv-jpeg",
+        frozenset({".jpg", ".jpeg", ".jpe"}),
+        _decode_jpeg,
+        cost=1,
+        can_reduce=True,
+        sniff=_is_jpeg,
+    )
+)
+for _ext, _sniff in (
+    (".png", _is_png),
+    (".bmp", _is_bmp),
+    (".webp", _is_webp),
+    (".tif", _is_tiff),
+    (".avif", _is_avif),
+):
+    _exts = frozenset(_ALIASES.get(_ext, {_ext}))
+    register_decoder(
+        Decoder(
+            f"opencv{_ext}",
+            _exts,
+            _decode_opencv,
+            cost=2,
+            sniff=_sniff,
+            available=_opencv_can(_ext),
+        )
+    )
+for _ext, _sniff in (
+    (".gif", _is_gif),
+    (".webp", _is_webp),
+    (".tif", _is_tiff),
+    (".tga", None),
+):
+    _exts = frozenset(_ALIASES.get(_ext, {_ext}))
+    register_decoder(
+        Decoder(
+            f"qt{_ext}",
+            _exts,
+            _decode_qt,
+            cost=3,
+            sniff=_sniff,
+            available=_qt_can(_ext),
+        )
+    )
+register_decoder(
+    Decoder(
+        "pillow-heif",
+        frozenset({".heic", ".heif"}),
+        _decode_pillow,
+        cost=4,
+        sniff=_is_heic,
+        available=lambda: pillow_can_read("heif"),
+    )
+)
+register_decoder(
+    Decoder(
+        "pillow-avif",
+        frozenset({".avif"}),
+        _decode_pillow,
+        cost=4,
+        sniff=_is_avif,
+        available=lambda: pillow_can_read("avif"),
+    )
+)
+register_decoder(
+    Decoder(
+        "psd-composite",
+        frozenset({".psd", ".psb"}),
+        decode_psd,
+        cost=5,
+        sniff=_is_psd,
+    )
+)
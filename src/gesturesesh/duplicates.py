@@ -0,0 +1,483 @@
+# duplicates.py - Finding duplicate and near-duplicate images in a selection
+"""
+Files are compared by perceptual hashes rather than bytes, so the same
+picture saved in two folders, re-encoded or resized is still caught:
+
+* dHash: the sign of horizontal gradients on a 9x8 thumbnail.
+* pHash: the low frequencies of a 32x32 DCT against their median.
+
+Two files are near-duplicates when their pHashes differ in at most
+*distance* bits and their dHashes in at most twice that (dHash flips
+bits on flat gradients, which re-encoding nudges). Hashes are computed in a process pool from a
+reduced decode and cached in sqlite keyed by inode, mtime and size, so
+rescanning a library only decodes files that changed.
+
+Candidate pairs come from multi-index hashing: a 64-bit hash is split
+into distance + 1 chunks, and two hashes within *distance* bits agree
+exactly on at least one chunk (pigeonhole). Sorting by each chunk puts
+candidates next to each other, so the search is a handful of sorts and
+vectorized comparisons, O(n log n) for typical libraries.
+
+Byte-identical copies are found first and never decoded: files are
+bucketed by size, files sharing a size by a hash of their first and last
+64 KiB, and only files still colliding after that are read in full.
+"""
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import cv2
+import numpy as np
+from PyQt5 import QtCore
+
+from gesturesesh.decoders import decode_buffer
+from gesturesesh.image_loader import mapped_file
+
+# pHashes of two near-duplicates differ in at most this many bits (of 64)
+NEAR_DUPLICATE_DISTANCE = 4
+# Below this many files to hash, starting worker processes isn't worth it
+POOL_MIN_FILES = 64
+# Files handed to a worker at a time
+POOL_CHUNK = 32
+# Bytes read from each end of a file before reading all of it
+EDGE_BYTES = 64 * 1024
+# Reads while hashing whole files
+READ_BYTES = 1024 * 1024
+# Files read at once when comparing contents (the work is I/O-bound)
+IO_THREADS = 8
+
+ImageHash = tuple  # (dhash, phash), 64-bit ints
+
+
+# ---------------------------------------------------------------------------
+#                                 Hashing
+# ---------------------------------------------------------------------------
+def _pack_bits(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def _grayscale(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash of a grayscale image."""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    return _pack_bits(small[:, 1:] > small[:, :-1])
+
+
+def phash(gray: np.ndarray) -> int:
+    """64-bit DCT hash of a grayscale image."""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(small.astype(np.float32))[:8, :8]
+    # The DC term is the mean brightness; leave it out of the median
+    return _pack_bits(low > np.median(low.ravel()[1:]))
+
+
+def hash_image(image: np.ndarray) -> ImageHash:
+    gray = _grayscale(image)
+    return dhash(gray), phash(gray)
+
+
+def hash_file(path: str) -> ImageHash | None:
+    """(dhash, phash) of the file at *path*, or None if it can't be decoded."""
+    try:
+        with mapped_file(path) as data:
+            # Hashes look at 32x32 pixels at most; a 1/8 decode is plenty
+            image = decode_buffer(data, os.path.splitext(path)[1], reduce=8)
+    except (OSError, ValueError, cv2.error):
+        return None
+    if image is None:
+        return None
+    return hash_image(image)
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+# ---------------------------------------------------------------------------
+#                                  Cache
+# ---------------------------------------------------------------------------
+def _to_signed(value: int) -> int:
+    # sqlite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class HashCache:
+    """
+    Image hashes on disk, keyed by (device, inode) and checked against the
+    file's mtime and size, so a renamed file keeps its entry and an
+    edited one is hashed again.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " dev INTEGER, ino INTEGER, mtime_ns INTEGER, size INTEGER,"
+            " dhash INTEGER, phash INTEGER, PRIMARY KEY (dev, ino))"
+        )
+
+    def get(self, key) -> ImageHash | None:
+        dev, ino, mtime_ns, size = key
+        row = self._db.execute(
+            "SELECT dhash, phash FROM hashes"
+            " WHERE dev = ? AND ino = ? AND mtime_ns = ? AND size = ?",
+            (_to_signed(dev), _to_signed(ino), mtime_ns, size),
+        ).fetchone()
+        if row is None:
+            return None
+        return _to_unsigned(row[0]), _to_unsigned(row[1])
+
+    def put_many(self, items: Iterable[tuple[tuple, ImageHash]]) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (_to_signed(dev), _to_signed(ino), mtime_ns, size,
+                 _to_signed(hashes[0]), _to_signed(hashes[1]))
+                for (dev, ino, mtime_ns, size), hashes in items
+            ),
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def hash_files(
+    paths: Sequence[str], cache: HashCache | None = None, workers: int | None = None
+) -> list[ImageHash | None]:
+    """
+    Hashes for *paths*, in order (None for files that can't be read).
+    Cached hashes are reused; the rest are computed in a process pool of
+    *workers* processes (one per CPU by default, in this process for 1).
+    """
+    results: list[ImageHash | None] = [None] * len(paths)
+    missing, keys = [], {}
+    for index, path in enumerate(paths):
+        try:
+            key = _file_key(path)
+        except OSError:
+            continue
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            missing.append(index)
+            keys[index] = key
+        else:
+            results[index] = cached
+
+    todo = [paths[index] for index in missing]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(todo) < POOL_MIN_FILES:
+        computed = [hash_file(path) for path in todo]
+    else:
+        workers = min(workers, len(todo) // POOL_CHUNK + 1)
+        # Spawn, not fork: this runs on a pool thread of a Qt process, and
+        # forking a multi-threaded process can deadlock the children
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            computed = list(pool.map(hash_file, todo, chunksize=POOL_CHUNK))
+
+    new = []
+    for index, hashes in zip(missing, computed):
+        results[index] = hashes
+        if hashes is not None:
+            new.append((keys[index], hashes))
+    if cache is not None and new:
+        cache.put_many(new)
+    return results
+
+
+# ---------------------------------------------------------------------------
+#                               Exact copies
+# ---------------------------------------------------------------------------
+def edge_digest(path: str, size: int) -> bytes:
+    """BLAKE2 of the first and last EDGE_BYTES of a file (all of it if smaller)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        if size <= 2 * EDGE_BYTES:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(EDGE_BYTES))
+            f.seek(-EDGE_BYTES, os.SEEK_END)
+            digest.update(f.read(EDGE_BYTES))
+    return digest.digest()
+
+
+def full_digest(path: str) -> bytes:
+    """BLAKE2 of a whole file, read in READ_BYTES blocks into one buffer."""
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(READ_BYTES)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.digest()
+
+
+def _refine(groups, digest, pool):
+    """Split each group of (index, path, size) by *digest*; drop singletons."""
+    members = [member for group in groups for member in group]
+
+    def safe_digest(member):
+        try:
+            return digest(member[1], member[2])
+        except OSError:
+            return None
+
+    refined: dict[tuple, list] = {}
+    for member, value in zip(members, pool.map(safe_digest, members)):
+        if value is not None:
+            refined.setdefault((member[2], value), []).append(member)
+    return [group for group in refined.values() if len(group) > 1]
+
+
+def exact_duplicate_groups(
+    paths: Sequence[str], threads: int = IO_THREADS
+) -> list[list[int]]:
+    """
+    Groups of indices into *paths* whose files have identical contents,
+    each in index order. Hard links of one file are grouped without
+    reading it; other files are read only if another file has the same
+    size, and read in full only if their first and last EDGE_BYTES match
+    too.
+    """
+    by_inode: dict[tuple, list[int]] = {}
+    sizes = {}
+    for index, path in enumerate(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        by_inode.setdefault((stat.st_dev, stat.st_ino), []).append(index)
+        sizes[index] = stat.st_size
+
+    # One member per inode stands for its links while comparing contents
+    by_size: dict[int, list] = {}
+    for indices in by_inode.values():
+        first = indices[0]
+        by_size.setdefault(sizes[first], []).append((first, paths[first], sizes[first]))
+    groups = [group for group in by_size.values() if len(group) > 1]
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        groups = _refine(groups, edge_digest, pool)
+        small = [group for group in groups if group[0][2] <= 2 * EDGE_BYTES]
+        large = [group for group in groups if group[0][2] > 2 * EDGE_BYTES]
+        groups = small + _refine(large, lambda path, size: full_digest(path), pool)
+
+    edges = [(indices[0], index) for indices in by_inode.values() for index in indices[1:]]
+    edges += [(group[0][0], member[0]) for group in groups for member in group[1:]]
+    return _group(edges)
+
+
+# ---------------------------------------------------------------------------
+#                                 Search
+# ---------------------------------------------------------------------------
+if hasattr(np, "bitwise_count"):
+    def _popcount(values: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(values)
+else:  # numpy < 2.0
+    _BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(values: np.ndarray) -> np.ndarray:
+        as_bytes = values.view(np.uint8).reshape(-1, 8)
+        return _BYTE_BITS[as_bytes].sum(axis=1)
+
+
+def _chunks(distance):
+    """(shift, mask) of distance + 1 chunks covering 64 bits."""
+    count = distance + 1
+    widths = [64 // count + (1 if i < 64 % count else 0) for i in range(count)]
+    shift = 0
+    for width in widths:
+        yield shift, np.uint64((1 << width) - 1)
+        shift += width
+
+
+def near_pairs(hashes: np.ndarray, distance: int) -> np.ndarray:
+    """
+    Index pairs (i, j), i < j, of the uint64 *hashes* that differ in at
+    most *distance* bits. Pairs may repeat.
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    found = [np.empty((0, 2), dtype=np.intp)]
+    if len(hashes) < 2:
+        return found[0]
+    if distance >= 64:
+        i, j = np.triu_indices(len(hashes), 1)
+        return np.column_stack((i, j))
+    for shift, mask in _chunks(distance):
+        keys = (hashes >> np.uint64(shift)) & mask
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        # Walk each run of equal keys: compare every element with the
+        # ones `step` places after it while they're still in the same run
+        starts = np.flatnonzero(keys[:-1] == keys[1:])
+        step = 1
+        while starts.size:
+            first, second = order[starts], order[starts + step]
+            close = _popcount(hashes[first] ^ hashes[second]) <= distance
+            if close.any():
+                pair = np.column_stack((first[close], second[close]))
+                found.append(np.sort(pair, axis=1))
+            step += 1
+            starts = starts[starts + step < len(keys)]
+            starts = starts[keys[starts] == keys[starts + step]]
+    return np.concatenate(found)
+
+
+def _group(pairs):
+    """Connected components of the pairs' indices, each sorted, ordered by first index."""
+    parent: dict[int, int] = {}
+
+    def root(i):
+        parent.setdefault(i, i)
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in pairs:
+        ra, rb = root(a), root(b)
+        if ra != rb:
+            # The lowest index stays the root, so it's the copy kept
+            parent[max(ra, rb)] = min(ra, rb)
+    groups: dict[int, list[int]] = {}
+    for i in sorted(parent):
+        groups.setdefault(root(i), []).append(i)
+    return [members for _, members in sorted(groups.items())]
+
+
+def group_near_duplicates(
+    hashes: Sequence[ImageHash | None], distance: int = NEAR_DUPLICATE_DISTANCE
+) -> list[list[int]]:
+    """
+    Groups of indices into *hashes* whose pHashes differ in at most
+    *distance* bits and dHashes in at most 2 * *distance*. Each group is
+    in index order; None entries are never grouped.
+    """
+    valid = [i for i, h in enumerate(hashes) if h is not None]
+    if len(valid) < 2:
+        return []
+    values = np.array([hashes[i] for i in valid], dtype=np.uint64)
+    # Identical hashes are the common case; collapse them before searching
+    unique, first, inverse = np.unique(
+        values, axis=0, return_index=True, return_inverse=True
+    )
+    inverse = inverse.ravel()
+    copies = np.flatnonzero(first[inverse] != np.arange(len(inverse)))
+    edges = list(zip(first[inverse[copies]].tolist(), copies.tolist()))
+    candidates = near_pairs(unique[:, 1], distance)
+    if candidates.size:
+        dhash_close = (
+            _popcount(unique[candidates[:, 0], 0] ^ unique[candidates[:, 1], 0])
+            <= 2 * distance
+        )
+        close = candidates[dhash_close]
+        edges.extend(zip(first[close[:, 0]].tolist(), first[close[:, 1]].tolist()))
+    return [[valid[i] for i in members] for members in _group(edges)]
+
+
+def find_duplicates(
+    paths: Sequence[str],
+    distance: int = NEAR_DUPLICATE_DISTANCE,
+    cache: HashCache | None = None,
+    workers: int | None = None,
+    near: bool = True,
+) -> list[list[str]]:
+    """
+    Groups of duplicate files in *paths*, each in selection order, so
+    keeping the first of every group keeps the copy added first.
+    Byte-identical copies are always found; with *near*, so are copies
+    whose perceptual hashes are within *distance* (only one file of each
+    set of identical copies is decoded for that).
+    """
+    edges = [
+        (group[0], index)
+        for group in exact_duplicate_groups(paths)
+        for index in group[1:]
+    ]
+    if near:
+        copies = {index for _, index in edges}
+        kept = [index for index in range(len(paths)) if index not in copies]
+        hashes = hash_files([paths[index] for index in kept], cache, workers)
+        edges += [
+            (kept[group[0]], kept[index])
+            for group in group_near_duplicates(hashes, distance)
+            for index in group[1:]
+        ]
+    return [[paths[i] for i in members] for members in _group(edges)]
+
+
+# ---------------------------------------------------------------------------
+#                            Background scan
+# ---------------------------------------------------------------------------
+def default_cache_path() -> Path:
+    from gesturesesh.update_checker import get_config_dir
+
+    return get_config_dir() / "image_hashes.sqlite3"
+
+
+class DuplicateScanSignals(QtCore.QObject):
+    # generation, list of duplicate groups (None on failure)
+    finished = QtCore.pyqtSignal(int, object)
+
+
+class DuplicateScanTask(QtCore.QRunnable):
+    """
+    find_duplicates() for QThreadPool, so hashing a large library doesn't
+    block the UI. Like DecodeTask, the result carries the generation it
+    was started for so a stale scan can be ignored.
+    """
+
+    def __init__(self, paths, generation: int, signals: DuplicateScanSignals,
+                 cache_path=None, distance: int = NEAR_DUPLICATE_DISTANCE,
+                 near: bool = True):
+        super().__init__()
+        self.paths = list(paths)
+        self.generation = generation
+        self.signals = signals
+        self.cache_path = cache_path
+        self.distance = distance
+        self.near = near
+
+    def run(self):
+        try:
+            with HashCache(self.cache_path or default_cache_path()) as cache:
+                groups = find_duplicates(
+                    self.paths, self.distance, cache, near=self.near
+                )
+        except Exception as e:  # must not escape into the thread pool
+            print(f"Duplicate scan failed: {e!r}")
+            groups = None
+        try:
+            self.signals.finished.emit(self.generation, groups)
+        except RuntimeError:
+            pass  # main window was deleted while scanning
@@ -0,0 +1,153 @@
+# grid.py - Several images side by side in one session slot
+"""
+A grid slot (ScheduleEntry.per_slot > 1) shows its images as one picture:
+they are decoded in parallel, each no larger than its share of the screen
+needs, then scaled to a common height per row and pasted once onto a
+canvas no larger than the screen. The session caches that canvas like any
+decoded image, so flips, grayscale and the other modifiers apply to the
+composite and toggling them never decodes again.
+
+Layouts: 2 and 3 images in a row, 4 in two rows of two.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+from gesturesesh.image_loader import decode_file, image_size
+from gesturesesh.memory_budget import REDUCE_FACTORS
+from gesturesesh.tracing import traced
+
+# Device pixels between neighbouring images
+GAP = 8
+# Canvas colour around and between the images (BGR of the window background)
+BACKGROUND = (78, 56, 30)
+
+
+def grid_rows(count: int) -> list[int]:
+    """How many of *count* images go in each row."""
+    if count == 4:
+        return [2, 2]
+    return [count]
+
+
+def layout(
+    sizes: Sequence[tuple[int, int]], width: int, height: int, gap: int = GAP
+) -> list[tuple[int, int]]:
+    """
+    The (width, height) each image of *sizes* is shown at so that the
+    grid fits *width* x *height*: every image in a row gets the same
+    height, as large as fits, but no larger than the row's tallest image.
+    """
+    rows = grid_rows(len(sizes))
+    row_height = (height - gap * (len(rows) - 1)) / len(rows)
+    shown, start = [], 0
+    for count in rows:
+        row = sizes[start:start + count]
+        start += count
+        aspects = [w / h for w, h in row]
+        target = min(
+            row_height,
+            (width - gap * (count - 1)) / sum(aspects),
+            max(h for _, h in row),
+        )
+        target = max(1, int(target))
+        shown += [(max(1, round(target * aspect)), target) for aspect in aspects]
+    return shown
+
+
+def reduce_for(size: tuple[int, int] | None, target: tuple[int, int]) -> int:
+    """The largest decode reduction of *size* still covering *target*."""
+    if size is None:
+        return 1
+    return max(
+        factor
+        for factor in REDUCE_FACTORS
+        if factor == 1 or (size[0] // factor >= target[0] and size[1] // factor >= target[1])
+    )
+
+
+def _as_bgr(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        alpha = image[:, :, 3:].astype(np.float32) / 255
+        background = np.array(BACKGROUND, np.float32)
+        return (image[:, :, :3] * alpha + background * (1 - alpha)).astype(np.uint8)
+    return image
+
+
+def compose(
+    images: Sequence[np.ndarray | None], width: int, height: int, gap: int = GAP
+) -> np.ndarray | None:
+    """
+    *images* laid out by grid_rows() on one BGR canvas no larger than
+    *width* x *height*. An image that failed to decode (None) leaves its
+    place empty; None if none decoded.
+    """
+    if all(image is None for image in images):
+        return None
+    sizes = [
+        (1, 1) if image is None else (image.shape[1], image.shape[0]) for image in images
+    ]
+    decoded = [size for size, image in zip(sizes, images) if image is not None]
+    # Give failed images the shape of a decoded one, so the gap is even
+    sizes = [decoded[0] if image is None else size for size, image in zip(sizes, images)]
+    shown = layout(sizes, width, height, gap)
+    rows = grid_rows(len(images))
+    row_widths, row_heights, start = [], [], 0
+    for count in rows:
+        row = shown[start:start + count]
+        start += count
+        row_widths.append(sum(w for w, _ in row) + gap * (count - 1))
+        row_heights.append(row[0][1])
+    canvas = np.empty(
+        (sum(row_heights) + gap * (len(rows) - 1), max(row_widths), 3), np.uint8
+    )
+    canvas[:] = BACKGROUND
+    index, top = 0, 0
+    for count, row_width, row_height in zip(rows, row_widths, row_heights):
+        left = (canvas.shape[1] - row_width) // 2
+        for _ in range(count):
+            w, h = shown[index]
+            image = images[index]
+            if image is not None:
+                interpolation = (
+                    cv2.INTER_AREA if image.shape[0] > h else cv2.INTER_LINEAR
+                )
+                canvas[top:top + h, left:left + w] = cv2.resize(
+                    _as_bgr(image), (w, h), interpolation=interpolation
+                )
+            left += w + gap
+            index += 1
+        top += row_height + gap
+    return canvas
+
+
+@traced()
+def decode_grid(
+    paths: Sequence[str], width: int, height: int, gap: int = GAP
+) -> np.ndarray | None:
+    """
+    Decodes *paths* in parallel, each reduced as far as its place in a
+    *width* x *height* grid allows, and composes them. None if no image
+    could be decoded.
+    """
+    sizes = [image_size(path) for path in paths]
+    known = [size or (1, 1) for size in sizes]
+    targets = layout(known, width, height, gap)
+    reduces = [reduce_for(size, target) for size, target in zip(sizes, targets)]
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        images = list(pool.map(_decode, paths, reduces))
+    return compose(images, width, height, gap)
+
+
+def _decode(path: str, reduce: int) -> np.ndarray | None:
+    try:
+        return decode_file(path, reduce)
+    except Exception as e:  # one bad image leaves its place empty
+        print(f"Decode failed for {path}: {e}")
+        return None
@@ -0,0 +1,293 @@
+# image_loader.py - Decoding of reference images off the UI thread
+from __future__ import annotations
+
+import contextlib
+import math
+import mmap
+import os
+
+import cv2
+import numpy as np
+from PyQt5 import QtCore, QtGui
+
+from gesturesesh.decoders import choose_decoder, decode_buffer
+from gesturesesh.tracing import traced
+
+# Files at least this large are decoded in the background behind a preview.
+PROGRESSIVE_MIN_BYTES = 8 * 1024 * 1024
+# The EXIF block sits in APP1 right after SOI and is at most 64 KiB.
+EXIF_SCAN_BYTES = 128 * 1024
+# Shown while a large file without a preview decodes (BGR of the window background)
+PLACEHOLDER_COLOR = (78, 56, 30)
+# Most pixels along the placeholder's longer side
+PLACEHOLDER_SIDE = 1024
+
+
+def read_resource(path: str) -> bytes:
+    """Read a Qt resource path (":/...")."""
+    file = QtCore.QFile(path)
+    if not file.open(QtCore.QFile.OpenModeFlag.ReadOnly):
+        raise OSError(f"Cannot open resource {path}")
+    data = file.readAll().data()
+    file.close()
+    return data
+
+
+@contextlib.contextmanager
+def mapped_file(path: str):
+    """
+    Yield the contents of *path* as a read-only buffer without copying
+    it: an mmap for regular files, bytes for Qt resources and empty files
+    (which can't be mapped). Views into the buffer must not outlive the
+    with block.
+    """
+    if path.startswith(":/"):
+        yield read_resource(path)
+        return
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # zero-length file
+            yield b""
+            return
+        try:
+            yield mm
+        finally:
+            try:
+                mm.close()
+            except BufferError:
+                pass  # a view is still referenced; the map closes on collection
+
+
+@traced()
+def decode_file(path: str, reduce: int = 1) -> np.ndarray | None:
+    """
+    Decode *path*, or return None if it can't be read. With *reduce* > 1
+    the image comes out 1/reduce the size: straight from decoders that can
+    reduce, otherwise decoded in full and resized.
+    """
+    ext = os.path.splitext(path)[1]
+    with mapped_file(path) as data:
+        if reduce > 1:
+            image = decode_buffer(data, ext, reduce=reduce, require_reduce=True)
+            if image is not None:
+                return image
+        image = decode_buffer(data, ext)
+    if image is None or reduce == 1:
+        return image
+    return reduce_image(image, reduce)
+
+
+def reduce_image(image: np.ndarray, reduce: int) -> np.ndarray:
+    """*image* at 1/reduce of its width and height, rounded up like libjpeg."""
+    if reduce == 1:
+        return image
+    height, width = image.shape[:2]
+    return cv2.resize(
+        image,
+        (-(-width // reduce), -(-height // reduce)),
+        interpolation=cv2.INTER_AREA,
+    )
+
+
+def image_size(path: str) -> tuple[int, int] | None:
+    """(width, height) read from the file header, or None if Qt can't tell."""
+    size = QtGui.QImageReader(path).size()
+    if not size.isValid():
+        return None
+    return size.width(), size.height()
+
+
+def read_exif_thumbnail(head: bytes) -> tuple[bytes | None, int]:
+    """
+    Find the embedded EXIF thumbnail in the first bytes of a JPEG.
+    Returns (thumbnail JPEG bytes or None, EXIF orientation).
+    """
+    if head[:2] != b"\xff\xd8":
+        return None, 1
+    pos = 2
+    while pos + 4 <= len(head):
+        if head[pos] != 0xFF:
+            break
+        marker = head[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # no payload
+            pos += 2
+            continue
+        if marker == 0xDA:  # start of scan, metadata is over
+            break
+        length = int.from_bytes(head[pos + 2 : pos + 4], "big")
+        segment = head[pos + 4 : pos + 2 + length]
+        if marker == 0xE1 and segment[:6] == b"Exif\0\0":
+            return _parse_exif(segment[6:])
+        pos += 2 + length
+    return None, 1
+
+
+def _parse_exif(tiff: bytes) -> tuple[bytes | None, int]:
+    if tiff[:2] == b"II":
+        order = "little"
+    elif tiff[:2] == b"MM":
+        order = "big"
+    else:
+        return None, 1
+
+    def u16(offset):
+        return int.from_bytes(tiff[offset : offset + 2], order)
+
+    def u32(offset):
+        return int.from_bytes(tiff[offset : offset + 4], order)
+
+    def entries(ifd):
+        for i in range(u16(ifd)):
+            entry = ifd + 2 + 12 * i
+            yield u16(entry), entry + 8  # tag, value field
+
+    try:
+        orientation = 1
+        ifd0 = u32(4)
+        for tag, value in entries(ifd0):
+            if tag == 0x0112:
+                orientation = u16(value)
+        ifd1 = u32(ifd0 + 2 + 12 * u16(ifd0))
+        if not ifd1 or ifd1 >= len(tiff):
+            return None, orientation
+        offset = length = 0
+        for tag, value in entries(ifd1):
+            if tag == 0x0201:  # JPEGInterchangeFormat
+                offset = u32(value)
+            elif tag == 0x0202:  # JPEGInterchangeFormatLength
+                length = u32(value)
+        if offset and length and offset + length <= len(tiff):
+            return tiff[offset : offset + length], orientation
+        return None, orientation
+    except (IndexError, ValueError):
+        return None, 1
+
+
+def apply_orientation(image: np.ndarray, orientation: int) -> np.ndarray:
+    """Rotate/flip *image* the way EXIF *orientation* asks for."""
+    if orientation == 2:
+        return cv2.flip(image, 1)
+    if orientation == 3:
+        return cv2.rotate(image, cv2.ROTATE_180)
+    if orientation == 4:
+        return cv2.flip(image, 0)
+    if orientation == 5:
+        return cv2.transpose(image)
+    if orientation == 6:
+        return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    if orientation == 7:
+        return cv2.rotate(cv2.transpose(image), cv2.ROTATE_180)
+    if orientation == 8:
+        return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    return image
+
+
+@traced()
+def decode_preview(path: str) -> np.ndarray | None:
+    """
+    Cheap stand-in for *path* while the full decode runs: the EXIF
+    thumbnail, or a 1/8 decode from a decoder that can reduce (JPEG's DCT
+    scaling). Formats without either return None.
+    """
+    ext = os.path.splitext(path)[1]
+    try:
+        with mapped_file(path) as data:
+            head = data[:EXIF_SCAN_BYTES]
+            decoder = choose_decoder(ext, head, reduce=8)
+            if decoder is None or not decoder.can_reduce:
+                return None
+            thumbnail, orientation = read_exif_thumbnail(head)
+            if thumbnail:
+                image = cv2.imdecode(np.frombuffer(thumbnail, np.uint8), 1)
+                if image is not None:
+                    return apply_orientation(image, orientation)
+            return decode_buffer(data, ext, reduce=8, require_reduce=True)
+    except OSError:
+        return None
+
+
+def placeholder(size: tuple[int, int] | None) -> np.ndarray:
+    """
+    Flat stand-in for an image of *size* (width, height) with no cheap
+    preview, so the window takes its final shape and the full decode
+    drops in without a jump: exactly the image's aspect ratio when a
+    multiple of it fits in PLACEHOLDER_SIDE, otherwise within a pixel at
+    that size.
+    """
+    width, height = size or (PLACEHOLDER_SIDE, PLACEHOLDER_SIDE)
+    common = math.gcd(width, height)
+    unit_width, unit_height = width // common, height // common
+    longest = max(unit_width, unit_height)
+    if longest <= PLACEHOLDER_SIDE:
+        scale = min(common, PLACEHOLDER_SIDE // longest)
+        shape = (unit_height * scale, unit_width * scale)
+    else:
+        scale = min(1.0, PLACEHOLDER_SIDE / max(width, height))
+        shape = (max(1, round(height * scale)), max(1, round(width * scale)))
+    image = np.empty((*shape, 3), np.uint8)
+    image[:] = PLACEHOLDER_COLOR
+    return image
+
+
+def wants_progressive(path: str) -> bool:
+    """True if *path* is large enough to be decoded in the background."""
+    if path.startswith(":/"):
+        return False
+    try:
+        return os.path.getsize(path) >= PROGRESSIVE_MIN_BYTES
+    except OSError:
+        return False
+
+
+_decode_pool = None
+
+
+def decode_pool() -> QtCore.QThreadPool:
+    """
+    Thread pool for DecodeTask. Deliberately not the global pool: Qt's
+    smooth QImage scaling fans out onto the global pool and blocks the UI
+    thread (holding the GIL) until it finishes, so Python tasks queued on
+    that pool could deadlock against it.
+    """
+    global _decode_pool
+    if _decode_pool is None:
+        _decode_pool = QtCore.QThreadPool()
+        _decode_pool.setMaxThreadCount(2)
+    return _decode_pool
+
+
+class DecodeSignals(QtCore.QObject):
+    # generation, path, decoded image (None on failure)
+    finished = QtCore.pyqtSignal(int, str, object)
+
+
+class DecodeTask(QtCore.QRunnable):
+    """
+    Full-resolution (or 1/*reduce*) decode for QThreadPool. The result
+    carries the generation it was started for, so the receiver can drop
+    completions for an image the user has already navigated away from.
+    """
+
+    def __init__(
+        self, path: str, generation: int, signals: DecodeSignals, reduce: int = 1
+    ):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.signals = signals
+        self.reduce = reduce
+
+    def run(self):
+        try:
+            cvimage = decode_file(self.path, self.reduce)
+        except Exception as e:  # must not escape into the thread pool
+            print(f"Background decode failed for {self.path}: {e!r}")
+            cvimage = None
+        try:
+            self.signals.finished.emit(self.generation, self.path, cvimage)
+        except RuntimeError:
+            pass  # session window was deleted while decoding
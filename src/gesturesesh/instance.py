@@ -0,0 +1,127 @@
+# instance.py - One running GestureSesh per user, reachable over a local socket
+"""
+The first launch listens on a local socket (a Unix domain socket, or a
+named pipe on Windows) only the same user can connect to. Later launches
+hand their arguments to it and exit instead of starting a second copy,
+and scripts (foot pedals, stream decks) can drive the session window
+through the same socket.
+
+Each request is one JSON object on one line, answered by one line::
+
+    {"cmd": "next"}
+    {"cmd": "open", "folders": ["/refs/poses"], "preset": "Warmup", "shuffle": true}
+    -> {"ok": true, "message": ""}
+    -> {"ok": false, "error": "no session is running"}
+
+A connection may send any number of requests; keeping it open avoids
+the connection setup on every pedal press.
+"""
+from __future__ import annotations
+
+import getpass
+import json
+import re
+from typing import Callable
+
+from PyQt5 import QtCore
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+CONNECT_TIMEOUT_MS = 250
+REPLY_TIMEOUT_MS = 5000
+# Longest request line accepted; anything longer is a confused client
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def server_name() -> str:
+    """The socket name for this user, so users on one machine don't collide."""
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = "user"
+    return "gesturesesh-" + re.sub(r"[^A-Za-z0-9_.-]", "_", user)
+
+
+def send_message(
+    message: dict, name: str | None = None, timeout_ms: int = REPLY_TIMEOUT_MS
+) -> dict | None:
+    """
+    Sends *message* to the running instance and returns its reply, or
+    None when no instance is listening.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return None
+    socket.write(json.dumps(message).encode("utf-8") + b"\n")
+    socket.waitForBytesWritten(timeout_ms)
+    while not socket.canReadLine():
+        if not socket.waitForReadyRead(timeout_ms):
+            socket.abort()
+            return {"ok": False, "error": "no reply from the running instance"}
+    reply = bytes(socket.readLine())
+    socket.disconnectFromServer()
+    try:
+        return json.loads(reply)
+    except ValueError:
+        return {"ok": False, "error": "unreadable reply from the running instance"}
+
+
+class InstanceServer(QtCore.QObject):
+    """
+    Listens for requests from later launches and control scripts and
+    passes each to *handler* on the GUI thread. The handler returns a
+    message for the sender, or raises ValueError to report an error.
+    """
+
+    def __init__(self, handler: Callable[[dict], str], name: str | None = None, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.name = name or server_name()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept_connections)
+
+    def listen(self) -> bool:
+        """
+        Starts listening. False if another instance already is. A socket
+        left behind by an instance that crashed is removed and reused.
+        """
+        if send_message({"cmd": "ping"}, self.name) is not None:
+            return False
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def close(self):
+        self.server.close()
+
+    def accept_connections(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.read_requests(socket))
+            socket.disconnected.connect(socket.deleteLater)
+            # Requests may have arrived with the connection
+            self.read_requests(socket)
+
+    def read_requests(self, socket: QLocalSocket):
+        while socket.canReadLine():
+            reply = self.handle(bytes(socket.readLine()))
+            socket.write(json.dumps(reply).encode("utf-8") + b"\n")
+        if socket.bytesAvailable() > MAX_REQUEST_BYTES:
+            socket.abort()
+
+    def handle(self, line: bytes) -> dict:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "requests are one JSON object per line"}
+        if not isinstance(message, dict) or not isinstance(message.get("cmd"), str):
+            return {"ok": False, "error": 'requests need a "cmd"'}
+        if message["cmd"] == "ping":
+            return {"ok": True, "message": ""}
+        try:
+            return {"ok": True, "message": self.handler(message)}
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:  # a request must never take the app down
+            print(f"Request {message['cmd']!r} failed: {e!r}")
+            return {"ok": False, "error": f"{message['cmd']} failed: {e}"}
@@ -1,12 +1,13 @@
 # main.py - GestureSesh main application module
 import os
 import sys
-import random
+import time
 import platform
 from pathlib import Path
 from dataclasses import dataclass
 from importlib import resources
 import contextlib
+import multiprocessing
 
 import cv2
 import numpy as np
@@ -49,6 +50,48 @@ from gesturesesh.update_checker import (
 from gesturesesh.ui.main_window import Ui_MainWindow
 from gesturesesh.ui.session_display import Ui_session_display
 from gesturesesh.ui.dot_indicator import DotIndicator
+from gesturesesh.ui.animation_clock import animation_clock
+from gesturesesh.ui.status_view import StatusView
+from gesturesesh.ui.perf_hud import PerfHud, PerfStats
+from gesturesesh.ui.mirror_view import MirrorView
+from gesturesesh.animation import DEFAULT_CACHE_BYTES, AnimatedImage, is_multi_frame
+from gesturesesh.decoders import supported_extensions
+from gesturesesh.grid import decode_grid
+from gesturesesh.schedule import ScheduleEntry, ScheduleModel
+from gesturesesh.schedule_plan import expand_plan
+from gesturesesh.timeline import SessionTimeline, format_duration
+from gesturesesh.playlist import BREAK_IMAGE, Playlist
+from gesturesesh.scanner import scan_folders
+from gesturesesh.duplicates import DuplicateScanSignals, DuplicateScanTask
+from gesturesesh.snapshot import (
+    ReconcileSignals,
+    ReconcileTask,
+    Snapshot,
+    read_snapshot,
+    recent_digest,
+    snapshot_path,
+    write_snapshot,
+)
+from gesturesesh import tracing
+from gesturesesh.tracing import traced
+from gesturesesh.image_loader import (
+    DecodeSignals,
+    DecodeTask,
+    decode_file,
+    decode_pool,
+    decode_preview,
+    image_size,
+    placeholder,
+    reduce_image,
+    wants_progressive,
+)
+from gesturesesh.memory_budget import (
+    REDUCE_FACTORS,
+    ImagePlan,
+    MemoryBudget,
+    budget_from_config,
+    pixmap_bytes,
+)
 from gesturesesh.utils import (
     resources_config,
 )  # This is a generated file from resources.qrc DO NOT REMOVE
@@ -72,29 +115,21 @@ def sound_file(name: str):
         return sound_file_context()
 
 
-@dataclass
-class ScheduleEntry:
-    images: int
-    time: int
-
-
-@dataclass
+@dataclass(eq=False)  # compared by identity; also the AnimationClock key
 class StatusMessage:
     text: str
     duration: int  # milliseconds
     is_error: bool = False
-    timer: QtCore.QTimer | None = None
-    blink_timer: QtCore.QTimer | None = None
-    fade_timer: QtCore.QTimer | None = None
+    key: str | None = None  # a newer message with the same key replaces this one
+    count: int = 1  # identical messages coalesced into this one
     is_blinking: bool = False
-    fade_step: int = 0
-    _blink_cycle_count: int = 0
-    _current_fade_step: int = 0
-    _fade_direction: str = "out"
-    _max_blink_cycles: int = 0
-    _fade_steps: int = 0
+    opacity: float | None = None  # set while blinking or fading out
     _is_fading_out: bool = False
 
+    @property
+    def display_text(self) -> str:
+        return f"{self.text} (×{self.count})" if self.count > 1 else self.text
+
 
 # Subclass to enable multifolder selection.
 class FileDialog(QFileDialog):
@@ -115,6 +150,9 @@ __version__ = "0.5.0"
 
 
 class MainApp(QMainWindow, Ui_MainWindow):
+    # Status lines shown at once; older ones collapse into a summary line
+    MAX_STATUS_MESSAGES = 3
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setupUi(self)
@@ -122,9 +160,13 @@ class MainApp(QMainWindow, Ui_MainWindow):
         self.config = load_config(self)
         self.session_schedule = []
         self.has_break = False
-        self.valid_file_types = {".bmp", ".jpg", ".jpeg", ".png"}
+        # Whatever the decoder registry can read with the libraries installed
+        self.valid_file_types = set(supported_extensions())
         # Initialize selection before loading recent session
         self.selection = {"files": [], "folders": []}
+        # Every file the folders held when last scanned; the ones missing
+        # from the selection were dropped and a rescan mustn't re-add them
+        self.folder_files = set()
 
         # Initialize enhanced status message system
         self.status_timer = QtCore.QTimer()
@@ -133,7 +175,11 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
         # Status message queue and animation system
         self.status_messages = []  # Queue of active status messages
-        self.current_animation_group = None
+        # Summary line for messages pushed out by MAX_STATUS_MESSAGES
+        self.status_overflow = None
+        self.status_overflow_count = 0
+        # Blink/fade steps and message lifetimes all run on the shared clock
+        self.clock = animation_clock()
         self.showing_default_status = True
 
         # Debounce timer for status updates to prevent UI freezing
@@ -144,13 +190,33 @@ class MainApp(QMainWindow, Ui_MainWindow):
         # Setup opacity effect for selected_items
         self.status_opacity_effect = QGraphicsOpacityEffect()
         self.selected_items.setGraphicsEffect(self.status_opacity_effect)
+        # Status messages render into their own document, one block each
+        self.status_view = StatusView(self.selected_items)
+
+        # The schedule table shows this model; totals follow its edits
+        self.schedule_model = ScheduleModel(self)
+        self.entry_table.setModel(self.schedule_model)
+        self.schedule_model.totals_changed.connect(self.update_total)
+
+        # Near-duplicate scans hash images in the background; results from
+        # an older generation (the selection was cleared since) are dropped
+        self.dupe_generation = 0
+        self.dupe_pool = QtCore.QThreadPool(self)
+        self.dupe_pool.setMaxThreadCount(1)
+        self.dupe_signals = DuplicateScanSignals(self)
+        self.dupe_signals.finished.connect(self.on_duplicate_scan_finished)
+        # A selection restored from the snapshot is checked against the
+        # folders in the background
+        self.reconcile_pool = QtCore.QThreadPool(self)
+        self.reconcile_pool.setMaxThreadCount(1)
+        self.reconcile_signals = ReconcileSignals(self)
+        self.reconcile_signals.finished.connect(self.on_reconciled)
 
         self.init_buttons()
         self.init_shortcuts()
         self.init_preset()
         self.load_recent()
         self.check_version()
-        self.entry_table.itemChanged.connect(self.update_total)
         self.dialog_buttons.accepted.connect(self.start_session)
         # Add: Initial dynamic font sizing
         self.update_dynamic_fonts()
@@ -198,6 +264,7 @@ class MainApp(QMainWindow, Ui_MainWindow):
         self.reset_table.setFont(font)
         self.dialog_buttons.setFont(font)
         self.selected_items.setFont(font)
+        self.status_view.setFont(font)
         self.set_number_of_images.setFont(font)
         self.set_minutes.setFont(font)
         self.set_seconds.setFont(font)
@@ -251,15 +318,16 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
         # Use new status system for file adding messages
         self.show_temporary_status(
-            f'{len(checked_files["valid_files"])} file(s) added!', 4000
+            f'{len(checked_files["valid_files"])} file(s) added!', 4000, key="files-added"
         )
 
         if len(checked_files["invalid_files"]) > 0:
             self.show_temporary_status(
                 f'{len(checked_files["invalid_files"])} file(s) not added. '
-                f'Supported file types: {", ".join(self.valid_file_types)}.',
+                f'Supported file types: {", ".join(sorted(self.valid_file_types))}.',
                 duration_ms=4000,
                 is_error=True,
+                key="files-rejected",
             )
 
     def open_folder(self):
@@ -280,108 +348,39 @@ class MainApp(QMainWindow, Ui_MainWindow):
             self.show_temporary_status(
                 f"{total_valid_files} file(s) added from {len(directories)} folder(s)!",
                 4000,
+                key="files-added",
             )
 
             if total_invalid_files > 0:
                 self.show_temporary_status(
                     f"{total_invalid_files} file(s) not added. "
-                    f'Supported file types: {", ".join(self.valid_file_types)}.',
+                    f'Supported file types: {", ".join(sorted(self.valid_file_types))}.',
                     duration_ms=4000,
                     is_error=True,
+                    key="files-rejected",
                 )
             return
 
         # No folders selected
-        self.show_temporary_status("0 folder(s) added!", 2000)
+        self.show_temporary_status("0 folder(s) added!", 2000, key="files-added")
 
     def scan_directories(self, directories):
-        """Scan a list of directories and collect valid files from all subfolders, robust to symlinks, permissions, and case."""
-        total_valid_files, total_invalid_files = 0, 0
-        visited = set()
-        seen_paths = set()
-
-        # Normalize allowed directories for safety check
-        allowed_dirs = [os.path.abspath(d) for d in directories]
-
-        # def is_within_allowed_dirs(path, allowed_dirs):
-        #     abs_path = os.path.abspath(path)
-        #     for folder in allowed_dirs:
-        #         if abs_path.startswith(folder + os.sep):
-        #             return True
-        #     return False
-        def is_within_allowed_dirs(path, allowed_dirs):
-            abs_path = os.path.abspath(path)
-            # Case-sensitive path comparison
-            return any(
-                abs_path.startswith(folder + os.sep) or abs_path == folder
-                for folder in allowed_dirs
-            )
-
+        """
+        Adds the supported files under *directories* (recursively, following
+        folder symlinks once) to the selection and remembers the folders.
+        Folders that no longer exist are dropped from the selection.
+        Returns (files added, files rejected).
+        """
+        result = scan_folders(directories, self.valid_file_types)
         for directory in directories:
-            if not os.path.exists(directory):
+            if directory in result.missing:
                 if directory in self.selection["folders"]:
                     self.selection["folders"].remove(directory)
-                continue
-            # Save folder that was explicitly selected
-            if directory not in self.selection["folders"]:
+            elif directory not in self.selection["folders"]:
                 self.selection["folders"].append(directory)
-            for root, dirs, files in os.walk(directory, followlinks=True):
-                # Prevent infinite recursion via symlinks
-                try:
-                    stat = os.stat(root)
-                    key = (stat.st_dev, stat.st_ino)
-                    if key not in visited:
-                        visited.add(key)
-                except OSError:
-                    continue  # Skip directories we can't stat
-
-                # Check files for type and accessibility first
-                potential_files = self.check_files(
-                    [os.path.join(root, f) for f in files]
-                )
-                total_invalid_files += len(
-                    potential_files["invalid_files"]
-                )  # Add initial invalid files
-
-                for file in potential_files["valid_files"]:
-                    try:
-                        # Use inode + case-sensitive path for duplicate detection
-                        stat = os.stat(file)
-                        file_key = (stat.st_dev, stat.st_ino, file)  # Added file path
-
-                        if file_key in seen_paths:
-                            continue
-
-                        if not is_within_allowed_dirs(file, allowed_dirs):
-                            total_invalid_files += 1
-                            continue
-
-                        seen_paths.add(file_key)
-                        self.selection["files"].append(file)
-                        total_valid_files += 1
-
-                    except (OSError, PermissionError):
-                        total_invalid_files += 1
-                        continue
-
-        return total_valid_files, total_invalid_files
-        #         # Now, filter the potentially valid files
-        #         for file in potential_files['valid_files']:
-        #             norm_path = os.path.abspath(file)
-
-        #             # Perform all rejection checks first
-        #             if norm_path in seen_paths:
-        #                 continue # Skip duplicate
-
-        #             if not is_within_allowed_dirs(file, allowed_dirs):
-        #                 total_invalid_files += 1 # This file is ultimately invalid
-        #                 continue # Skip files outside allowed dirs
-
-        #             # If all checks pass, it's a confirmed valid file
-        #             seen_paths.add(norm_path)
-        #             self.selection['files'].append(file)
-        #             total_valid_files += 1 # Increment valid count here
-        # return total_valid_files, total_invalid_files
+        self.selection["files"].extend(result.files)
+        self.folder_files.update(result.files)
+        return len(result.files), result.invalid
 
     def check_files(self, files):
         """Checks if files are supported file types and are accessible."""
@@ -402,10 +401,18 @@ class MainApp(QMainWindow, Ui_MainWindow):
         """Clears entire selection"""
         self.selection["files"].clear()
         self.selection["folders"].clear()
+        self.folder_files.clear()
+        self.dupe_generation += 1
         self.show_temporary_status("All files and folders cleared!", 2000)
 
     def remove_dupes(self):
-        """Remove duplicate files from selection (case-sensitive)"""
+        """
+        Remove duplicate files from selection (case-sensitive), then start
+        a background scan for copies with different paths: byte-identical
+        copies, and the same image saved elsewhere, re-encoded or resized.
+        With "near_duplicates": false in config.json only byte-identical
+        copies are removed.
+        """
         if not self.selection["files"]:
             self.show_temporary_status("No files to check for duplicates")
             return
@@ -432,9 +439,42 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
         if removed_count > 0:
             self.show_temporary_status(f"Removed {removed_count} duplicate file(s)")
-        else:
-            self.show_temporary_status("No duplicates found")
 
+        near = self.config.get("near_duplicates", True) is not False
+        self.dupe_generation += 1
+        self.dupe_pool.start(
+            DuplicateScanTask(
+                unique_files, self.dupe_generation, self.dupe_signals, near=near
+            )
+        )
+        kinds = "copies and near-duplicates" if near else "copies"
+        self.show_temporary_status(
+            f"Checking {len(unique_files)} file(s) for {kinds}...",
+            4000,
+            key="duplicates",
+        )
+        self.display_status()
+
+    def on_duplicate_scan_finished(self, generation, groups):
+        """Drops all but the first file of each duplicate group."""
+        if generation != self.dupe_generation:
+            return  # the selection was cleared or rescanned since
+        if groups is None:
+            self.show_error_status("Could not check for duplicates", key="duplicates")
+            return
+        copies = {path for group in groups for path in group[1:]}
+        original_count = len(self.selection["files"])
+        self.selection["files"] = [
+            path for path in self.selection["files"] if path not in copies
+        ]
+        removed_count = original_count - len(self.selection["files"])
+        if removed_count > 0:
+            self.show_temporary_status(
+                f"Removed {removed_count} copied or near-duplicate file(s)",
+                key="duplicates",
+            )
+        else:
+            self.show_temporary_status("No duplicates found", key="duplicates")
         self.display_status()
 
     def display_status(self):
@@ -454,95 +494,83 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
             # Restore full opacity for default message
             self.status_opacity_effect.setOpacity(0.8)
+            self.status_view.detach()
 
             # Style default message to prevent white flash
             self.selected_items.setHtml(f"<div>{default_message}</div>")
             # Mark as showing default status
             self.showing_default_status = True
 
-    def show_temporary_status(self, message, duration_ms=2000, is_error=False):
-        """Shows a temporary status message with sophisticated animations"""
-        self._add_status_message(message, duration_ms, is_error)
+    def show_temporary_status(self, message, duration_ms=2000, is_error=False, key=None):
+        """
+        Shows a temporary status message with sophisticated animations.
+        A message with the same *key* as a visible one (e.g. a running file
+        count) updates that line instead of adding another.
+        """
+        self._add_status_message(message, duration_ms, is_error, key)
 
-    def show_error_status(self, message, duration_ms=3000):
+    def show_error_status(self, message, duration_ms=3000, key=None):
         """Shows an error/warning status message with faster, more attention-grabbing animations"""
-        self._add_status_message(message, duration_ms, is_error=True)
+        self._add_status_message(message, duration_ms, is_error=True, key=key)
 
     def _remove_status_message(self, status_msg):
-        """Start fade‑out animation and remove a status message after its timer expires."""
+        """Start fade‑out animation and remove a status message after its lifetime expires."""
         # If a fade‑out is already running for this message, do nothing.
-        if getattr(status_msg, "_is_fading_out", False):
+        if status_msg._is_fading_out:
             return
 
         status_msg._is_fading_out = True  # Mark so we don't start two fades.
-
-        # Stop and delete the timer that originally triggered removal.
-        status_msg.timer.stop()
-        status_msg.timer.deleteLater()
+        self.clock.cancel((status_msg, "expire"))
 
         # Begin a smooth fade‑out; the message will be dropped at the end.
         self._fade_out_and_remove(status_msg)
 
     def _fade_out_and_remove(self, status_msg):
         """Fade a status message out smoothly, then remove it from the queue."""
-        fade_steps = 20
         fade_duration = 400  # milliseconds
         start_opacity = 0.6  # Begin fade‑out at dim opacity to avoid white flash
-        step_duration = fade_duration // fade_steps
-
-        status_msg._fade_step = 0
-
-        fade_timer = QtCore.QTimer()
-        fade_timer.setSingleShot(False)
-
-        def _step():
-            # Compute opacity: 1.0 ➜ 0.0 over `fade_steps`.
 
-            progress = status_msg._fade_step / fade_steps
-            opacity = start_opacity * (1 - progress)
-            self._update_display_with_selective_opacity(status_msg, opacity)
+        def _step(progress):
+            status_msg.opacity = start_opacity * (1 - progress)
+            self._request_status_repaint(status_msg)
 
-            status_msg._fade_step += 1
-            if status_msg._fade_step > fade_steps:
-                # End of fade: clean up and finally drop the message.
-                fade_timer.stop()
-                fade_timer.deleteLater()
-                if status_msg in self.status_messages:
-                    self.status_messages.remove(status_msg)
-                self._update_status_display()
+        def _finished():
+            self.clock.stop((status_msg, "blink"))
+            if status_msg in self.status_messages:
+                self.status_messages.remove(status_msg)
+            if status_msg is self.status_overflow:
+                self.status_overflow = None
+                self.status_overflow_count = 0
+            self._update_status_display()
 
-        fade_timer.timeout.connect(_step)
-        fade_timer.start(step_duration)
-        status_msg._fade_timer = fade_timer  # keep a reference
+        self.clock.start((status_msg, "fade"), fade_duration, _step, _finished)
 
-    def _add_status_message(self, message, duration_ms, is_error=False):
+    def _add_status_message(self, message, duration_ms, is_error=False, key=None):
         """Add a new status message to the queue and display it"""
-        # Create timer for this message
-        message_timer = QtCore.QTimer()
-        message_timer.setSingleShot(True)
-
-        # Create status message object
-        status_msg = StatusMessage(message, duration_ms, is_error)
-        status_msg.timer = message_timer
-
-        # Connect timer to removal function
-        message_timer.timeout.connect(lambda: self._remove_status_message(status_msg))
+        status_msg = self._find_status_message(message, is_error, key)
+        if status_msg is None:
+            status_msg = StatusMessage(message, duration_ms, is_error, key)
+        else:
+            # Coalesce: the existing line moves to the top and updates
+            self.status_messages.remove(status_msg)
+            if status_msg.text == message:
+                status_msg.count += 1
+            else:
+                status_msg.text, status_msg.count = message, 1
+            status_msg.is_error = is_error
+            status_msg.duration = duration_ms
+            self.clock.stop((status_msg, "blink"))
 
         # Stop any existing blinking animations before adding new message
         for existing_msg in self.status_messages:
-            try:
+            if existing_msg.is_blinking:
+                self.clock.stop((existing_msg, "blink"))
                 existing_msg.is_blinking = False
-            except Exception as e:
-                print(f"Exception while setting is_blinking: {e}")
-                pass  # Handle case where is_blinking attribute doesn't exist
-            try:
-                existing_msg._blink_timer.stop()
-            except Exception as e:
-                print(f"Exception while stopping blink timer: {e}")
-                pass
+                existing_msg.opacity = None
 
         # Add to queue (newest messages at the end, so they appear at top when reversed)
         self.status_messages.append(status_msg)
+        self._trim_status_messages()
 
         # Update display immediately
         self._update_status_display_text()
@@ -550,7 +578,61 @@ class MainApp(QMainWindow, Ui_MainWindow):
         # Start blinking animation for this specific new message only
         self._start_message_blink_animation(status_msg, is_error)
 
-        message_timer.start(7000)
+        self.clock.call_later(
+            (status_msg, "expire"), 7000, lambda: self._remove_status_message(status_msg)
+        )
+
+    def _find_status_message(self, message, is_error, key):
+        """A visible message the new one should update, if any."""
+        for status_msg in self.status_messages:
+            if status_msg._is_fading_out or status_msg is self.status_overflow:
+                continue
+            if key is not None:
+                if status_msg.key == key:
+                    return status_msg
+            elif status_msg.key is None and (status_msg.text, status_msg.is_error) == (
+                message,
+                is_error,
+            ):
+                return status_msg
+        return None
+
+    def _trim_status_messages(self):
+        """
+        Drop the oldest messages beyond MAX_STATUS_MESSAGES, counting them
+        in one summary line at the bottom, so bursts of messages keep the
+        number of animated lines bounded.
+        """
+        live = [
+            m
+            for m in self.status_messages
+            if not m._is_fading_out and m is not self.status_overflow
+        ]
+        excess = len(live) - self.MAX_STATUS_MESSAGES
+        if excess <= 0:
+            return
+        dropped = 0
+        for status_msg in live[:excess]:
+            self.clock.stop((status_msg, "blink"))
+            self.clock.cancel((status_msg, "expire"))
+            self.status_messages.remove(status_msg)
+            dropped += status_msg.count
+
+        summary = self.status_overflow
+        if summary is None or summary._is_fading_out:
+            # A fading summary finishes on its own; count afresh
+            summary = StatusMessage("", 0)
+            self.status_overflow = summary
+            self.status_overflow_count = 0
+        else:
+            self.status_messages.remove(summary)
+        self.status_overflow_count += dropped
+        count = self.status_overflow_count
+        summary.text = f"+{count} earlier message{'s' if count != 1 else ''}"
+        self.status_messages.insert(0, summary)  # oldest slot, shown last
+        self.clock.call_later(
+            (summary, "expire"), 7000, lambda: self._remove_status_message(summary)
+        )
 
     def _debounced_update_status_display(self):
         """Debounce status display updates to prevent UI freezing"""
@@ -569,83 +651,37 @@ class MainApp(QMainWindow, Ui_MainWindow):
         # Mark this message as blinking
         status_msg.is_blinking = True
 
-        # Animation parameters
-        max_blink_cycles = 3 if is_error else 2
+        # Animation parameters: each cycle fades 1.0 -> 0.2 -> 1.0, then
+        # pauses briefly before the next one
+        blink_cycles = 3 if is_error else 2
         fade_duration = 300 if is_error else 400
-        fade_steps = 20
-        fade_step_duration = fade_duration // fade_steps
-
-        # Store animation state in the message object
-        status_msg._blink_cycle_count = 0
-        status_msg._current_fade_step = 0
-        status_msg._fade_direction = "out"
-        status_msg._max_blink_cycles = max_blink_cycles
-        status_msg._fade_steps = fade_steps
-
-        # Create timer for this specific message's animation
-        blink_timer = QtCore.QTimer()
-        blink_timer.setSingleShot(False)
-
-        status_msg._blink_timer = blink_timer
-
-        def animate_message_fade():
-            if not status_msg.is_blinking or status_msg not in self.status_messages:
-                blink_timer.stop()
-                blink_timer.deleteLater()
-                return
-
-            # Calculate current opacity
-            if status_msg._fade_direction == "out":
-                progress = status_msg._current_fade_step / status_msg._fade_steps
-                current_opacity = 1.0 - (0.8 * progress)  # 1.0 -> 0.2
-            else:  # fade_direction == 'in'
-                progress = status_msg._current_fade_step / status_msg._fade_steps
-                current_opacity = 0.2 + (0.8 * progress)  # 0.2 -> 1.0
-
-            # Update display with selective opacity for this message
-            self._update_display_with_selective_opacity(status_msg, current_opacity)
-
-            status_msg._current_fade_step += 1
-
-            # Check if this fade direction is complete
-            if status_msg._current_fade_step >= status_msg._fade_steps:
-                if status_msg._fade_direction == "out":
-                    status_msg._fade_direction = "in"
-                    status_msg._current_fade_step = 0
-                else:
-                    # Fade in complete, cycle is done
-                    status_msg._blink_cycle_count += 1
-
-                    if status_msg._blink_cycle_count < status_msg._max_blink_cycles:
-                        # Brief pause between cycles, then start next cycle
-                        blink_timer.stop()
-
-                        def restart_cycle():
-                            if (
-                                status_msg.is_blinking
-                                and status_msg in self.status_messages
-                            ):
-                                status_msg._current_fade_step = 0
-                                status_msg._fade_direction = "out"
-                                blink_timer.start(fade_step_duration)
-
-                        QtCore.QTimer.singleShot(200, restart_cycle)
-                        return
-                    else:
-                        # All cycles complete
-                        self._finish_message_blink_animation(status_msg)
-                        blink_timer.stop()
-                        blink_timer.deleteLater()
-                        return
-
-        blink_timer.timeout.connect(animate_message_fade)
-        blink_timer.start(fade_step_duration)
+        pause = 200
+        cycle = 2 * fade_duration + pause
+        total = blink_cycles * cycle - pause
+
+        def _step(progress):
+            phase = (progress * total) % cycle
+            if phase < fade_duration:
+                opacity = 1.0 - 0.8 * phase / fade_duration
+            elif phase < 2 * fade_duration:
+                opacity = 0.2 + 0.8 * (phase - fade_duration) / fade_duration
+            else:
+                opacity = 1.0
+            status_msg.opacity = opacity
+            self._request_status_repaint(status_msg)
+
+        self.clock.start(
+            (status_msg, "blink"),
+            total,
+            _step,
+            lambda: self._finish_message_blink_animation(status_msg),
+        )
 
     def _finish_message_blink_animation(self, status_msg):
         """Restore normal state for a specific message after blinking completes"""
         status_msg.is_blinking = False
-        if hasattr(status_msg, "_blink_timer"):
-            delattr(status_msg, "_blink_timer")
+        if not status_msg._is_fading_out:
+            status_msg.opacity = None
 
         # Restore the main widget's opacity to full
         self.status_opacity_effect.setOpacity(1.0)
@@ -654,12 +690,11 @@ class MainApp(QMainWindow, Ui_MainWindow):
         self._update_status_display_text()
 
     # --- unified renderer --------------------------------------------------
-    def _render_status(
-        self, highlight: StatusMessage | None = None, opacity: float | None = None
-    ) -> None:
+    def _render_status(self) -> None:
         """
-        Draw all status messages.  If *highlight* is supplied, that message is
-        rendered in the given *opacity* (0‑1).  All others use full colour.
+        Show all status messages through the incremental status view.
+        Messages that are blinking or fading out are drawn at their current
+        *opacity* (0‑1); all others use full colour.
         """
         if not self.status_messages:
             self.display_status()
@@ -667,31 +702,13 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
         # Always show widget fully – we tint via text colour.
         self.status_opacity_effect.setOpacity(1.0)
-
-        html = ['<div style="line-height:1.1;">']
-        visible = list(reversed(self.status_messages))  # newest first
-        for i, msg in enumerate(visible):
-            margin = "margin-top:3px;" if i else ""
-
-            if msg is highlight:
-                base_rgb = "220, 20, 60" if msg.is_error else "225, 225, 225"
-                css = f"font-weight:bold; color:rgba({base_rgb}, {opacity}); {margin}"
-            elif i == 0:
-                css = (
-                    "font-weight:bold;"
-                    f' {"color:#DC143C;" if msg.is_error else ""} {margin}'
-                )
-            else:
-                css = f"color:rgb(102,102,102); {margin}"
-
-            html.append(f'<div style="{css}">{msg.text}</div>')
-        html.append("</div>")
-
-        self.selected_items.setHtml("".join(html))
+        self.status_view.sync(self.status_messages)
         self.showing_default_status = False
 
-    def _update_display_with_selective_opacity(self, blinking_msg, opacity):
-        self._render_status(blinking_msg, opacity)
+    def _request_status_repaint(self, status_msg):
+        """Restyle *status_msg* on the next animation frame."""
+        self.status_view.mark_dirty(status_msg)
+        self.clock.request_repaint(self.status_view.flush)
 
     def _update_status_display_text(self):
         self._render_status()
@@ -699,14 +716,17 @@ class MainApp(QMainWindow, Ui_MainWindow):
     def display_random_status(self):
         """Displays the randomization setting"""
         if self.randomize_selection.isChecked():
-            self.show_temporary_status("Randomization on!", 2000)
+            self.show_temporary_status("Randomization on!", 2000, key="randomization")
         else:
-            self.show_temporary_status("Randomization off!", 2000)
+            self.show_temporary_status("Randomization off!", 2000, key="randomization")
 
     def load_recent(self):
         """
-        Loads most recent session settings from unified config.json.
+        Loads most recent session settings: the warm-start snapshot when
+        it is current, otherwise config.json, rescanning the folders.
         """
+        if self.restore_snapshot():
+            return
         recent = self.config.get("recent_session", {})
         if not recent:  # First time launch or no recent session
             return self.selected_items.clear()
@@ -731,6 +751,77 @@ class MainApp(QMainWindow, Ui_MainWindow):
             self.show_temporary_status("Recent session settings loaded!", 3000)
         self.update_total()
 
+    def restore_snapshot(self):
+        """
+        Restores the state the window was closed in from the snapshot and
+        rescans the folders in the background. False if there is no
+        snapshot, or config.json has a newer recent session.
+        """
+        snapshot = read_snapshot(snapshot_path())
+        if snapshot is None or snapshot.recent != recent_digest(
+            self.config.get("recent_session", {})
+        ):
+            return False
+        self.selection["folders"] = list(snapshot.folders)
+        self.selection["files"] = list(snapshot.files)
+        self.folder_files = set(snapshot.files).union(snapshot.excluded)
+        if 0 <= snapshot.preset_index < self.preset_loader_box.count():
+            # The schedule comes from the snapshot, not the preset
+            with QtCore.QSignalBlocker(self.preset_loader_box):
+                self.preset_loader_box.setCurrentIndex(snapshot.preset_index)
+        self.schedule_model.set_entries(snapshot.schedule)
+        self.randomize_selection.setChecked(snapshot.randomized)
+        self.display_status()
+        self.show_temporary_status("Recent session settings loaded!", 3000)
+        self.update_total()
+        if snapshot.folders:
+            self.reconcile_pool.start(
+                ReconcileTask(
+                    snapshot.files,
+                    snapshot.excluded,
+                    snapshot.folders,
+                    self.valid_file_types,
+                    self.reconcile_signals,
+                )
+            )
+        return True
+
+    def on_reconciled(self, restored, files, scanned):
+        """Brings a restored selection up to date with its folders."""
+        current = self.selection["files"]
+        if current[: len(restored)] != restored:
+            return  # the selection was cleared or changed since
+        self.folder_files = set(scanned)
+        if files == restored:
+            return
+        before, after = set(restored), set(files)
+        self.selection["files"] = files + current[len(restored):]
+        self.show_temporary_status(
+            f"{len(after - before)} new, {len(before - after)} missing file(s) "
+            "since last time",
+            4000,
+            key="files-added",
+        )
+        self.display_status()
+
+    def save_snapshot(self):
+        write_snapshot(
+            snapshot_path(),
+            Snapshot(
+                folders=self.selection["folders"],
+                files=self.selection["files"],
+                schedule=self.schedule_model.entries(),
+                preset_index=self.preset_loader_box.currentIndex(),
+                randomized=self.randomize_selection.isChecked(),
+                recent=recent_digest(self.config.get("recent_session", {})),
+                excluded=sorted(self.folder_files.difference(self.selection["files"])),
+            ),
+        )
+
+    def closeEvent(self, event):
+        self.save_snapshot()
+        super().closeEvent(event)
+
     # endregion
 
     # region Session Settings
@@ -747,143 +838,65 @@ class MainApp(QMainWindow, Ui_MainWindow):
             self.show_error_status("Time must be greater than 0 seconds!", 3000)
             return
 
-        row = self.entry_table.rowCount()
-        entry = [
-            row + 1,  # entry number
-            self.set_number_of_images.value(),
-            minutes * 60 + seconds,
-        ]
+        try:
+            self.schedule_model.append(
+                [ScheduleEntry(self.set_number_of_images.value(), minutes * 60 + seconds)]
+            )
+        except ValueError as e:
+            self.show_error_status(f"Can't add entry: {e}", 3000)
+            return
         self.set_number_of_images.setValue(0)
         self.set_minutes.setValue(0)
         self.set_seconds.setValue(0)
-        self.entry_table.insertRow(row)
-
-        for column, item in enumerate(entry):
-            item = QTableWidgetItem(str(item))
-            item.setTextAlignment(4)
-            # Sets the entry column to be not editable, while still selectable.
-            if column == 0:
-                item.setFlags(QtCore.Qt.ItemIsEnabled)
-            self.entry_table.setItem(row, column, item)
         self.set_number_of_images.setFocus()
         self.set_number_of_images.selectAll()
 
     def remove_row(self):
         # Save current row
-        row = self.entry_table.currentRow()
-        self.entry_table.removeRow(row)
-        for i in range(row, self.entry_table.rowCount()):
-            item = QTableWidgetItem(str(i + 1))
-            item.setTextAlignment(4)
-            item.setFlags(QtCore.Qt.ItemIsEnabled)
-            self.entry_table.setItem(i, 0, item)
+        row = self.entry_table.currentIndex().row()
+        if not self.schedule_model.remove_rows(row):
+            return
         # Set current cell
-        if row != self.entry_table.rowCount():
-            self.entry_table.setCurrentCell(row, 0)
+        if row != self.schedule_model.rowCount():
+            self.select_entry(row)
         else:  # Case for last row selected
-            self.entry_table.setCurrentCell(row - 1, 0)
-        self.update_total()
+            self.select_entry(row - 1)
 
     def move_up(self):
-        row = self.entry_table.currentRow()
-        if row <= 0:
+        row = self.entry_table.currentIndex().row()
+        if row < 0:
+            self.show_error_status("Select a row in the table!", 2000)
             return
-        self.entry_table.setCurrentCell(row, 0)
-        for column in range(self.entry_table.columnCount()):
-            if column == 0:
-                continue
-            try:
-                current, above = QTableWidgetItem(
-                    self.entry_table.item(row, column).text()
-                ), QTableWidgetItem(self.entry_table.item(row - 1, column).text())
-            except (Exception, ValueError):
-                self.show_error_status("Select a row in the table!", 2000)
-                return
-            current.setTextAlignment(4)
-            above.setTextAlignment(4)
-            self.entry_table.setItem(row, column, above)
-            self.entry_table.setItem(row - 1, column, current)
-        self.entry_table.setCurrentCell(row - 1, 0)
+        if self.schedule_model.swap_rows(row, row - 1):
+            self.select_entry(row - 1)
 
     def move_down(self):
-        row = self.entry_table.currentRow()
-        if row >= self.entry_table.rowCount() - 1:
+        row = self.entry_table.currentIndex().row()
+        if row < 0:
+            self.show_error_status("Select a row in the table!", 2000)
             return
-        self.entry_table.setCurrentCell(row, 0)
-        for column in range(
-            1, self.entry_table.columnCount()
-        ):  # Column 0 is the title column
-            try:
-                current, below = QTableWidgetItem(
-                    self.entry_table.item(row, column).text()
-                ), QTableWidgetItem(self.entry_table.item(row + 1, column).text())
-            except (Exception, ValueError):
-                self.show_error_status("Select a row in the table!", 2000)
-                return
-            current.setTextAlignment(4)
-            below.setTextAlignment(4)
-            self.entry_table.setItem(row + 1, column, current)
-            self.entry_table.setItem(row, column, below)
-        self.entry_table.setCurrentCell(row + 1, 0)
+        if self.schedule_model.swap_rows(row, row + 1):
+            self.select_entry(row + 1)
+
+    def select_entry(self, row):
+        if 0 <= row < self.schedule_model.rowCount():
+            self.entry_table.setCurrentIndex(self.schedule_model.index(row, 0))
 
     def remove_rows(self):
         """Clears the schedule of its entries"""
-        for i in range(self.entry_table.rowCount()):
-            self.entry_table.removeRow(0)
-
-    def randomize_items(self):
-        copy = self.selection["files"].copy()
-        randomized_items = []
-        while len(copy) > 0:
-            random_index = random.randint(0, len(copy) - 1)
-            randomized_items.append(copy.pop(random_index))
-        self.selection["files"] = randomized_items
-        self.display_status()
+        self.schedule_model.clear()
 
     def update_total(self):
         """
-        Updates the total number of images and total time based on the entries in the entry_table.
-
-        This method iterates through all rows in the entry_table, summing up the values in the image and time columns.
-        It handles cases where the row is incomplete or contains invalid data, printing debug information if an error occurs.
-        The computed totals are then displayed in the total_table, adding a new row if necessary.
-
-        Returns:
-            None
+        Shows the schedule's total number of images and total time in the
+        total_table. The schedule model keeps both totals as entries
+        change, so nothing is recounted here.
         """
-        # Check if the row is completely set
-        rows = self.entry_table.rowCount()
-        if (
-            self.entry_table.item(rows - 1, 1) is None
-            or self.entry_table.item(rows - 1, 2) is None
-        ):
+        self.total_images = self.schedule_model.total_images
+        self.total_time = self.schedule_model.total_time
+        if self.schedule_model.rowCount() == 0:
+            self.total_table.setRowCount(0)
             return
-        self.total_images = 0
-        self.total_time = 0
-        for row in range(rows):
-            # Amount of images
-            try:
-                self.total_images += int(self.entry_table.item(row, 1).text())
-            except (Exception, ValueError):
-                print(f"BUG self.total_images could not be added from")
-                print(f"row: {row}")
-                print("item", self.entry_table.item(row, 1).text())
-                print(f"{self.entry_table.row()} {self.entry_table.column()}")
-                return
-            # Amount of time
-            try:
-                if int(self.entry_table.item(row, 1).text()) > 0:
-                    self.total_time += int(self.entry_table.item(row, 2).text()) * int(
-                        self.entry_table.item(row, 1).text()
-                    )
-                else:
-                    self.total_time += int(self.entry_table.item(row, 2).text())
-            except (Exception, ValueError):
-                print(f"BUG self.total_time could not be counted from")
-                print(f"row: {row}")
-                print("item", self.entry_table.item(row, 2).text())
-                print(f"{self.entry_table.row()} {self.entry_table.column()}")
-                return
         # Adds a row for total if it's empty
         if self.total_table.rowCount() < 1:
             self.total_table.insertRow(0)
@@ -967,18 +980,20 @@ class MainApp(QMainWindow, Ui_MainWindow):
         self.update_total()
 
     def save(self, wait_status: bool = True):
-        if self.entry_table.rowCount() <= 0:
+        if self.schedule_model.rowCount() <= 0:
             self.show_error_status("Cannot save an empty schedule!", 4000)
             return
         preset_name = self.preset_loader_box.currentText()
         if preset_name == "":
             self.show_error_status("Cannot save an empty name!", 5500)
             return
-        tmppreset = {}
-        for row in range(self.entry_table.rowCount()):
-            tmppreset[row] = []
-            for column in range(self.entry_table.columnCount()):
-                tmppreset[row].append(self.entry_table.item(row, column).text())
+        tmppreset = self.schedule_model.to_preset()
+        # Keep a plan preset in its compact form while the schedule matches it
+        existing = self.presets.get(preset_name)
+        if isinstance(existing, str):
+            with contextlib.suppress(ValueError):
+                if expand_plan(existing) == self.schedule_model.entries():
+                    tmppreset = existing
         # Save to config.json under 'presets'
         self.presets[preset_name] = tmppreset
         self.config["presets"] = self.presets
@@ -1007,22 +1022,14 @@ class MainApp(QMainWindow, Ui_MainWindow):
         # preset, then update the schedule
         preset = self.presets.get(preset_name)
         if preset:
-            self.remove_rows()
-            # preset is a dict: {row_index: [col1, col2, ...], ...}
-            # Sort by row index to preserve order
+            # preset is a dict: {row_index: [col1, col2, ...], ...}, or a
+            # plan such as "breaks(5m, 3*(ladder(30s, 10m, 10m)))"
             try:
-                for row_idx, row_data in sorted(
-                    preset.items(), key=lambda x: int(x[0])
-                ):
-                    row = self.entry_table.rowCount()
-                    self.entry_table.insertRow(row)
-                    for column, value in enumerate(row_data):
-                        item = QTableWidgetItem(value)
-                        item.setTextAlignment(4)
-                        if column == 0:
-                            item.setFlags(QtCore.Qt.ItemIsEnabled)
-                        self.entry_table.setItem(row, column, item)
-            except Exception as e:
+                if isinstance(preset, str):
+                    self.schedule_model.set_entries(expand_plan(preset))
+                else:
+                    self.schedule_model.load_preset(preset)
+            except (ValueError, TypeError, AttributeError) as e:
                 self.show_error_status(f"Error loading preset: {e}", 4000)
 
     # endregion
@@ -1032,9 +1039,8 @@ class MainApp(QMainWindow, Ui_MainWindow):
     def start_session(self):
         """
         Grabs schedule, checks for valid session, checks for empty schedule,
-        grabs randomization setting, save 'recent', insert break.png,
-        shows session window
-        self.selection['files'] => images to display
+        save 'recent', builds the playlist, shows session window
+        self.selection['files'] => images to display (left untouched)
         self.session_schedule => schedule
 
         """
@@ -1044,27 +1050,24 @@ class MainApp(QMainWindow, Ui_MainWindow):
             QTest.qWait(4000)
             self.display_status()
             return
-        # Apply randomization
-        if self.randomize_selection.isChecked():
-            self.randomize_items()
         # Save to recent folder
         self.save_to_recent()
 
         # save config
         self.save(wait_status=False)
 
-        self.insert_breaks()
         self.display = SessionDisplay(
             schedule=self.session_schedule,
-            items=self.selection["files"],
+            items=self.build_playlist(),
             total=self.total_scheduled_images,
+            timeline=SessionTimeline(self.session_schedule),
+            memory_budget=budget_from_config(self.config),
         )
         self.display.closed.connect(self.session_closed)
         self.display.show()
 
     def session_closed(self):
-        """Removes breaks, and displays status"""
-        self.remove_breaks()
+        """Displays status"""
         self.display_status()
         self.activateWindow()
         self.raise_()
@@ -1076,24 +1079,16 @@ class MainApp(QMainWindow, Ui_MainWindow):
         if there are enough images for the schedule.
 
         """
-        # Check if all items are numbers
-        for row in range(self.entry_table.rowCount()):
-            items = []
-            try:
-                for i in range(2):
-                    items.append(int(self.entry_table.item(row, i + 1).text()))
-            except (Exception, ValueError):
-                self.show_error_status("Schedule items must be numbers!")
-                return False
-
         # Check if empty schedule
         if len(self.session_schedule) == 0:
             self.show_error_status("Schedule cannot be empty.")
             return False
-        # Count scheduled images
+        # Count scheduled slots, and the images they show
         self.total_scheduled_images = 0
+        images_needed = 0
         for entry in self.session_schedule:
             self.total_scheduled_images += entry.images
+            images_needed += entry.images_shown
 
         # Check if file exists
         for file in self.selection["files"]:
@@ -1114,7 +1109,7 @@ class MainApp(QMainWindow, Ui_MainWindow):
                 return False
 
         # Check if there are enough selected images for the schedule
-        if self.total_scheduled_images > len(self.selection["files"]):
+        if images_needed > len(self.selection["files"]):
             self.show_error_status(
                 "Not enough images selected. Add more images, or schedule fewer"
                 " images.",
@@ -1123,42 +1118,32 @@ class MainApp(QMainWindow, Ui_MainWindow):
             return False
         return True
 
-    def insert_breaks(self):
-        """Inserts break images as specified by the schedule"""
-        if self.has_break:
-            current_index = 0
-            for entry in self.session_schedule:
-                if entry.images == 0:
-                    self.selection["files"].insert(current_index, ":/break/break.png")
-                    continue
-                current_index += entry.images
+    def build_playlist(self):
+        """
+        The session's images: a view over the selection with break slots
+        from the schedule, shuffled lazily when randomization is on.
+        """
+        return Playlist(
+            self.selection["files"],
+            self.session_schedule,
+            shuffle=self.randomize_selection.isChecked(),
+        )
 
     def remove_breaks(self):
         """
-        Removes all occurrences of 'break.png' from the list of selected files.
-
-        Iterates through the 'files' list in reverse order and removes any file whose
-        basename is 'break.png'. This prevents issues with changing list indices during removal.
-
-        Returns:
-            None
+        Removes break images from the selection. Sessions no longer put them
+        there, but recent settings saved by older versions may contain them.
         """
-        """Removes breaks images from the selection of files"""
-        i = len(self.selection["files"])
-        while i > 0:
-            i -= 1
-            if self.selection["files"][i] == ":/break/break.png":
-                self.selection["files"].pop(i)
+        if BREAK_IMAGE in self.selection["files"]:
+            self.selection["files"][:] = [
+                f for f in self.selection["files"] if f != BREAK_IMAGE
+            ]
 
     def grab_schedule(self):
         """Builds self.session_schedule with data from the schedule"""
-        self.session_schedule = []
-        for row in range(self.entry_table.rowCount()):
-            images = int(self.entry_table.item(row, 1).text())
-            time = int(self.entry_table.item(row, 2).text())
-            if images == 0:
-                self.has_break = True
-            self.session_schedule.append(ScheduleEntry(images, time))
+        self.session_schedule = self.schedule_model.entries()
+        if any(entry.images == 0 for entry in self.session_schedule):
+            self.has_break = True
 
     def save_to_recent(self):
         """
@@ -1202,8 +1187,35 @@ class MainApp(QMainWindow, Ui_MainWindow):
 
 class SessionDisplay(QWidget, Ui_session_display):
     closed = QtCore.pyqtSignal()  # Needed here for close event to work.
-
-    def __init__(self, schedule=None, items=None, total=None, parent=None):
+    # The full-size pixmap (modifiers applied) each time one is rendered
+    image_shown = QtCore.pyqtSignal(QtGui.QPixmap)
+    # Commands scripts can send over the instance socket, and the method
+    # each runs (the same one as the button or hotkey)
+    REMOTE_COMMANDS = {
+        "next": "load_next_image",
+        "previous": "previous_playlist_position",
+        "pause": "pause",
+        "skip": "skip_image",
+        "+30s": "add_30_seconds",
+        "+60s": "add_60_seconds",
+        "restart": "restart_timer",
+        "grayscale": "grayscale",
+        "flip": "flip_horizontal",
+        "flip-vertical": "flip_vertical",
+        "mute": "toggle_mute",
+        "mirror": "toggle_mirrors",
+        "stop": "close",
+    }
+
+    def __init__(
+        self,
+        schedule=None,
+        items=None,
+        total=None,
+        timeline=None,
+        memory_budget=None,
+        parent=None,
+    ):
         super().__init__(parent)
         self.setupUi(self)
         self.init_sizing()
@@ -1256,9 +1268,13 @@ class SessionDisplay(QWidget, Ui_session_display):
         self.drag_start_position = QtCore.QPoint()
         self.drag_threshold = 6
         self.schedule = schedule
+        if not isinstance(items, Playlist):
+            items = Playlist(items, schedule)
         self.playlist = items
         self.playlist_position = 0
         self.total_scheduled_images = total
+        # Start offsets of every slot, for session-wide time left
+        self.timeline = timeline or SessionTimeline(self.schedule)
         self.init_timer()
         self.init_entries()
         self.installEventFilter(self)
@@ -1276,6 +1292,10 @@ class SessionDisplay(QWidget, Ui_session_display):
             btn.setMinimumSize(60, 32)
             btn.setStyleSheet(pause_style)
         self.init_image_mods()
+        self.init_decoding(memory_budget)
+        self.init_animation()
+        self.init_perf_hud()
+        self.mirrors = []
         self.init_mixer()
         break_indices = [
             i for i, entry in enumerate(self.schedule) if entry.images == 0
@@ -1301,6 +1321,15 @@ class SessionDisplay(QWidget, Ui_session_display):
         self.frameless_status = False
         self.sizePolicy().setHeightForWidth(True)
         self.previous_size = self.size()
+        self.image = None
+        # Resize pipeline: cheap previews while the user drags, one smooth
+        # rescale once the drag settles.
+        self.resize_settle_timer = QtCore.QTimer(self)
+        self.resize_settle_timer.setSingleShot(True)
+        self.resize_settle_timer.setInterval(self.RESIZE_SETTLE_MS)
+        self.resize_settle_timer.timeout.connect(self.apply_settled_rescale)
+        # Size requested by prepare_image_mods; its resize event is ignored.
+        self._programmatic_size = None
 
     def init_scaling_size(self):
         """
@@ -1354,6 +1383,38 @@ class SessionDisplay(QWidget, Ui_session_display):
             "grayscale_mode": "perceptual",  # or "simple"
         }
 
+    def init_decoding(self, memory_budget=None):
+        """
+        Decoded-source cache and background decode state. Every new image
+        bumps decode_generation; background results from an older
+        generation are stale and get dropped. self.memory bounds what the
+        decoded images and pixmaps hold; self.image_plan is how the
+        current image was fitted into it.
+        """
+        self.memory = memory_budget or MemoryBudget()
+        self.image_plan = ImagePlan()
+        self.source_path = None
+        self.source_image = None
+        self.source_is_preview = False
+        self.decode_generation = 0
+        self.decode_signals = DecodeSignals(self)
+        self.decode_signals.finished.connect(self.on_full_decode_finished)
+
+    def init_animation(self):
+        """Playback state for multi-frame references (GIF, WebP, APNG)."""
+        self.animation = None
+        self.animation_frame_index = 0
+        self.animation_elapsed_ms = 0.0
+        self.animation_last_tick = 0.0
+        self.animation_timer = QtCore.QTimer(self)
+        self.animation_timer.setSingleShot(True)
+        self.animation_timer.timeout.connect(self.advance_animation)
+
+    def init_perf_hud(self):
+        """Timing and cache counters, shown over the image with Ctrl+I."""
+        self.perf = PerfStats(budget=self.memory)
+        self.perf_hud = PerfHud(self.perf, self.image_display)
+
     def reset_image_mods(self):
         """Reset all image modifications to their default values and update the display."""
         self.init_image_mods()
@@ -1457,7 +1518,20 @@ class SessionDisplay(QWidget, Ui_session_display):
         self.toggle_grayscale_mode_shortcut.activated.connect(
             self.toggle_grayscale_mode
         )
-
+        # Performance overlay
+        self.perf_hud_key = QShortcut(QtGui.QKeySequence("Ctrl+I"), self)
+        self.perf_hud_key.activated.connect(self.perf_hud.toggle)
+        # Mirror windows on other screens
+        self.mirror_key = QShortcut(QtGui.QKeySequence("Ctrl+M"), self)
+        self.mirror_key.activated.connect(self.toggle_mirrors)
+
+    def run_remote_command(self, command):
+        """Runs one of REMOTE_COMMANDS; ValueError for anything else."""
+        method = self.REMOTE_COMMANDS.get(command)
+        if method is None:
+            known = ", ".join(self.REMOTE_COMMANDS)
+            raise ValueError(f"unknown command {command!r} (commands: {known})")
+        getattr(self, method)()
     # --- dynamic centring helpers ------------------------------------------
     # --- SessionDisplay ---------------------------------------------------
 
@@ -1482,9 +1556,60 @@ class SessionDisplay(QWidget, Ui_session_display):
         except Exception:
             pass
 
+    # Delay before the high-quality rescale after the last resize event
+    RESIZE_SETTLE_MS = 150
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._adjust_progressbar_width()
+        if self._programmatic_size is not None:
+            # Window resized by prepare_image_mods to fit the new image, so
+            # the pixmap already matches; rescaling would only feed back.
+            if event.size() == self._programmatic_size:
+                self._programmatic_size = None
+                return
+            self._programmatic_size = None
+        if self.image is None:
+            return
+        self.show_fast_preview()
+        self.resize_settle_timer.start()
+
+    def _fit_size(self):
+        """Size of self.image fitted inside the image display area."""
+        return self.image.size().scaled(
+            self.image_display.size(), QtCore.Qt.KeepAspectRatio
+        )
+
+    def show_fast_preview(self):
+        """Rescale with FastTransformation while a resize is in progress."""
+        self.image_display.setPixmap(
+            self.image.scaled(
+                self._fit_size(),
+                aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                transformMode=QtCore.Qt.FastTransformation,
+            )
+        )
+
+    def apply_settled_rescale(self):
+        """
+        Single SmoothTransformation rescale once resizing has stopped.
+        Only the pixmap changes, the window is never resized from here.
+        """
+        if self.image is None:
+            return
+        fitted = self._fit_size()
+        self.image_scaled = self.image.scaled(
+            fitted,
+            aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+            transformMode=QtCore.Qt.SmoothTransformation,
+        )
+        self.memory.hold("scaled", pixmap_bytes(self.image_scaled))
+        self.image_display.setPixmap(self.image_scaled)
+        # Following images keep the size the user settled on.
+        min_length = min(fitted.width(), fitted.height())
+        if min_length > 0:
+            self.scaling_size = QtCore.QSize(min_length, min_length)
+        self.previous_size = self.size()
 
     def closeEvent(self, event):
         """
@@ -1492,6 +1617,9 @@ class SessionDisplay(QWidget, Ui_session_display):
         """
         self.timer.stop()
         self.close_timer.stop()
+        self.resize_settle_timer.stop()
+        self.stop_animation()
+        self.close_mirrors()
         # Store session sound settings globally for next session
         try:
             import __main__
@@ -1502,6 +1630,8 @@ class SessionDisplay(QWidget, Ui_session_display):
         except:
             pass
         mixer.quit()
+        # A whole session per trace file, even if the app keeps running
+        tracing.write()
         self.closed.emit()
         event.accept()
 
@@ -1595,22 +1725,12 @@ class SessionDisplay(QWidget, Ui_session_display):
         return super(SessionDisplay, self).eventFilter(source, event)
 
     def skip_image(self):
-        if self.playlist[self.playlist_position] == "break.png":
+        if self.playlist.is_break(self.playlist_position):
             print(f"No images to skip on break {self.playlist[self.playlist_position]}")
             self.setWindowTitle("No images to skip on break")
             return
 
-        swap_indicies = list(range(self.playlist_position + 1, len(self.playlist)))
-        random.shuffle(swap_indicies)
-        while swap_indicies:
-            swap_index = swap_indicies.pop()
-            if self.playlist[swap_index] != "break.png":
-                self.playlist[self.playlist_position], self.playlist[swap_index] = (
-                    self.playlist[swap_index],
-                    self.playlist[self.playlist_position],
-                )
-                break
-        else:
+        if not self.playlist.skip(self.playlist_position):
             print(f"No images to skip to {self.playlist[self.playlist_position]}")
             self.setWindowTitle("No remaining unused images to skip to")
             return
@@ -1702,23 +1822,28 @@ class SessionDisplay(QWidget, Ui_session_display):
         else:
             self._set_timer_visuals(False)
 
+    def play_cue(self, name):
+        """Plays one of the session's sound cues."""
+        with tracing.span("play_cue", cue=name):
+            with sound_file(name) as p:
+                mixer.music.load(str(p))
+            mixer.music.play()
+
+    @traced()
     def display_image(self, play_sound=True):
         print(self.entry)
+        start = time.perf_counter()
+        tracing.instant("image", position=self.playlist_position)
+        self.timeline.seek(self.playlist_position)
         # Sounds
         if play_sound:
             if self.new_entry:
-                with sound_file("new_entry.mp3") as p:
-                    mixer.music.load(str(p))
-                mixer.music.play()
+                self.play_cue("new_entry.mp3")
                 # self.new_entry = False
             elif self.entry["amount of items"] == 0:  # Last image in entry
-                with sound_file("last_entry_image.mp3") as p:
-                    mixer.music.load(str(p))
-                mixer.music.play()
+                self.play_cue("last_entry_image.mp3")
             elif self.entry["time"] > 10:
-                with sound_file("new_image.mp3") as p:
-                    mixer.music.load(str(p))
-                mixer.music.play()
+                self.play_cue("new_image.mp3")
 
         if self.playlist_position >= len(self.playlist):  # Last image
             self.timer.stop()
@@ -1730,7 +1855,7 @@ class SessionDisplay(QWidget, Ui_session_display):
             #             self.playlist[self.playlist_position]
             #         ) == 'break.png'):  # Break scheduled
             if (
-                self.playlist[self.playlist_position] == ":/break/break.png"
+                self.playlist.is_break(self.playlist_position)
             ):  # Break scheduled
                 """
                 Since the end of an entry has been reached, or a break is scheduled,
@@ -1768,25 +1893,144 @@ class SessionDisplay(QWidget, Ui_session_display):
             #     f"/{current_entry.images}"
             # )
             self.prepare_image_mods()
+            self.perf.transition_ms = (time.perf_counter() - start) * 1000
 
+    @traced()
     def prepare_image_mods(self):
         """
         self.image gets modified depending on which value in self.image_mods
         is true.
         """
+        paths = self.playlist.slot_files(self.playlist_position)
+        # A grid slot is decoded and cached as one image, keyed by all its paths
+        path = paths[0] if len(paths) == 1 else tuple(paths)
+        if path != self.source_path:
+            # New image: anything still decoding for the previous one is stale
+            self.decode_generation += 1
+            self.cache_source(path, None)
+            self.image_plan = ImagePlan()
+        if self.animation is not None and (
+            self.animation.path != path or self.image_mods["break"]
+        ):
+            self.stop_animation()
+        start = time.perf_counter()
+        source = "decode"
         # Break scheduled
         if self.image_mods["break"]:
-            cvimage = self.convert_to_cvimage()
-        # jpg file
-        elif self.playlist[self.playlist_position][-3:].lower() == "jpg":
-            cvimage = self.convert_to_cvimage()
-        # Edge cases are handled
+            cvimage = decode_file(path)
+        # Modifier changed on a playing animation, reuse the decoded frame
+        elif self.animation is not None:
+            cvimage = self.animation.frame(self.animation_frame_index)
+            source = "cache"
+        # Modifier changed on the current image, reuse the decoded source
+        elif self.source_image is not None:
+            cvimage = self.source_image
+            source = "cache"
+        # Grid slot: its images decoded in parallel into one composite
+        elif isinstance(path, tuple):
+            screen = self.screen_device_size()
+            cvimage = decode_grid(path, screen.width(), screen.height())
+            self.cache_source(path, cvimage)
+            source = "grid"
+        # Multi-frame file
+        elif (
+            os.path.splitext(path)[1].lower() in self.ANIMATED_FILE_TYPES
+            and is_multi_frame(path)
+        ):
+            cvimage = self.start_animation(path)
+            source = "animation"
+        # Large file: preview now, full quality from a background decode
+        elif wants_progressive(path):
+            cvimage = self.start_progressive_decode(path)
+            if self.source_is_preview:
+                source = "preview"
         else:
-            # Read image as bytes and decode to preserve all channels (including alpha)
-            with open(self.playlist[self.playlist_position], "rb") as f:
-                file_bytes = np.asarray(bytearray(f.read()), dtype=np.uint8)
-                cvimage = cv2.imdecode(file_bytes, cv2.IMREAD_UNCHANGED)
+            cvimage = self.decode_within_budget(path)
+            self.cache_source(path, cvimage)
+        self.perf.record_load(source, (time.perf_counter() - start) * 1000)
+        self.render_cvimage(cvimage)
+
+    def cache_source(self, path, cvimage, is_preview=False):
+        self.source_path = path
+        self.source_image = cvimage
+        self.source_is_preview = is_preview
+        self.memory.hold("source", 0 if cvimage is None else cvimage.nbytes)
+
+    def screen_device_size(self):
+        """Screen size in device pixels, the most a pixmap can show."""
+        return self.screen().size() * self.screen().devicePixelRatio()
+
+    def plan_image(self, width, height, channels=3):
+        """Fits an image of this size into self.memory, noting any degradation."""
+        screen = self.screen_device_size()
+        plan = self.memory.plan_image(
+            width, height, channels, screen.width() * screen.height()
+        )
+        if plan.reduce > 1:
+            self.memory.note("reduced decode", reduce=plan.reduce)
+        elif not plan.keep_full_pixmap:
+            self.memory.note("screen-size pixmap")
+        self.image_plan = plan
+        return plan
+
+    def decode_within_budget(self, path):
+        """Decodes *path* no larger than the memory budget allows."""
+        size = image_size(path)
+        if size is not None:
+            return decode_file(path, self.plan_image(*size).reduce)
+        # No size in the header: decode, then shrink if it doesn't fit
+        cvimage = decode_file(path)
+        if cvimage is not None:
+            height, width = cvimage.shape[:2]
+            channels = 1 if cvimage.ndim == 2 else cvimage.shape[2]
+            cvimage = reduce_image(
+                cvimage, self.plan_image(width, height, channels).reduce
+            )
+        return cvimage
 
+    def start_progressive_decode(self, path):
+        """
+        Queues the full decode of *path* and returns a preview to show in
+        the meantime, or a flat placeholder of the image's shape for
+        formats without one (PNG, TIFF), so the UI thread never decodes
+        a large file. Under memory pressure the background decode is
+        reduced, or skipped when the preview is already as small.
+        """
+        size = image_size(path)
+        reduce = self.plan_image(*size).reduce if size is not None else 1
+        preview = decode_preview(path)
+        if preview is None:
+            preview = placeholder(size)
+        elif reduce >= REDUCE_FACTORS[-1]:
+            self.cache_source(path, preview, is_preview=True)
+            self.memory.note("skipped background decode")
+            return preview
+        self.cache_source(path, preview, is_preview=True)
+        self.perf.pending_decodes += 1
+        decode_pool().start(
+            DecodeTask(path, self.decode_generation, self.decode_signals, reduce)
+        )
+        return preview
+
+    def on_full_decode_finished(self, generation, path, cvimage):
+        """Swaps the preview for the full decode unless the user moved on."""
+        self.perf.pending_decodes -= 1
+        if generation != self.decode_generation or path != self.source_path:
+            return  # stale: a newer image has been requested since
+        if cvimage is None:
+            return  # keep the preview rather than showing an error
+        self.cache_source(path, cvimage)
+        # The preview already gave the window its shape; refitting could
+        # resize it under a user who is dragging it
+        self.render_cvimage(cvimage, refit=False)
+
+    @traced()
+    def render_cvimage(self, cvimage, refit=True):
+        """
+        Applies self.image_mods to a decoded image and shows it.
+        With refit=False (animation frames, a preview's full decode) the
+        window keeps its size.
+        """
         # Handle if cvimage is None or empty
         if cvimage is None or cvimage.size == 0:
             print(
@@ -1804,14 +2048,84 @@ class SessionDisplay(QWidget, Ui_session_display):
         except (AttributeError, ValueError, BufferError) as e:
             self.setWindowTitle("Error processing image")
             return
+        if refit:
+            print(f"cvimage shape: {cvimage.shape}, channels: {channels}")
+        pixmap = self.cvimage_to_pixmap(self.apply_image_mods(cvimage))
+        if pixmap is None:
+            self.setWindowTitle("Error processing image")
+            return
+        screen = self.screen_device_size()
+        if not self.image_plan.keep_full_pixmap and (
+            pixmap.width() > screen.width() or pixmap.height() > screen.height()
+        ):
+            # Over budget: resizes rescale a screen-size copy instead
+            pixmap = pixmap.scaled(
+                screen,
+                aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                transformMode=QtCore.Qt.SmoothTransformation,
+            )
+        self.image = pixmap
+        self.memory.hold("pixmap", pixmap_bytes(self.image))
+        self.image_shown.emit(self.image)
+        if not refit:
+            if self.resize_settle_timer.isActive():
+                return  # mid-resize: the settle rescale shows the new image
+            # Next animation frame or full decode: same geometry as the
+            # image it replaces
+            self.image_scaled = self.image.scaled(
+                self._fit_size(),
+                aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                transformMode=QtCore.Qt.SmoothTransformation,
+            )
+            self.image_display.setPixmap(self.image_scaled)
+            return
+        # A pending settle rescale would be for the previous image
+        self.resize_settle_timer.stop()
+        if self.toggle_resize_status:  # If toggle resize is true
+            self.image_display.setPixmap(
+                self.image.scaled(
+                    self.image_display.size(),
+                    aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                    transformMode=QtCore.Qt.SmoothTransformation,
+                )
+            )
+            return
+        # Display image scaled to window size in image display.
+        # self.scaling_size follows user resizes via apply_settled_rescale.
+        # Get scaled pixmap
+        with tracing.span("scale"):
+            self.image_scaled = self.image.scaled(
+                self.scaling_size,
+                aspectRatioMode=QtCore.Qt.KeepAspectRatioByExpanding,
+                transformMode=QtCore.Qt.SmoothTransformation,
+            )
+        self.memory.hold("scaled", pixmap_bytes(self.image_scaled))
+        # Set
+        self.image_display.setPixmap(self.image_scaled)
+        # Resize
+        self.image_display.resize(self.image_scaled.size())
+        target = QtCore.QSize(
+            self.image_scaled.size().width(),
+            # 32 is the current height of the nav bar in px
+            self.image_scaled.size().height() + 32,
+        ).expandedTo(self.minimumSize())
+        if target != self.size():
+            self._programmatic_size = target
+            self.resize(target)
+        # Save current size
+        self.previous_size = self.size()
+
+    @traced()
+    def apply_image_mods(self, cvimage):
+        """
+        Returns *cvimage* with brightness/contrast, grayscale, threshold,
+        edge detection and flips from self.image_mods applied.
+        """
         # Brightness and contrast
         b = self.image_mods["brightness"]
         c = self.image_mods["contrast"]
         if b != 0 or c != 1.0:
             cvimage = cv2.convertScaleAbs(cvimage, alpha=c, beta=b)
-        print(f"cvimage shape: {cvimage.shape}, channels: {channels}")
-        # if channels == 4:
-        #     return
 
         # Grayscale/threshold/edge
         grayscale_active = (
@@ -1836,12 +2150,15 @@ class SessionDisplay(QWidget, Ui_session_display):
             cvimage = cv2.flip(cvimage, 1)
         if self.image_mods["vflip"]:
             cvimage = cv2.flip(cvimage, 0)
+        return cvimage
 
-        # Convert to QImage
+    @traced()
+    def cvimage_to_pixmap(self, cvimage):
+        """QPixmap of a grayscale, BGR or BGRA image, or None for other layouts."""
         height, width = cvimage.shape[:2]
         if cvimage.ndim == 2:  # Grayscale image
             bytes_per_line = width
-            self.image = QtGui.QImage(
+            image = QtGui.QImage(
                 cvimage.data,
                 width,
                 height,
@@ -1857,58 +2174,53 @@ class SessionDisplay(QWidget, Ui_session_display):
                 cvimage = cv2.cvtColor(cvimage, cv2.COLOR_BGR2RGB)
                 fmt = QtGui.QImage.Format_RGB888
             else:
-                self.setWindowTitle("Error processing image")
-                return
+                return None
             bytes_per_line = width * channels
-            self.image = QtGui.QImage(cvimage.data, width, height, bytes_per_line, fmt)
-
-        # Convert to QPixmap
-        self.image = QtGui.QPixmap.fromImage(self.image)
-        if self.toggle_resize_status:  # If toggle resize is true
-            self.image_display.setPixmap(
-                self.image.scaled(
-                    self.size(),
-                    aspectRatioMode=QtCore.Qt.KeepAspectRatio,
-                    transformMode=QtCore.Qt.SmoothTransformation,
-                )
-            )
+            image = QtGui.QImage(cvimage.data, width, height, bytes_per_line, fmt)
+        # fromImage copies the pixels, so cvimage may go away after this
+        return QtGui.QPixmap.fromImage(image)
+
+    # Extensions that may hold more than one frame
+    ANIMATED_FILE_TYPES = {".gif", ".webp", ".png", ".apng"}
+
+    def start_animation(self, path):
+        """Open *path* as a frame stream and return its first frame."""
+        cache_bytes = self.memory.frame_cache_bytes(DEFAULT_CACHE_BYTES)
+        if cache_bytes < DEFAULT_CACHE_BYTES:
+            self.memory.note("smaller frame cache", cache_mb=cache_bytes // 2**20)
+        self.memory.hold("frames", cache_bytes)
+        self.animation = AnimatedImage(path, cache_bytes)
+        self.animation_elapsed_ms = 0.0
+        self.animation_last_tick = time.monotonic()
+        self.animation_frame_index, frame = self.animation.frame_at(0)
+        self.animation_timer.start(self.animation.time_to_next_frame(0))
+        return frame
+
+    def stop_animation(self):
+        self.animation_timer.stop()
+        self.animation = None
+        self.memory.release("frames")
+        self.animation_frame_index = 0
+
+    def advance_animation(self):
+        """
+        Shows the frame due at the current animation time. Time only
+        advances while the session timer runs, so pausing the session
+        pauses playback as well.
+        """
+        if self.animation is None:
             return
-        # Display image scaled to window size in image display
-        # If resized
-        if self.size() != self.previous_size:
-            resized_pixmap = self.image_display.pixmap()
-            scaled_size = self.scaling_size.scaled(
-                resized_pixmap.size(), QtCore.Qt.KeepAspectRatio
-            )
-            self.scaling_size = QtCore.QSize(scaled_size)
-
-        # Get scaled pixmap
-        self.image_scaled = self.image.scaled(
-            self.scaling_size,
-            aspectRatioMode=QtCore.Qt.KeepAspectRatioByExpanding,
-            transformMode=QtCore.Qt.SmoothTransformation,
-        )
-        # Set
-        self.image_display.setPixmap(self.image_scaled)
-        # Resize
-        self.image_display.resize(self.image_scaled.size())
-        self.resize(
-            self.image_scaled.size().width(),
-            # 32 is the current height of the nav bar in px
-            self.image_scaled.size().height() + 32,
+        now = time.monotonic()
+        if self.timer.isActive() or self.session_finished:
+            self.animation_elapsed_ms += (now - self.animation_last_tick) * 1000
+        self.animation_last_tick = now
+        index, frame = self.animation.frame_at(self.animation_elapsed_ms)
+        if index != self.animation_frame_index and frame is not None:
+            self.animation_frame_index = index
+            self.render_cvimage(frame, refit=False)
+        self.animation_timer.start(
+            self.animation.time_to_next_frame(self.animation_elapsed_ms)
         )
-        # Save current size
-        self.previous_size = self.size()
-
-    def convert_to_cvimage(self):
-        file = QtCore.QFile()
-        file.setFileName(self.playlist[self.playlist_position])
-        file.open(QtCore.QFile.OpenModeFlag.ReadOnly)
-        ba = file.readAll()
-        ba = ba.data()
-        ba = np.asarray(bytearray(ba), dtype="uint8")
-        file.close()
-        return cv2.imdecode(ba, 1)
 
     def to_fidelous_grayscale(self, image):
         # Convert to RGB, handling alpha by compositing on white if present
@@ -1929,6 +2241,10 @@ class SessionDisplay(QWidget, Ui_session_display):
 
     def to_simple_grayscale(self, image):
         """Simple grayscale: convert BGR image to single channel grayscale."""
+        if image.ndim == 2:
+            return image
+        if image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
         return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
     def toggle_grayscale_mode(self):
@@ -1994,6 +2310,40 @@ class SessionDisplay(QWidget, Ui_session_display):
             self.toggle_resize_status = False
             self.sizePolicy().setHeightForWidth(True)
 
+    def toggle_mirrors(self):
+        """
+        Opens a full-screen mirror of the session image on every other
+        screen (one ordinary window with a single screen), or closes the
+        mirrors if any are open. Mirrors share this window's decoded image
+        and pixmap; each only rescales it to its own size.
+        """
+        if self.mirrors:
+            self.close_mirrors()
+            return
+        screens = [s for s in QApplication.screens() if s is not self.screen()]
+        for index, screen in enumerate(screens or [None]):
+            mirror = MirrorView(self.memory, key=f"mirror {index}")
+            self.image_shown.connect(mirror.set_source)
+            mirror.destroyed.connect(lambda _, mirror=mirror: self.forget_mirror(mirror))
+            if self.image is not None:
+                mirror.set_source(self.image)
+            mirror.show_on(screen)
+            self.mirrors.append(mirror)
+        # Hotkeys keep going to the session window
+        self.activateWindow()
+
+    def close_mirrors(self):
+        mirrors, self.mirrors = self.mirrors, []
+        for mirror in mirrors:
+            self.image_shown.disconnect(mirror.set_source)
+            mirror.close()
+
+    def forget_mirror(self, mirror):
+        """Drops a mirror closed from its own window."""
+        if mirror in self.mirrors:
+            self.mirrors.remove(mirror)
+            self.image_shown.disconnect(mirror.set_source)
+
     def toggle_always_on_top(self):
         if self.toggle_always_on_top_status is not True:
             self.toggle_always_on_top_status = True
@@ -2112,33 +2462,27 @@ class SessionDisplay(QWidget, Ui_session_display):
         sec = int(self.time_seconds - (minutes * 60))
         return f"{minutes}:{sec}"
 
+    @traced()
     def countdown(self):
+        self.perf.record_tick(time.monotonic(), self.timer.interval())
         self.update_timer_display()
         if self.entry["time"] >= 30:
             if self.time_seconds == self.entry["time"] // 2:
-                with sound_file("halfway.mp3") as p:
-                    mixer.music.load(str(p))
-                mixer.music.play()
+                self.play_cue("halfway.mp3")
         if self.time_seconds <= 10:
             if self.new_entry is False and self.end_of_entry is False:
                 if self.time_seconds == 10:
-                    with sound_file("first_alert.mp3") as p:
-                        mixer.music.load(str(p))
-                    mixer.music.play()
+                    self.play_cue("first_alert.mp3")
                 elif self.time_seconds == 5:
-                    with sound_file("second_alert.mp3") as p:
-                        mixer.music.load(str(p))
-                    mixer.music.play()
+                    self.play_cue("second_alert.mp3")
                 elif self.time_seconds == 0.5:
-                    with sound_file("third_alert.mp3") as p:
-                        mixer.music.load(str(p))
-                    mixer.music.play()
+                    self.play_cue("third_alert.mp3")
             else:
                 if self.new_entry is True:
                     self.new_entry = False
                 if self.end_of_entry is True:
                     self.end_of_entry = False
-            if self.playlist[self.playlist_position] == ":/break/break.png":
+            if self.playlist.is_break(self.playlist_position):
                 self.image_mods["break_grayscale"] = False
                 self.prepare_image_mods()
         if self.time_seconds == 0:
@@ -2163,6 +2507,15 @@ class SessionDisplay(QWidget, Ui_session_display):
         if len(self.sec) == 1 or self.sec[0] == "0":
             self.sec.insert(0, "0")
         self.display_time()
+        self.timer_display.setToolTip(self.session_time_text())
+
+    def session_time_text(self):
+        """Time left in the session and until the next break."""
+        text = f"Session: {format_duration(self.timeline.remaining(self.time_seconds))} left"
+        next_break = self.timeline.until_next_break(self.time_seconds)
+        if next_break is not None:
+            text += f" | Next break in {format_duration(next_break)}"
+        return text
 
     # Constants for timer visuals
     PAUSE_BUTTON_RUNNING_STYLE = (
@@ -2224,18 +2577,23 @@ class SessionDisplay(QWidget, Ui_session_display):
         if self.session_finished:
             return
         self.time_seconds += 30
+        self.timeline.extend(self.playlist_position, 30)
         self.update_timer_display()
 
     def add_60_seconds(self):
         if self.session_finished:
             return
         self.time_seconds += 60
+        self.timeline.extend(self.playlist_position, 60)
         self.update_timer_display()
 
     def restart_timer(self):
         if self.session_finished:
             return
-        self.time_seconds = self.schedule[self.entry["current"]].time
+        # The time already spent on this slot stays spent
+        full = self.schedule[self.entry["current"]].time
+        self.timeline.extend(self.playlist_position, full - self.time_seconds)
+        self.time_seconds = full
 
     def update_close_title(self):
         self.setWindowTitle(
@@ -2279,8 +2637,8 @@ class SessionDisplay(QWidget, Ui_session_display):
     # endregion
 
 
-def main():
-    """Main entry point for the GestureSesh application."""
+def create_application():
+    """The QApplication, styled and configured for GestureSesh windows."""
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
@@ -2289,6 +2647,14 @@ def main():
     # Session manager attribute is not universally supported, so ignore if not present
     if hasattr(QtCore.Qt, "AA_DisableSessionManager"):
         app.setAttribute(QtCore.Qt.AA_DisableSessionManager, True)
+    return app
+
+
+def main():
+    """Main entry point for the GestureSesh application."""
+    # Duplicate scans hash images in worker processes; frozen builds need this
+    multiprocessing.freeze_support()
+    app = create_application()
 
     view = MainApp()
     view.show_and_activate()
@@ -0,0 +1,135 @@
+# memory_budget.py - Memory ceiling for the images a session keeps decoded
+"""
+For each image the session window holds the decoded source (reused when
+a modifier changes), a full-resolution pixmap made from it (rescaled on
+every window resize), the scaled pixmap on screen and, for animations, a
+cache of decoded frames. MemoryBudget tallies what each of those holds
+and, when the next image would not fit, picks the cheapest way to shed
+memory, in order:
+
+1. Keep a screen-size pixmap instead of the full-resolution one; the
+   decoded source stays full size, so nothing visible is lost.
+2. Decode at 1/2, 1/4 or 1/8 size.
+
+Background full-quality decodes of large files run at the same reduced
+size, and are skipped when the preview is already that small. Animation
+frame caches only get what the still images leave over.
+
+Sizes are estimates from the image dimensions; Qt's own allocations and
+modifier temporaries are not measured.
+"""
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+
+from gesturesesh import tracing
+
+DEFAULT_BUDGET_MB = 1024
+# Smallest budget accepted from config.json
+MIN_BUDGET_MB = 64
+# Reduce factors decoders support, in the order they are tried
+REDUCE_FACTORS = (1, 2, 4, 8)
+# Bytes per pixel of a pixmap (Qt stores colour pixmaps as 32-bit)
+PIXMAP_BPP = 4
+# Smallest frame cache an animation is given, even under pressure
+MIN_FRAME_CACHE_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ImagePlan:
+    """How to decode and keep one image."""
+
+    reduce: int = 1
+    keep_full_pixmap: bool = True
+
+
+class MemoryBudget:
+    """Bytes held per buffer ("source", "pixmap", ...) against a limit."""
+
+    def __init__(self, limit_bytes: int = DEFAULT_BUDGET_MB * 2**20):
+        self.limit = limit_bytes
+        self.held: dict[str, int] = {}
+        self.peak = 0
+        self.actions: Counter[str] = Counter()
+        self.last_action = ""
+
+    @property
+    def total(self) -> int:
+        return sum(self.held.values())
+
+    @property
+    def pressure(self) -> float:
+        """Fraction of the budget in use."""
+        return self.total / self.limit
+
+    def hold(self, name: str, nbytes: int) -> None:
+        """Record that buffer *name* now holds *nbytes* (replacing its old size)."""
+        self.held[name] = nbytes
+        self.peak = max(self.peak, self.total)
+
+    def release(self, name: str) -> None:
+        self.held.pop(name, None)
+
+    def available(self, *excluding: str) -> int:
+        """Bytes left if the buffers named in *excluding* were freed."""
+        others = sum(n for name, n in self.held.items() if name not in excluding)
+        return self.limit - others
+
+    def plan_image(
+        self, width: int, height: int, channels: int = 3, screen_pixels: int = 0
+    ) -> ImagePlan:
+        """
+        Cheapest plan that fits a *width* x *height* image in place of the
+        current source and full-size pixmap (the pixmap on screen is
+        assumed to stay about the size it is). *screen_pixels* caps the
+        pixmap size once full resolution is given up. Beyond the smallest
+        reduce the image is shown anyway, over budget.
+        """
+        room = self.available("source", "pixmap")
+        pixels = width * height
+        if pixels * (channels + PIXMAP_BPP) <= room:
+            return ImagePlan()
+        for reduce in REDUCE_FACTORS:
+            # Decoders round reduced sizes up
+            reduced = -(-width // reduce) * -(-height // reduce)
+            shown = min(reduced, screen_pixels) if screen_pixels else reduced
+            if reduced * channels + shown * PIXMAP_BPP <= room:
+                return ImagePlan(reduce, keep_full_pixmap=False)
+        return ImagePlan(REDUCE_FACTORS[-1], keep_full_pixmap=False)
+
+    def frame_cache_bytes(self, wanted: int) -> int:
+        """Size for an animation's frame cache: *wanted*, or half of what is left."""
+        spare = self.available("frames") // 2
+        return max(MIN_FRAME_CACHE_BYTES, min(wanted, spare))
+
+    def note(self, action: str, **args) -> None:
+        """Count a degradation and mark it in the trace."""
+        self.actions[action] += 1
+        self.last_action = action
+        tracing.instant(
+            "memory_pressure",
+            action=action,
+            held_mb=round(self.total / 2**20, 1),
+            limit_mb=round(self.limit / 2**20, 1),
+            **args,
+        )
+
+
+def pixmap_bytes(pixmap) -> int:
+    """Bytes held by a QPixmap (or QImage)."""
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+def budget_from_config(config: dict) -> MemoryBudget:
+    """MemoryBudget sized by config.json's "memory_budget_mb"."""
+    value = config.get("memory_budget_mb", DEFAULT_BUDGET_MB)
+    try:
+        megabytes = float(value)
+        if not math.isfinite(megabytes):  # JSON allows Infinity and NaN
+            raise ValueError(value)
+    except (TypeError, ValueError):
+        print(f"Ignoring invalid memory_budget_mb {value!r} in config.json")
+        megabytes = DEFAULT_BUDGET_MB
+    return MemoryBudget(int(max(MIN_BUDGET_MB, megabytes) * 2**20))
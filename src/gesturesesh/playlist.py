@@ -0,0 +1,160 @@
+# playlist.py - The session's image sequence as a view over the selection
+from __future__ import annotations
+
+import bisect
+import random
+from collections.abc import Sequence
+
+from gesturesesh.schedule import ScheduleEntry
+
+BREAK_IMAGE = ":/break/break.png"
+
+
+class Playlist(Sequence):
+    """
+    What a session shows, slot by slot: the selected files in order (or
+    shuffled) with a virtual BREAK_IMAGE slot wherever the schedule has a
+    break entry. A grid entry's slots each take several images
+    (slot_files); indexing a slot gives its first.
+
+    The selection is neither copied nor modified. Shuffling is a lazy
+    Fisher-Yates: the k-th image is drawn the first time a slot up to k
+    is looked at, and the drawn order lives in a sparse dict of swapped
+    positions, so starting a session costs O(number of entries) however
+    large the selection is.
+    """
+
+    def __init__(
+        self,
+        files: Sequence[str],
+        schedule: Sequence[ScheduleEntry],
+        shuffle: bool = False,
+        rng: random.Random | None = None,
+    ):
+        self._files = files
+        self._shuffle = shuffle
+        self._rng = rng or random.Random()
+        self._order: dict[int, int] = {}  # image position -> file index, where moved
+        self._drawn = 0  # image positions fixed so far when shuffling
+        # One segment per schedule entry: its first slot, its first image
+        # position and images per slot (0 for a break), ascending. Files
+        # past the schedule follow one per slot.
+        self._slots: list[int] = []
+        self._images: list[int] = []
+        self._per_slot: list[int] = []
+        slot = image = 0
+        for entry in schedule:
+            if entry.images == 0:
+                self._add_segment(slot, image, 0)
+                slot += 1
+            else:
+                self._add_segment(slot, image, entry.per_slot)
+                slot += entry.images
+                image += entry.images_shown
+        self._add_segment(slot, image, 1)
+        self._length = (-1, 0)  # (file count, slots) of the last __len__
+
+    def __len__(self) -> int:
+        count = len(self._files)
+        if self._length[0] != count:
+            self._length = (count, self._count_slots(count))
+        return self._length[1]
+
+    def __getitem__(self, slot):
+        if isinstance(slot, slice):
+            return [self[i] for i in range(*slot.indices(len(self)))]
+        if slot < 0:
+            slot += len(self)
+        if not 0 <= slot < len(self):
+            raise IndexError("playlist index out of range")
+        image, _ = self._image_positions(slot)
+        if image is None:
+            return BREAK_IMAGE
+        return self._files[self._file_index(image)]
+
+    def slot_files(self, slot: int) -> list[str]:
+        """Every image *slot* shows: [BREAK_IMAGE] on a break."""
+        image, count = self._image_positions(slot)
+        if image is None:
+            return [BREAK_IMAGE]
+        end = min(image + count, len(self._files))
+        return [self._files[self._file_index(i)] for i in range(image, end)]
+
+    def is_break(self, slot: int) -> bool:
+        return self._per_slot[self._segment(slot)] == 0
+
+    def skip(self, slot: int) -> bool:
+        """
+        Swap the images at *slot* with random images after it, as the
+        session's skip does. Returns False on a break or when no image
+        is left to swap in.
+        """
+        image, count = self._image_positions(slot)
+        if image is None or image + count >= len(self._files):
+            return False
+        later = range(image + count, len(self._files))
+        others = self._rng.sample(later, min(count, len(later)))
+        for position, other in zip(range(image, image + count), others):
+            first, second = self._file_index(position), self._order.get(other, other)
+            self._order[position], self._order[other] = second, first
+        return True
+
+    # ---------------------------------------------------------------------
+    #                             Internals
+    # ---------------------------------------------------------------------
+    def _add_segment(self, slot, image, per_slot):
+        if self._slots and self._slots[-1] == slot:  # an entry of 0 slots
+            self._images[-1], self._per_slot[-1] = image, per_slot
+            return
+        self._slots.append(slot)
+        self._images.append(image)
+        self._per_slot.append(per_slot)
+
+    def _segment(self, slot):
+        return bisect.bisect_right(self._slots, slot) - 1
+
+    def _image_positions(self, slot):
+        """
+        (first image position, image count) for *slot*, or (None, 0) for
+        a break slot.
+        """
+        segment = self._segment(slot)
+        per_slot = self._per_slot[segment]
+        if per_slot == 0:
+            return None, 0
+        offset = slot - self._slots[segment]
+        return self._images[segment] + offset * per_slot, per_slot
+
+    def _count_slots(self, files):
+        """Slots with an image among *files* to show, and every break."""
+        slots = 0
+        ends = self._slots[1:] + [None]
+        for start, image, per_slot, end in zip(
+            self._slots, self._images, self._per_slot, ends
+        ):
+            if per_slot == 0:
+                slots += 1
+                continue
+            shown = -(-max(0, files - image) // per_slot)  # rounded up
+            slots += shown if end is None else min(shown, end - start)
+        return slots
+
+    def _file_index(self, image):
+        self._draw(image)
+        return self._order.get(image, image)
+
+    def _draw(self, image):
+        """Fix the shuffled order up to and including *image*."""
+        if not self._shuffle:
+            return
+        count = len(self._files)
+        order = self._order
+        while self._drawn <= image:
+            position = self._drawn
+            pick = self._rng.randrange(position, count)
+            if pick != position:
+                order[position], order[pick] = (
+                    order.get(pick, pick),
+                    order.get(position, position),
+                )
+            self._drawn += 1
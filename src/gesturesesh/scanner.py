@@ -0,0 +1,69 @@
+# scanner.py - Recursive folder scan for supported image files
+"""
+A single pass over each folder tree with os.scandir. File types come from
+the directory entries themselves (no stat per file on Linux, macOS or
+Windows, except for symlinks), and every folder is stat'ed once so a
+folder reached again through a symlink, or a link loop, is walked only
+once.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Collection, Iterable
+
+
+@dataclass
+class ScanResult:
+    files: list[str] = field(default_factory=list)  # in walk order
+    invalid: int = 0  # files skipped: unsupported type, broken link, special file
+    missing: list[str] = field(default_factory=list)  # roots that aren't folders
+
+
+def scan_folders(folders: Iterable[str], extensions: Collection[str]) -> ScanResult:
+    """
+    Supported files under *folders*, recursively, in os.walk's top-down
+    order. *extensions* are lower-case with the dot; matching ignores
+    case. Unreadable folders are skipped.
+    """
+    result = ScanResult()
+    visited: set[tuple[int, int]] = set()
+    seen: set[str] = set()
+    for folder in folders:
+        if not os.path.isdir(folder):
+            result.missing.append(folder)
+            continue
+        stack = [folder]
+        while stack:
+            path = stack.pop()
+            try:
+                stat = os.stat(path)
+                key = (stat.st_dev, stat.st_ino)
+                if key in visited:
+                    continue
+                visited.add(key)
+                with os.scandir(path) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+            subfolders = []
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subfolders.append(entry.path)
+                        continue
+                    is_file = entry.is_file()
+                except OSError:
+                    is_file = False
+                if (
+                    is_file
+                    and os.path.splitext(entry.name)[1].lower() in extensions
+                ):
+                    if entry.path not in seen:
+                        seen.add(entry.path)
+                        result.files.append(entry.path)
+                else:
+                    result.invalid += 1
+            # Popped in listing order, after this folder's files
+            stack.extend(reversed(subfolders))
+    return result
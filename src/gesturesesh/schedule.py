@@ -0,0 +1,282 @@
+# schedule.py - Session schedule entries and the table model behind them
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtCore import Qt
+
+# Most images a grid slot shows side by side
+MAX_PER_SLOT = 4
+# Bound on schedule totals, well inside int64
+MAX_TOTAL = 2**62
+
+
+@dataclass
+class ScheduleEntry:
+    images: int  # slots; 0 marks a break
+    time: int  # seconds per slot, or the length of a break
+    per_slot: int = 1  # images shown side by side in each slot (a grid)
+
+    @property
+    def duration(self) -> int:
+        """Seconds this entry adds to the session."""
+        return self.images * self.time if self.images > 0 else self.time
+
+    @property
+    def images_shown(self) -> int:
+        """Images this entry takes from the selection."""
+        return self.images * self.per_slot
+
+
+def schedule_totals(entries: Iterable[ScheduleEntry]) -> tuple[int, int]:
+    """
+    (total images shown, total seconds) for *entries*, checked and summed
+    over arrays in one pass. Raises ValueError naming the first entry
+    with a negative image count, a time under one second or a grid size
+    outside 1 to MAX_PER_SLOT, and for totals too large to count.
+    """
+    try:
+        rows = np.array(
+            [(entry.images, entry.time, entry.per_slot) for entry in entries],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+    except OverflowError:
+        raise ValueError("schedule entry too large") from None
+    images, times, per_slot = rows[:, 0], rows[:, 1], rows[:, 2]
+    invalid = np.flatnonzero(
+        (images < 0) | (times < 1) | (per_slot < 1) | (per_slot > MAX_PER_SLOT)
+    )
+    if invalid.size:
+        row = int(invalid[0])
+        grid = f" ({int(per_slot[row])} per slot)" if per_slot[row] != 1 else ""
+        raise ValueError(
+            f"entry {row + 1}: {int(images[row])} images of {int(times[row])} s{grid}"
+        )
+    # int64 products and sums wrap silently; estimate in floating point first
+    if (np.maximum(images, 1) * times.astype(np.float64)).sum() >= MAX_TOTAL:
+        raise ValueError("schedule too long")
+    durations = np.where(images > 0, images * times, times)
+    return int((images * per_slot).sum()), int(durations.sum())
+
+
+def preset_entries(preset: dict) -> list[ScheduleEntry]:
+    """
+    Entries of a preset saved in the config's layout ({row: [entry,
+    images, time]}, plus images per slot for grid entries). Raises
+    ValueError if a row isn't numeric.
+    """
+    entries = []
+    for _, row_data in sorted(preset.items(), key=lambda item: int(item[0])):
+        if len(row_data) < 3:
+            raise ValueError(f"incomplete schedule row {row_data!r}")
+        per_slot = int(row_data[3]) if len(row_data) > 3 else 1
+        entries.append(ScheduleEntry(int(row_data[1]), int(row_data[2]), per_slot))
+    return entries
+
+
+class ScheduleModel(QtCore.QAbstractTableModel):
+    """
+    The session schedule as a list of ScheduleEntry, shown as
+    Entry | Number of Images | Duration. Grid entries show their images
+    per slot next to the count.
+
+    Totals are kept up to date as entries are added, edited and removed
+    rather than recounted from the cells, and bulk changes (loading a
+    preset, appending many entries) emit one insert/reset per batch, so
+    a schedule with thousands of rows loads and edits without reparsing
+    the table. *totals_changed* carries (total images, total seconds)
+    after every change.
+    """
+
+    HEADERS = ("Entry", "Number of Images", "Duration")
+    ENTRY, IMAGES, TIME = range(3)
+
+    totals_changed = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: list[ScheduleEntry] = []
+        self.total_images = 0
+        self.total_time = 0
+
+    # ---------------------------------------------------------------------
+    #                          Qt model interface
+    # ---------------------------------------------------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        entry = self._entries[index.row()]
+        column = index.column()
+        if role == Qt.ToolTipRole and column == self.IMAGES and entry.per_slot > 1:
+            return f"{entry.per_slot} images side by side in each of {entry.images} slots"
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        if column == self.ENTRY:
+            value = index.row() + 1
+        elif column == self.IMAGES:
+            value = entry.images
+        else:
+            value = entry.time
+        if role == Qt.DisplayRole and column == self.IMAGES and entry.per_slot > 1:
+            return f"{value} ({entry.per_slot} per slot)"
+        return str(value) if role == Qt.DisplayRole else value
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole:
+            return QtGui.QBrush(QtGui.QColor("black"))
+        if role == Qt.BackgroundRole:
+            return QtGui.QBrush(QtGui.QColor("white"))
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == self.ENTRY:
+            # Entry numbers follow the row and can't be edited
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        """Accept whole numbers only: images ≥ 0, time ≥ 1 second."""
+        if role != Qt.EditRole or not index.isValid() or index.column() == self.ENTRY:
+            return False
+        try:
+            number = int(str(value).strip())
+        except ValueError:
+            return False
+        column = index.column()
+        if number < (0 if column == self.IMAGES else 1):
+            return False
+        entry = self._entries[index.row()]
+        old_images, old_duration = entry.images_shown, entry.duration
+        if column == self.IMAGES:
+            entry.images = number
+        else:
+            entry.time = number
+        self._adjust_totals(
+            entry.images_shown - old_images, entry.duration - old_duration
+        )
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    # ---------------------------------------------------------------------
+    #                             Editing
+    # ---------------------------------------------------------------------
+    def entries(self) -> list[ScheduleEntry]:
+        """Copies of the entries, in order."""
+        return [ScheduleEntry(e.images, e.time, e.per_slot) for e in self._entries]
+
+    def append(self, entries: Iterable[ScheduleEntry]) -> None:
+        """Add *entries* at the end in one insert. Raises ValueError for invalid entries."""
+        entries = [ScheduleEntry(e.images, e.time, e.per_slot) for e in entries]
+        if not entries:
+            return
+        images, seconds = schedule_totals(entries)
+        first = len(self._entries)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(entries) - 1)
+        self._entries.extend(entries)
+        self.endInsertRows()
+        self._adjust_totals(images, seconds)
+
+    def set_entries(self, entries: Iterable[ScheduleEntry]) -> None:
+        """Replace the whole schedule in one reset."""
+        entries = [ScheduleEntry(e.images, e.time, e.per_slot) for e in entries]
+        totals = schedule_totals(entries)
+        self.beginResetModel()
+        self._entries = entries
+        self.endResetModel()
+        self.total_images, self.total_time = totals
+        self.totals_changed.emit(self.total_images, self.total_time)
+
+    def clear(self) -> None:
+        self.set_entries([])
+
+    def remove_rows(self, row: int, count: int = 1) -> bool:
+        """Remove *count* entries starting at *row*; later entries renumber."""
+        if row < 0 or count < 1 or row + count > len(self._entries):
+            return False
+        removed = self._entries[row : row + count]
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row + count - 1)
+        del self._entries[row : row + count]
+        self.endRemoveRows()
+        self._renumber_from(row)
+        self._adjust_totals(
+            -sum(e.images_shown for e in removed), -sum(e.duration for e in removed)
+        )
+        return True
+
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and self.remove_rows(row, count)
+
+    def swap_rows(self, first: int, second: int) -> bool:
+        """
+        Swap the images and time of two entries. Entry numbers stay with
+        their rows, as in the schedule's move up/down buttons.
+        """
+        count = len(self._entries)
+        if not (0 <= first < count and 0 <= second < count) or first == second:
+            return False
+        entries = self._entries
+        entries[first], entries[second] = entries[second], entries[first]
+        for row in (first, second):
+            self.dataChanged.emit(
+                self.index(row, self.IMAGES),
+                self.index(row, self.TIME),
+                [Qt.DisplayRole, Qt.EditRole],
+            )
+        return True
+
+    # ---------------------------------------------------------------------
+    #                             Presets
+    # ---------------------------------------------------------------------
+    def to_preset(self) -> dict:
+        """
+        The schedule in the config's preset layout: {row: [entry, images,
+        time]}, with images per slot added for grid entries only.
+        """
+        preset = {}
+        for row, entry in enumerate(self._entries):
+            preset[row] = [str(row + 1), str(entry.images), str(entry.time)]
+            if entry.per_slot != 1:
+                preset[row].append(str(entry.per_slot))
+        return preset
+
+    def load_preset(self, preset: dict) -> None:
+        """
+        Replace the schedule with a saved preset. Raises ValueError if a
+        row isn't numeric, leaving the current schedule untouched.
+        """
+        self.set_entries(preset_entries(preset))
+
+    # ---------------------------------------------------------------------
+    #                             Internals
+    # ---------------------------------------------------------------------
+    def _renumber_from(self, row):
+        if row < len(self._entries):
+            self.dataChanged.emit(
+                self.index(row, self.ENTRY),
+                self.index(len(self._entries) - 1, self.ENTRY),
+                [Qt.DisplayRole],
+            )
+
+    def _adjust_totals(self, images, seconds):
+        self.total_images += images
+        self.total_time += seconds
+        self.totals_changed.emit(self.total_images, self.total_time)
@@ -0,0 +1,301 @@
+# schedule_plan.py - Expand compact practice plans into schedule entries
+"""
+A plan describes a structured session in one line instead of one table
+row at a time::
+
+    ladder(30s, 10m, 10m)                 20x30s, 10x1m, 5x2m, 2x5m, 1x10m
+    pyramid(10x1m, 5x2m, 2x5m)            10x1m, 5x2m, 2x5m, 5x2m, 10x1m
+    breaks(5m, 3*(ladder(30s, 10m, 10m))) three ladders, a 5 minute break between each
+    grid(2, 5x2m)                         5 slots of 2 minutes, 2 images side by side
+
+Grammar::
+
+    plan   := term ("," term)*
+    term   := [COUNT "*"] factor
+    factor := COUNT "x" DURATION          COUNT images of DURATION each
+            | "break" DURATION            a break
+            | "(" plan ")"                group: one block
+            | "ladder(" DURATION "," DURATION "," DURATION ")"
+            | "pyramid(" plan ")"
+            | "breaks(" DURATION "," plan ")"
+            | "grid(" COUNT "," plan ")"  COUNT (2 to 4) images per slot
+
+Durations are ``1h``, ``2m``, ``30s``, combinations such as ``1m30s``,
+or bare seconds. An entry holds at most MAX_PLAN_COUNT images and lasts
+at most MAX_PLAN_SECONDS.
+
+Plans expand lazily into *blocks* (tuples of ScheduleEntry): a single
+entry, a group, a ladder rung. ``breaks`` puts a break between blocks and
+``N*`` repeats a block, so ``breaks(1m, ladder(...))`` rests between
+rungs while ``breaks(1m, 2*(ladder(...)))`` rests between whole ladders.
+"""
+from __future__ import annotations
+
+import itertools
+import re
+from typing import Callable, Iterable, Iterator
+
+from gesturesesh.schedule import MAX_PER_SLOT, ScheduleEntry, schedule_totals
+
+Block = tuple  # tuple[ScheduleEntry, ...]
+
+# Longest schedule a plan may expand to
+MAX_PLAN_ENTRIES = 10_000
+# Most images one plan entry may ask for, and its longest duration
+MAX_PLAN_COUNT = 10_000
+MAX_PLAN_SECONDS = 24 * 3600
+# Rung lengths a ladder steps through (seconds)
+LADDER_STEPS = (10, 15, 30, 60, 120, 300, 600, 900, 1200, 1800, 3600)
+
+
+class PlanError(ValueError):
+    """A plan that can't be parsed or expands to an invalid schedule."""
+
+
+# ---------------------------------------------------------------------------
+#                               Generators
+# ---------------------------------------------------------------------------
+def ladder(first: int, last: int, per_rung: int) -> Iterator[Block]:
+    """
+    Rungs of increasing pose length from *first* to *last* seconds, each
+    about *per_rung* seconds long: ladder(30, 600, 600) gives 20x30s,
+    10x1m, 5x2m, 2x5m, 1x10m. The ends are always included; the rungs in
+    between come from LADDER_STEPS.
+    """
+    if first <= 0 or last < first or per_rung <= 0:
+        raise PlanError("ladder needs 0 < first <= last and a positive rung length")
+    steps = [first, *(s for s in LADDER_STEPS if first < s < last)]
+    if last != first:
+        steps.append(last)
+    for seconds in steps:
+        yield (ScheduleEntry(max(1, per_rung // seconds), seconds),)
+
+
+def _bounded(blocks: Iterable[Block], what: str) -> list[Block]:
+    """*blocks* as a list, refusing more than MAX_PLAN_ENTRIES entries in all."""
+    result, size = [], 0
+    for block in blocks:
+        size += len(block)
+        if size > MAX_PLAN_ENTRIES:
+            raise PlanError(f"{what} expands to more than {MAX_PLAN_ENTRIES} entries")
+        result.append(block)
+    return result
+
+
+def pyramid(blocks: Iterable[Block]) -> Iterator[Block]:
+    """The blocks, then back down again without repeating the peak."""
+    blocks = _bounded(blocks, "pyramid")
+    yield from blocks
+    yield from reversed(blocks[:-1])
+
+
+def repeat(make_blocks: Callable[[], Iterable[Block]], times: int) -> Iterator[Block]:
+    """Blocks from *make_blocks*, produced afresh *times* times."""
+    for _ in range(times):
+        yield from make_blocks()
+
+
+def interleave_breaks(blocks: Iterable[Block], seconds: int) -> Iterator[Block]:
+    """A break of *seconds* between consecutive blocks."""
+    rest = (ScheduleEntry(0, seconds),)
+    for index, block in enumerate(blocks):
+        if index:
+            yield rest
+        yield block
+
+
+def grid(blocks: Iterable[Block], per_slot: int) -> Iterator[Block]:
+    """*blocks* with *per_slot* images side by side in every image slot."""
+    for block in blocks:
+        yield tuple(
+            ScheduleEntry(entry.images, entry.time, per_slot) if entry.images else entry
+            for entry in block
+        )
+
+
+def group(blocks: Iterable[Block]) -> Iterator[Block]:
+    """Merge *blocks* into a single block."""
+    yield tuple(itertools.chain.from_iterable(_bounded(blocks, "group")))
+
+
+# ---------------------------------------------------------------------------
+#                                 Parser
+# ---------------------------------------------------------------------------
+_TOKEN = re.compile(
+    r"\s*(?:(?P<duration>\d+h(?:\d+m)?(?:\d+s)?|\d+m(?:\d+s)?|\d+s)"
+    r"|(?P<count>\d+)|(?P<name>[a-z]+)|(?P<op>[(),*]))",
+    re.IGNORECASE,
+)
+_DURATION = re.compile(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$", re.IGNORECASE)
+
+
+def parse_duration(text: str) -> int:
+    """Seconds in ``1h``, ``2m``, ``1m30s``, ``45s`` or ``45``."""
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    match = _DURATION.match(text)
+    if not text or not match:
+        raise PlanError(f"invalid duration {text!r}")
+    hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise PlanError(f"unexpected {text[pos:].strip()[:10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append((kind, value.lower() if kind == "name" else value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            want = value or kind or "more input"
+            got = token[1] if token[0] else "end of plan"
+            raise PlanError(f"expected {want}, got {got!r}")
+        self.pos += 1
+        return token[1]
+
+    def duration(self):
+        kind, value = self.peek()
+        if kind not in ("duration", "count"):
+            raise PlanError(f"expected a duration, got {value or 'end of plan'!r}")
+        self.pos += 1
+        seconds = parse_duration(value)
+        if seconds <= 0:
+            raise PlanError("durations must be longer than 0 seconds")
+        if seconds > MAX_PLAN_SECONDS:
+            raise PlanError(f"durations must be at most {MAX_PLAN_SECONDS // 3600}h")
+        return seconds
+
+    def count(self):
+        images = int(self.take("count"))
+        if images > MAX_PLAN_COUNT:
+            raise PlanError(f"an entry shows at most {MAX_PLAN_COUNT} images")
+        return images
+
+    def plan(self):
+        terms = [self.term()]
+        while self.peek() == ("op", ","):
+            self.take()
+            terms.append(self.term())
+        return lambda: itertools.chain.from_iterable(term() for term in terms)
+
+    def term(self):
+        if self.peek()[0] == "count" and self.peek(1) == ("op", "*"):
+            times = int(self.take())
+            self.take()
+            factor = self.factor()
+            return lambda: repeat(factor, times)
+        return self.factor()
+
+    def factor(self):
+        kind, value = self.peek()
+        if kind == "count":
+            images = self.count()
+            self.take("name", "x")
+            seconds = self.duration()
+            return lambda: iter([(ScheduleEntry(images, seconds),)])
+        if kind == "op" and value == "(":
+            self.take()
+            inner = self.plan()
+            self.take("op", ")")
+            return lambda: group(inner())
+        if kind != "name":
+            raise PlanError(f"unexpected {value or 'end of plan'!r}")
+        name = self.take()
+        if name == "break":
+            seconds = self.duration()
+            return lambda: iter([(ScheduleEntry(0, seconds),)])
+        self.take("op", "(")
+        if name == "ladder":
+            first = self.duration()
+            self.take("op", ",")
+            last = self.duration()
+            self.take("op", ",")
+            per_rung = self.duration()
+            result = lambda: ladder(first, last, per_rung)
+        elif name == "pyramid":
+            inner = self.plan()
+            result = lambda: pyramid(inner())
+        elif name == "breaks":
+            seconds = self.duration()
+            self.take("op", ",")
+            inner = self.plan()
+            result = lambda: interleave_breaks(inner(), seconds)
+        elif name == "grid":
+            per_slot = int(self.take("count"))
+            if not 2 <= per_slot <= MAX_PER_SLOT:
+                raise PlanError(f"grid shows 2 to {MAX_PER_SLOT} images per slot")
+            self.take("op", ",")
+            inner = self.plan()
+            result = lambda: grid(inner(), per_slot)
+        else:
+            raise PlanError(f"unknown plan function {name!r}")
+        self.take("op", ")")
+        return result
+
+
+def parse_plan(text: str) -> Callable[[], Iterator[Block]]:
+    """
+    Parse *text* into a function producing its blocks. Nothing is
+    expanded until the function is called.
+    """
+    parser = _Parser(text)
+    if not parser.tokens:
+        raise PlanError("empty plan")
+    make_blocks = parser.plan()
+    if parser.pos != len(parser.tokens):
+        raise PlanError(f"unexpected {parser.peek()[1]!r}")
+    return make_blocks
+
+
+def iter_plan(text: str) -> Iterator[ScheduleEntry]:
+    """The plan's entries, expanded lazily."""
+    return itertools.chain.from_iterable(parse_plan(text)())
+
+
+def expand_plan(text: str, limit: int = MAX_PLAN_ENTRIES) -> list[ScheduleEntry]:
+    """
+    Expand *text* into schedule entries, validated and totalled in one
+    pass. Raises PlanError for bad syntax, invalid entries or plans
+    longer than *limit* entries.
+    """
+    # Pyramids and breaks reuse blocks; every row gets its own entry
+    entries = [
+        ScheduleEntry(entry.images, entry.time, entry.per_slot)
+        for entry in itertools.islice(iter_plan(text), limit + 1)
+    ]
+    if len(entries) > limit:
+        raise PlanError(f"plan expands to more than {limit} entries")
+    try:
+        schedule_totals(entries)
+    except (ValueError, OverflowError) as e:
+        raise PlanError(str(e)) from None
+    return entries
+
+
+def is_plan(text: str) -> bool:
+    """True if *text* parses as a plan."""
+    try:
+        parse_plan(text)
+    except PlanError:
+        return False
+    return True
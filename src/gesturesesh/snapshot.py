@@ -0,0 +1,172 @@
+# snapshot.py - Warm-start snapshot of the setup window
+"""
+The setup window writes its state here when it closes: the selection,
+the schedule as it stood in the table, the preset and randomization
+choices. The next launch maps the file and shows that state straight
+away instead of rescanning every folder first; the folders are then
+rescanned in the background (ReconcileTask) and the selection updated
+if files were added or removed meanwhile. Files the folders held that
+the user dropped from the selection (Remove duplicates, say) are kept
+in the snapshot too, so the rescan doesn't bring them back as new.
+
+Layout: a 32-byte header (magic, format version, length of the JSON
+state, lengths of the two path blocks), the JSON state, then the
+selected file paths and the dropped ones, each as one UTF-8 block
+separated by NULs, so a large selection is one decode and split rather
+than a JSON list to parse.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PyQt5 import QtCore
+
+from gesturesesh.image_loader import mapped_file
+from gesturesesh.scanner import scan_folders
+from gesturesesh.schedule import ScheduleEntry
+from gesturesesh.update_checker import get_config_dir
+
+MAGIC = b"GSSN"
+VERSION = 2
+HEADER = struct.Struct("<4sIQQQ")
+SNAPSHOT_FILE = "snapshot.bin"
+
+
+@dataclass
+class Snapshot:
+    folders: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    schedule: list[ScheduleEntry] = field(default_factory=list)
+    preset_index: int = 0
+    randomized: bool = False
+    # recent_digest() of config.json's recent session when this was written
+    recent: str = ""
+    # Files in the folders that were left out of the selection
+    excluded: list[str] = field(default_factory=list)
+
+
+def snapshot_path() -> Path:
+    return get_config_dir() / SNAPSHOT_FILE
+
+
+def recent_digest(recent: dict) -> str:
+    """
+    Fingerprint of a saved recent session, less its file list. A snapshot
+    whose fingerprint no longer matches config.json is out of date (a
+    session was started after it was written and the app didn't close
+    cleanly).
+    """
+    key = [recent.get("folders", []), recent.get("recent_preset"), recent.get("randomized")]
+    return hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+
+
+def write_snapshot(path: Path, snapshot: Snapshot) -> None:
+    """Writes *snapshot* to *path*, replacing any older one in one step."""
+    state = json.dumps(
+        {
+            "folders": snapshot.folders,
+            "schedule": [
+                [entry.images, entry.time, entry.per_slot] for entry in snapshot.schedule
+            ],
+            "preset_index": snapshot.preset_index,
+            "randomized": snapshot.randomized,
+            "recent": snapshot.recent,
+        }
+    ).encode("utf-8")
+    paths = _join_paths(snapshot.files)
+    excluded = _join_paths(snapshot.excluded)
+    temp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(state), len(paths), len(excluded)))
+            f.write(state)
+            f.write(paths)
+            f.write(excluded)
+        os.replace(temp, path)
+    except OSError as e:
+        print(f"Failed to save snapshot at {path}: {e}")
+
+
+def read_snapshot(path: Path) -> Snapshot | None:
+    """The snapshot at *path*, or None if there's none or it can't be used."""
+    try:
+        with mapped_file(str(path)) as data:
+            if len(data) < HEADER.size:
+                return None
+            magic, version, state_size, paths_size, excluded_size = HEADER.unpack_from(data)
+            paths_start = HEADER.size + state_size
+            excluded_start = paths_start + paths_size
+            end = excluded_start + excluded_size
+            if magic != MAGIC or version != VERSION or len(data) != end:
+                return None
+            state = json.loads(bytes(data[HEADER.size:paths_start]))
+            files = _split_paths(data[paths_start:excluded_start])
+            excluded = _split_paths(data[excluded_start:end])
+        return Snapshot(
+            folders=list(state["folders"]),
+            files=files,
+            schedule=[ScheduleEntry(*map(int, row)) for row in state["schedule"]],
+            preset_index=int(state["preset_index"]),
+            randomized=bool(state["randomized"]),
+            recent=str(state["recent"]),
+            excluded=excluded,
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _join_paths(paths: list[str]) -> bytes:
+    return "\0".join(paths).encode("utf-8", "surrogateescape")
+
+
+def _split_paths(block) -> list[str]:
+    return block.decode("utf-8", "surrogateescape").split("\0") if block else []
+
+
+def reconcile(
+    snapshot_files: list[str], excluded: list[str], folders: list[str], extensions
+) -> tuple[list[str], list[str]]:
+    """
+    The selection *snapshot_files* stands for, as the disk is now, and
+    what the folders hold now. The selection keeps its files that still
+    exist, followed by files the folders gained since; a file that was
+    already there (in the selection or *excluded*) is not added again.
+    """
+    scanned = scan_folders(folders, extensions).files
+    found = set(scanned)
+    known = set(snapshot_files).union(excluded)
+    kept = [path for path in snapshot_files if path in found or os.path.isfile(path)]
+    return kept + [path for path in scanned if path not in known], scanned
+
+
+class ReconcileSignals(QtCore.QObject):
+    # the snapshot's file list, the selection as the disk has it now and
+    # what the folders hold now
+    finished = QtCore.pyqtSignal(object, object, object)
+
+
+class ReconcileTask(QtCore.QRunnable):
+    """reconcile() on a pool thread, once the restored window is showing."""
+
+    def __init__(self, files, excluded, folders, extensions, signals: ReconcileSignals):
+        super().__init__()
+        self.files = files
+        self.excluded = excluded
+        self.folders = list(folders)
+        self.extensions = set(extensions)
+        self.signals = signals
+
+    def run(self):
+        files, scanned = reconcile(
+            self.files, self.excluded, self.folders, self.extensions
+        )
+        try:
+            self.signals.finished.emit(self.files, files, scanned)
+        except RuntimeError:
+            pass  # main window was deleted while scanning
@@ -0,0 +1,163 @@
+# timeline.py - Session time bookkeeping per playlist slot
+from __future__ import annotations
+
+import bisect
+import itertools
+from typing import Iterable, Sequence
+
+from gesturesesh.schedule import ScheduleEntry
+
+
+def format_duration(seconds: float) -> str:
+    """``H:MM:SS`` for an hour or more, else ``M:SS``."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class FenwickTree:
+    """Prefix sums over a list of numbers with O(log n) point updates."""
+
+    def __init__(self, values: Iterable[float] = ()):
+        values = list(values)
+        self._size = len(values)
+        self._tree = [0.0] + values
+        # O(n) build: push each node's sum up to its parent once
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, index: int, delta: float) -> None:
+        """values[index] += delta."""
+        i = index + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, count: int) -> float:
+        """Sum of the first *count* values."""
+        total = 0.0
+        i = min(count, self._size)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, target: float) -> int:
+        """
+        Number of leading values whose sum is ≤ *target*, i.e. the index
+        of the value *target* falls in (values must be non-negative).
+        """
+        position, remaining = 0, target
+        step = 1 << self._size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self._size and self._tree[nxt] <= remaining:
+                position = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return position
+
+
+class SessionTimeline:
+    """
+    Start offsets of every playlist slot of a session: one slot per image
+    of each entry and one per break, in playlist order.
+
+    Built once when the session starts. A cursor on the slot being shown
+    caches where it ends and where the next break starts, so the
+    questions asked on every timer tick ("time left in the session",
+    "time until the next break") are O(1). When the current slot is
+    lengthened (extra time, restarting or skipping an image) extend()
+    updates the durations in O(log n), so start offsets and
+    position_at() stay correct.
+    """
+
+    def __init__(self, schedule: Sequence[ScheduleEntry]):
+        durations, breaks = [], []
+        for entry in schedule:
+            if entry.images == 0:
+                breaks.append(len(durations))
+                durations.append(entry.time)
+            else:
+                durations.extend(itertools.repeat(entry.time, entry.images))
+        self._durations = durations
+        self._sums = FenwickTree(durations)
+        self._breaks = breaks  # slot indices, ascending
+        self.total = float(sum(durations))
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    # ---------------------------------------------------------------------
+    #                             Queries
+    # ---------------------------------------------------------------------
+    def duration(self, position: int) -> float:
+        return self._durations[position]
+
+    def start(self, position: int) -> float:
+        """Seconds into the session at which *position* starts (O(log n))."""
+        return self._sums.prefix(position)
+
+    def is_break(self, position: int) -> bool:
+        index = bisect.bisect_left(self._breaks, position)
+        return index < len(self._breaks) and self._breaks[index] == position
+
+    def position_at(self, seconds: float) -> int:
+        """The slot playing *seconds* into the session (O(log n))."""
+        if seconds < 0:
+            return 0
+        return min(self._sums.search(seconds), len(self._durations) - 1)
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def elapsed(self, left: float) -> float:
+        """Session time used, with *left* seconds to go in the current slot."""
+        return max(0.0, self._cursor_end - left)
+
+    def remaining(self, left: float) -> float:
+        """Session time left, with *left* seconds to go in the current slot."""
+        return max(0.0, self.total - self._cursor_end + left)
+
+    def until_next_break(self, left: float) -> float | None:
+        """Time until the next break after the current slot, or None."""
+        if self._next_break is None:
+            return None
+        return max(0.0, self._next_break_start - self._cursor_end + left)
+
+    # ---------------------------------------------------------------------
+    #                             Updates
+    # ---------------------------------------------------------------------
+    def seek(self, position: int) -> None:
+        """Move the cursor to *position* (clamped to the playlist)."""
+        position = max(0, min(position, len(self._durations) - 1))
+        self._position = position
+        self._cursor_end = self._sums.prefix(position + 1)
+        index = bisect.bisect_right(self._breaks, position)
+        if index < len(self._breaks):
+            self._next_break = self._breaks[index]
+            self._next_break_start = self._sums.prefix(self._next_break)
+        else:
+            self._next_break = None
+            self._next_break_start = 0.0
+
+    def extend(self, position: int, seconds: float) -> None:
+        """Lengthen slot *position* by *seconds* (negative to shorten)."""
+        if not 0 <= position < len(self._durations) or not seconds:
+            return
+        self._durations[position] += seconds
+        self._sums.add(position, seconds)
+        self.total += seconds
+        if position <= self._position:
+            self._cursor_end += seconds
+        if self._next_break is not None and position < self._next_break:
+            self._next_break_start += seconds
@@ -0,0 +1,198 @@
+# tracing.py - Opt-in timing spans for the session hot path
+"""
+Run with ``GESTURESESH_TRACE=trace.json`` in the environment, or with
+``--trace [trace.json]`` on the command line, to record how long each
+image transition spends decoding, applying modifiers, converting,
+scaling and playing sound cues. The trace is written in Chrome
+trace-event JSON when a session closes and when the app exits; open it
+in https://ui.perfetto.dev or chrome://tracing.
+
+Whether tracing is on is decided when this module is imported. When it
+is off, traced() hands back the function it decorates and span()
+returns a shared no-op context manager, so instrumented code runs as it
+would without instrumentation.
+"""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = "GESTURESESH_TRACE"
+# Written to the working directory when no file is named
+DEFAULT_TRACE_FILE = "gesturesesh-trace.json"
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """Collects complete ("X") and instant ("i") trace events in memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events: list[dict] = []
+        self.pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+        self._threads: dict[int, str] = {}
+
+    def _thread(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def now(self) -> int:
+        return time.perf_counter_ns()
+
+    def complete(self, name, start_ns, end_ns, cat="gesturesesh", args=None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": self._thread(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def instant(self, name, cat="gesturesesh", args=None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": (self.now() - self._origin) / 1000,
+            "pid": self.pid,
+            "tid": self._thread(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def to_json(self) -> dict:
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+             "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        return {"traceEvents": names + list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, self.tracer.now(), self.cat, self.args)
+        return False
+
+
+_tracer: Tracer | None = None
+
+
+def enable(path: str = DEFAULT_TRACE_FILE) -> Tracer:
+    """
+    Start recording to *path*. Only functions decorated after this call
+    are traced; span() and instant() work right away.
+    """
+    global _tracer
+    if _tracer is None:
+        atexit.register(write)
+    _tracer = Tracer(path)
+    return _tracer
+
+
+def disable() -> None:
+    global _tracer
+    _tracer = None
+
+
+def tracer() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, cat: str = "gesturesesh", **args):
+    """Context manager timing its block as one event."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, cat, args or None)
+
+
+def instant(name: str, cat: str = "gesturesesh", **args) -> None:
+    """A point-in-time marker, e.g. the start of a new image."""
+    if _tracer is not None:
+        _tracer.instant(name, cat, args or None)
+
+
+def traced(name: str | None = None, cat: str = "gesturesesh"):
+    """
+    Decorator timing every call of the function (named by its qualified
+    name unless *name* is given). A no-op when tracing is off.
+    """
+
+    def decorate(func):
+        if _tracer is None:
+            return func
+        event = name or func.__qualname__
+        active = _tracer
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = active.now()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                active.complete(event, start, active.now(), cat)
+
+        return wrapper
+
+    return decorate
+
+
+def write() -> None:
+    """Write the trace recorded so far (the whole file is rewritten)."""
+    if _tracer is not None:
+        try:
+            _tracer.write()
+        except OSError as e:
+            print(f"Could not write trace to {_tracer.path}: {e}")
+
+
+def _requested_path(argv, environ) -> str | None:
+    """Trace file asked for with --trace [FILE], --trace=FILE or the env var."""
+    for index, arg in enumerate(argv):
+        if arg.startswith("--trace="):
+            return arg.split("=", 1)[1] or DEFAULT_TRACE_FILE
+        if arg == "--trace":
+            following = argv[index + 1] if index + 1 < len(argv) else ""
+            return following if following and not following.startswith("-") else DEFAULT_TRACE_FILE
+    value = environ.get(ENV_VAR, "")
+    if value.lower() in ("", "0", "false", "no"):
+        return None
+    return DEFAULT_TRACE_FILE if value.lower() in ("1", "true", "yes") else value
+
+
+_path = _requested_path(sys.argv[1:], os.environ)
+if _path is not None:
+    enable(_path)
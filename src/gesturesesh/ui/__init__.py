@@ -2,4 +2,4 @@
 UI components for GestureSesh application.
 """
 
-__all__ = ["main_window", "session_display", "dot_indicator"]
+__all__ = ["main_window", "session_display", "dot_indicator", "perf_hud", "mirror_view"]
@@ -0,0 +1,199 @@
+# animation_clock.py - One shared ticker for every UI animation
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+from PyQt5 import QtCore
+
+
+@dataclass(eq=False)
+class _Animation:
+    start: float
+    duration: float  # ms per loop
+    loops: float  # math.inf to run until stopped
+    on_step: Callable[[float], None]
+    on_finished: Callable[[], None] | None = None
+    step_ms: float = 0  # least time between steps
+    next_step: float = 0  # earliest time of the next step
+
+
+@dataclass(order=True)
+class _Deadline:
+    due: float
+    seq: int
+    key: Hashable = field(compare=False)
+    callback: Callable[[], None] = field(compare=False)
+
+
+class AnimationClock(QtCore.QObject):
+    """
+    Drives all running animations from a single frame timer.
+
+    Each frame every animation gets its progress (0-1 within the current
+    loop), then every repaint requested during that frame runs once, so a
+    burst of animations costs one render per frame rather than one per
+    timer. Animations started with a step_ms longer than a frame (idle
+    pulses) step no more often than that, and while only such animations
+    run the timer ticks at their pace instead of every frame. The frame
+    timer stops as soon as nothing is animating.
+    Delayed one-off callbacks (message lifetimes) share a second
+    single-shot timer armed for the earliest deadline.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, parent=None, now: Callable[[], float] = time.monotonic):
+        super().__init__(parent)
+        self._now = lambda: now() * 1000.0
+        self._animations: dict[Hashable, _Animation] = {}
+        self._repaints: dict[Callable[[], None], None] = {}  # ordered set
+
+        self._frame_timer = QtCore.QTimer(self)
+        self._frame_timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._frame_timer.setInterval(self.FRAME_MS)
+        self._frame_timer.timeout.connect(self.tick)
+
+        self._deadlines: list[_Deadline] = []
+        self._pending: dict[Hashable, _Deadline] = {}
+        self._seq = itertools.count()
+        self._deadline_timer = QtCore.QTimer(self)
+        self._deadline_timer.setSingleShot(True)
+        self._deadline_timer.timeout.connect(self._run_deadlines)
+
+    # ---------------------------------------------------------------------
+    #                           Animations
+    # ---------------------------------------------------------------------
+    def start(
+        self,
+        key: Hashable,
+        duration_ms: float,
+        on_step: Callable[[float], None],
+        on_finished: Callable[[], None] | None = None,
+        loops: float = 1,
+        step_ms: float = 0,
+    ) -> None:
+        """
+        Animate *key* for *loops* loops of *duration_ms*, replacing any
+        animation already running under that key. *on_step* receives the
+        progress through the current loop, at most once every *step_ms*;
+        the final call gets 1.0.
+        """
+        now = self._now()
+        self._animations[key] = _Animation(
+            now, max(1.0, duration_ms), loops, on_step, on_finished, step_ms, now
+        )
+        self._wake()
+
+    def stop(self, key: Hashable) -> None:
+        """Stop *key* without calling its finished callback."""
+        self._animations.pop(key, None)
+
+    def is_running(self, key: Hashable) -> bool:
+        return key in self._animations
+
+    def is_active(self) -> bool:
+        """True while the frame timer is ticking."""
+        return self._frame_timer.isActive()
+
+    def request_repaint(self, callback: Callable[[], None]) -> None:
+        """Run *callback* once at the end of the current (or next) frame."""
+        self._repaints[callback] = None
+        self._wake()
+
+    def _interval(self) -> int:
+        """Frame timer interval: the pace of the most frequent animation."""
+        if self._repaints:
+            return self.FRAME_MS
+        steps = [anim.step_ms for anim in self._animations.values()]
+        return max(self.FRAME_MS, round(min(steps, default=self.FRAME_MS)))
+
+    def _wake(self):
+        interval = self._interval()
+        if self._frame_timer.interval() != interval:
+            self._frame_timer.setInterval(interval)
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def tick(self) -> None:
+        now = self._now()
+        finished = []
+        for key, anim in list(self._animations.items()):
+            if self._animations.get(key) is not anim:
+                continue  # stopped or replaced by an earlier callback
+            elapsed = now - anim.start
+            try:
+                if elapsed >= anim.duration * anim.loops:
+                    anim.on_step(1.0)
+                    finished.append((key, anim))
+                elif now >= anim.next_step - 1:  # 1 ms of timer jitter
+                    anim.next_step = max(anim.next_step + anim.step_ms, now)
+                    anim.on_step((elapsed % anim.duration) / anim.duration)
+            except RuntimeError:
+                # Owner widget was deleted mid-animation
+                self._animations.pop(key, None)
+        for key, anim in finished:
+            if self._animations.get(key) is anim:
+                del self._animations[key]
+                if anim.on_finished is not None:
+                    anim.on_finished()
+        repaints, self._repaints = self._repaints, {}
+        for callback in repaints:
+            try:
+                callback()
+            except RuntimeError:
+                pass
+        if not self._animations and not self._repaints:
+            self._frame_timer.stop()
+        else:
+            self._wake()
+
+    # ---------------------------------------------------------------------
+    #                        Delayed callbacks
+    # ---------------------------------------------------------------------
+    def call_later(
+        self, key: Hashable, delay_ms: float, callback: Callable[[], None]
+    ) -> None:
+        """Run *callback* after *delay_ms*, replacing any pending call for *key*."""
+        self.cancel(key)
+        deadline = _Deadline(self._now() + delay_ms, next(self._seq), key, callback)
+        self._pending[key] = deadline
+        heapq.heappush(self._deadlines, deadline)
+        self._arm_deadline_timer()
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop the pending delayed call for *key*, if any."""
+        self._pending.pop(key, None)
+
+    def _arm_deadline_timer(self):
+        while self._deadlines and self._pending.get(self._deadlines[0].key) is not self._deadlines[0]:
+            heapq.heappop(self._deadlines)  # cancelled or replaced
+        if not self._deadlines:
+            self._deadline_timer.stop()
+            return
+        wait = max(0, math.ceil(self._deadlines[0].due - self._now()))
+        self._deadline_timer.start(wait)
+
+    def _run_deadlines(self):
+        now = self._now()
+        while self._deadlines and self._deadlines[0].due <= now:
+            deadline = heapq.heappop(self._deadlines)
+            if self._pending.get(deadline.key) is deadline:
+                del self._pending[deadline.key]
+                deadline.callback()
+        self._arm_deadline_timer()
+
+
+_clock = None
+
+
+def animation_clock() -> AnimationClock:
+    """The application-wide clock."""
+    global _clock
+    if _clock is None:
+        _clock = AnimationClock()
+    return _clock
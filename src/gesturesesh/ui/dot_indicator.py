@@ -7,6 +7,8 @@ from typing import Iterable
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from gesturesesh.ui.animation_clock import animation_clock
+
 @dataclass
 class DotPalette:
     """H S L [A] values for every visual state in one place (ease of theming)."""
@@ -58,6 +60,7 @@ class DotIndicator(QtWidgets.QWidget):
         setValue(value: int): Set the current progress value (1-based index).
         setBreaks(break_indices): Mark specific indices as "break" dots.
         applyBreakVector(counts: list[int]): Mark indices with non-positive counts as breaks.
+        isPulsing() -> bool: True while the glow animation is running.
     Signals:
         (None defined; widget is intended for visual display only.)
     Usage:
@@ -124,17 +127,20 @@ class DotIndicator(QtWidgets.QWidget):
 
         # 4.  Pulse machinery ----------------------------------------------
         self._flash_strength = 0.0
-        self._pulse_dir = 1
-        self._pulses_left = 0
-        self._pulse_timer = QtCore.QTimer(self, interval=50)
-        self._pulse_timer.timeout.connect(self._on_pulse_tick)
+        self._clock = animation_clock()
+        self.destroyed.connect(lambda: self._clock.stop(self))
 
         # 5.  Progress state -----------------------------------------------
         self._max_value = 1  # total images (0 → row break)
         self._value = 1  # current (1-based)
         self._break_indices: set[int] = set()
 
-        # 6.  Layout metrics & fixed height --------------------------------
+        # 6.  Cached render layers (see Painting) ---------------------------
+        self._static_layer: QtGui.QPixmap | None = None
+        self._glow_layer: QtGui.QPixmap | None = None
+        self._glow_rect = QtCore.QRect()
+
+        # 7.  Layout metrics & fixed height --------------------------------
         stroke_max = self._chev_core_w * max(self._glow_layers)
         self._glow_pad = math.ceil(2 + stroke_max / 2)
 
@@ -154,21 +160,17 @@ class DotIndicator(QtWidgets.QWidget):
         self._max_value = max(0, maximum)
         if self._is_row_break():
             self._value = 1
-            self._pulse_timer.stop()
-            self._flash_strength = 0.0
+            self._stop_pulse()
         self.updateGeometry()
-        self.update()
+        self._invalidate()
 
     def setValue(self, value: int):
         """1-based current index inside this row."""
         self._value = max(1, value)
         if self._is_row_break():
             self._value = 1
-            self._flash_strength = 0.0
-            self._pulse_dir = 1
-            self._pulses_left = float("inf")
-            if not self._pulse_timer.isActive():
-                self._pulse_timer.start()
+            self._start_pulse(math.inf)
+            self._invalidate()
             return
 
         dots_count, has_chevron, _ = self._layout_counts()
@@ -183,23 +185,13 @@ class DotIndicator(QtWidgets.QWidget):
         is_current_break = offset in local_breaks
 
         if sets_remaining > 0 and not is_current_break:
-            self._flash_strength = 0.0
-            self._pulse_dir = 1
-            self._pulses_left = sets_remaining
-            if not self._pulse_timer.isActive():
-                self._pulse_timer.start()
+            self._start_pulse(sets_remaining)
         elif is_current_break:
-            self._flash_strength = 0.0
-            self._pulse_dir = 1
-            self._pulses_left = float("inf")
-            if not self._pulse_timer.isActive():
-                self._pulse_timer.start()
+            self._start_pulse(math.inf)
         else:
-            if self._pulse_timer.isActive():
-                self._pulse_timer.stop()
-            self._flash_strength = 0.0
+            self._stop_pulse()
 
-        self.update()
+        self._invalidate()
 
     def maximum(self) -> int:
         """Return the maximum value (number of dots/steps), matching QProgressBar interface."""
@@ -208,13 +200,12 @@ class DotIndicator(QtWidgets.QWidget):
     def setBreaks(self, break_indices):
         """Mark 0-based indices that are always drawn as break dots."""
         self._break_indices = set(break_indices)
-        self.update()
+        self._invalidate()
 
     def applyBreakVector(self, counts: list[int]):
         """Flag every index whose count ≤ 0 as a break."""
         self._break_indices = {i for i, c in enumerate(counts) if c <= 0}
         self.setMaximum(len(counts))
-        self.update()
 
     # ---------------------------------------------------------------------
     #                           Internals
@@ -264,28 +255,127 @@ class DotIndicator(QtWidgets.QWidget):
     # ---------------------------------------------------------------------
     #                       Pulse animation
     # ---------------------------------------------------------------------
-    def _on_pulse_tick(self):
-        self._flash_strength += self._pulse_dir * 0.1
-        if self._flash_strength >= 1.0:
-            self._flash_strength, self._pulse_dir = 1.0, -1
-        elif self._flash_strength <= 0.0:
-            self._flash_strength, self._pulse_dir = 0.0, 1
-            if self._pulses_left != float("inf"):
-                self._pulses_left -= 1
-                if self._pulses_left <= 0:
-                    self._pulse_timer.stop()
-        self.update()
+    # One pulse fades the glow in and out over PULSE_MS; every widget
+    # shares the application's AnimationClock instead of owning a timer.
+    # The glow steps every PULSE_STEP_MS (20 Hz): a break can pulse for
+    # minutes, and a slow fade needs no more.
+    PULSE_MS = 1000
+    PULSE_STEP_MS = 50
+
+    def isPulsing(self) -> bool:
+        return self._clock.is_running(self)
+
+    def _start_pulse(self, pulses: float):
+        self._flash_strength = 0.0
+        self._clock.start(
+            self,
+            self.PULSE_MS,
+            self._on_pulse_step,
+            self._stop_pulse,
+            loops=pulses,
+            step_ms=self.PULSE_STEP_MS,
+        )
+
+    def _stop_pulse(self):
+        self._clock.stop(self)
+        self._flash_strength = 0.0
+        self._repaint_glow()
+
+    def _on_pulse_step(self, progress: float):
+        self._flash_strength = 1.0 - abs(2.0 * progress - 1.0)
+        self._clock.request_repaint(self._repaint_glow)
+
+    def _repaint_glow(self):
+        if not self._layers_fit() or self._glow_rect.isEmpty():
+            self.update()
+        else:
+            self.update(self._glow_rect)
 
     # ---------------------------------------------------------------------
     #                           Painting
     # ---------------------------------------------------------------------
-    def paintEvent(self, _: QtGui.QPaintEvent):  # noqa: C901  (long but clear)
-        dots_count, has_chevron, set_start = self._layout_counts()
-        if dots_count + (1 if has_chevron else 0) == 0:
-            return
+    # The row is rendered into two cached layers: the static dots and the
+    # glow at full strength. A pulse tick only repaints the glow's
+    # bounding rect, compositing the glow layer at the current strength.
+    def _invalidate(self):
+        self._static_layer = None
+        self._glow_layer = None
+        self._glow_rect = QtCore.QRect()
+        self.update()
 
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        if not self._layers_fit():
+            self._invalidate()
+        super().resizeEvent(event)
+
+    def _layers_fit(self) -> bool:
+        if self._static_layer is None:
+            return False
+        ratio = self._static_layer.devicePixelRatio()
+        return self._static_layer.size() / ratio == self.size()
+
+    def _new_layer(self) -> QtGui.QPixmap:
+        ratio = self.devicePixelRatioF()
+        layer = QtGui.QPixmap(self.size() * ratio)
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(QtCore.Qt.transparent)
+        return layer
+
+    def _render_layers(self):
+        self._static_layer = self._new_layer()
+        self._glow_layer = self._new_layer()
+        static = QtGui.QPainter(self._static_layer)
+        glow = QtGui.QPainter(self._glow_layer)
+        for painter in (static, glow):
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        glow_rect = self._draw_row(static, glow)
+        static.end()
+        glow.end()
+        self._glow_rect = glow_rect.toAlignedRect() if glow_rect else QtCore.QRect()
+
+    def paintEvent(self, _: QtGui.QPaintEvent):
+        if not self._layers_fit():
+            self._render_layers()
         painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self._static_layer)
+        if self._flash_strength > 0.0 and not self._glow_rect.isEmpty():
+            painter.setOpacity(self._flash_strength)
+            painter.drawPixmap(0, 0, self._glow_layer)
+
+    def _glow_alpha(self, factor: float) -> int:
+        return int((0.4 / factor + 0.1) * 255)
+
+    def _draw_dot_glow(self, painter, rect: QtCore.QRectF, core) -> QtCore.QRectF:
+        """Break-dot halo at full strength, with the dot redrawn on top."""
+        bounds = QtCore.QRectF(rect)
+        painter.setPen(QtCore.Qt.NoPen)
+        for factor in self._glow_layers:
+            glow_d = self._DOT_D + factor * 4
+            glow_rect = QtCore.QRectF(
+                rect.center().x() - glow_d / 2,
+                rect.center().y() - glow_d / 2,
+                glow_d,
+                glow_d,
+            )
+            glow_col = QtGui.QColor(self._break_color)
+            glow_col.setAlpha(self._glow_alpha(factor))
+            painter.setBrush(glow_col)
+            painter.drawEllipse(glow_rect)
+            bounds = bounds.united(glow_rect)
+        # The static layer has the same dot underneath, so fading this
+        # layer in and out leaves the dot itself unchanged
+        painter.setBrush(core)
+        painter.drawEllipse(rect)
+        return bounds.adjusted(-1, -1, 1, 1)
+
+    def _draw_row(self, painter, glow) -> QtCore.QRectF | None:  # noqa: C901
+        """
+        Draw the static row with *painter* and the pulse glow with *glow*.
+        Returns the area the glow covers, or None if nothing pulses.
+        """
+        dots_count, has_chevron, set_start = self._layout_counts()
+        if dots_count + (1 if has_chevron else 0) == 0:
+            return None
 
         # ───── Row-break (single orange dot) ──────────────────────────────
         if self._is_row_break():
@@ -299,27 +389,14 @@ class DotIndicator(QtWidgets.QWidget):
             )
             x = self._glow_pad + (self.width() - self._glow_pad * 2 - self._DOT_D) / 2
             color = self._break_color if self._value == 1 else self._break_passed_color
-
-            if self._value == 1 and self._flash_strength > 0.0:
-                for factor in self._glow_layers:
-                    glow_d = self._DOT_D + factor * 4
-                    glow_rect = QtCore.QRectF(
-                        x + (self._DOT_D - glow_d) / 2,
-                        y0 + (self._DOT_D - glow_d) / 2,
-                        glow_d,
-                        glow_d,
-                    )
-                    glow_col = QtGui.QColor(self._break_color)
-                    alpha = self._flash_strength * (0.4 / factor + 0.1)
-                    glow_col.setAlpha(int(alpha * 255))
-                    painter.setPen(QtCore.Qt.NoPen)
-                    painter.setBrush(glow_col)
-                    painter.drawEllipse(glow_rect)
+            rect = QtCore.QRectF(x, y0, self._DOT_D, self._DOT_D)
 
             painter.setPen(QtCore.Qt.NoPen)
             painter.setBrush(color)
-            painter.drawEllipse(QtCore.QRectF(x, y0, self._DOT_D, self._DOT_D))
-            return
+            painter.drawEllipse(rect)
+            if self._value == 1:
+                return self._draw_dot_glow(glow, rect, color)
+            return None
 
         # ───── Normal row (dots + optional chevron) ───────────────────────
         row_h = int(self._DOT_D * (self._chev_scale_h if has_chevron else 1.0))
@@ -344,6 +421,7 @@ class DotIndicator(QtWidgets.QWidget):
             for i in self._break_indices
             if set_start <= i < set_start + dots_count
         }
+        glow_bounds = None
 
         # Draw dots --------------------------------------------------------
         for i in range(dots_count):
@@ -360,26 +438,13 @@ class DotIndicator(QtWidgets.QWidget):
             else:
                 base = self._empty_color
 
-            if i in local_breaks and i == current_dot and self._flash_strength > 0.0:
-                for factor in self._glow_layers:
-                    glow_d = self._DOT_D + factor * 4
-                    glow_rect = QtCore.QRectF(
-                        rect.center().x() - glow_d / 2,
-                        rect.center().y() - glow_d / 2,
-                        glow_d,
-                        glow_d,
-                    )
-                    glow_col = QtGui.QColor(self._break_color)
-                    alpha = self._flash_strength * (0.4 / factor + 0.1)
-                    glow_col.setAlpha(int(alpha * 255))
-                    painter.setPen(QtCore.Qt.NoPen)
-                    painter.setBrush(glow_col)
-                    painter.drawEllipse(glow_rect)
-
             painter.setPen(QtCore.Qt.NoPen)
             painter.setBrush(base)
             painter.drawEllipse(rect)
 
+            if i in local_breaks and i == current_dot:
+                glow_bounds = self._draw_dot_glow(glow, rect, base)
+
             if i == dots_count - 1 and not has_chevron:
                 glow_d = self._DOT_D + 4
                 glow_rect = QtCore.QRectF(
@@ -416,17 +481,21 @@ class DotIndicator(QtWidgets.QWidget):
             )
             painter.drawPath(path)
 
-            if self._flash_strength > 0.0:
-                for factor in self._glow_layers:
-                    pen = QtGui.QPen(
-                        self._chevron_color,
-                        self._chev_core_w * factor,
-                        QtCore.Qt.SolidLine,
-                        QtCore.Qt.RoundCap,
-                    )
-                    alpha = self._flash_strength * (0.4 / factor + 0.1)
-                    glow_color = QtGui.QColor(self._chevron_color)
-                    glow_color.setAlpha(int(alpha * 255))
-                    pen.setColor(glow_color)
-                    painter.setPen(pen)
-                    painter.drawPath(path)
+            for factor in self._glow_layers:
+                pen = QtGui.QPen(
+                    self._chevron_color,
+                    self._chev_core_w * factor,
+                    QtCore.Qt.SolidLine,
+                    QtCore.Qt.RoundCap,
+                )
+                glow_color = QtGui.QColor(self._chevron_color)
+                glow_color.setAlpha(self._glow_alpha(factor))
+                pen.setColor(glow_color)
+                glow.setPen(pen)
+                glow.drawPath(path)
+            stroke = self._chev_core_w * max(self._glow_layers) / 2 + 1
+            chevron_bounds = path.boundingRect().adjusted(-stroke, -stroke, stroke, stroke)
+            glow_bounds = (
+                chevron_bounds if glow_bounds is None else glow_bounds.united(chevron_bounds)
+            )
+        return glow_bounds
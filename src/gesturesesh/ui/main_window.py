@@ -860,7 +860,7 @@ class Ui_MainWindow(object):
         self.verticalLayout_2 = QtWidgets.QVBoxLayout()
         self.verticalLayout_2.setSpacing(0)
         self.verticalLayout_2.setObjectName("verticalLayout_2")
-        self.entry_table = QtWidgets.QTableWidget(self.centralwidget)
+        self.entry_table = QtWidgets.QTableView(self.centralwidget)
         self.entry_table.setMinimumSize(QtCore.QSize(0, 180))
         palette = QtGui.QPalette()
         brush = QtGui.QBrush(QtGui.QColor(255, 255, 255))
@@ -990,31 +990,8 @@ class Ui_MainWindow(object):
         self.entry_table.setShowGrid(False)
         self.entry_table.setGridStyle(QtCore.Qt.SolidLine)
         self.entry_table.setCornerButtonEnabled(True)
-        self.entry_table.setRowCount(0)
-        self.entry_table.setColumnCount(3)
         self.entry_table.setObjectName("entry_table")
-        item = QtWidgets.QTableWidgetItem()
-        item.setTextAlignment(QtCore.Qt.AlignCenter)
-        font = QtGui.QFont()
-        brush = QtGui.QBrush(QtGui.QColor("black"))
-
-        # Try to set the preferred font, fallback if not available
-        font.setFamily(
-            "Apple SD Gothic Neo"
-            if sys.platform == "darwin"
-            else "Nanum Gothic" if sys.platform.startswith("win") else "Noto Sans CJK"
-        )
-        font.setPointSize(10)
-        font.setBold(True)
-        font.setWeight(85)
-        item.setFont(font)
-        brush = QtGui.QBrush(QtGui.QColor("black"))
-        brush.setStyle(QtCore.Qt.SolidPattern)
-        item.setForeground(brush)
-        item.setBackground(QtGui.QColor("white"))
-        self.entry_table.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        item.setTextAlignment(QtCore.Qt.AlignCenter)
+        # Header labels come from the schedule model; only the font is set here
         font = QtGui.QFont()
         font.setFamily(
             "Apple SD Gothic Neo"
@@ -1024,29 +1001,7 @@ class Ui_MainWindow(object):
         font.setPointSize(10)
         font.setBold(True)
         font.setWeight(85)
-        item.setFont(font)
-        brush = QtGui.QBrush(QtGui.QColor("black"))
-        brush.setStyle(QtCore.Qt.SolidPattern)
-        item.setForeground(brush)
-        item.setBackground(QtGui.QColor("white"))
-        self.entry_table.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        item.setTextAlignment(QtCore.Qt.AlignCenter)
-        font = QtGui.QFont()
-        font.setFamily(
-            "Apple SD Gothic Neo"
-            if sys.platform == "darwin"
-            else "Nanum Gothic" if sys.platform.startswith("win") else "Noto Sans CJK"
-        )
-        font.setPointSize(10)
-        font.setBold(True)
-        font.setWeight(85)
-        item.setFont(font)
-        brush = QtGui.QBrush(QtGui.QColor("black"))
-        brush.setStyle(QtCore.Qt.SolidPattern)
-        item.setForeground(brush)
-        item.setBackground(QtGui.QColor("white"))
-        self.entry_table.setHorizontalHeaderItem(2, item)
+        self.entry_table.horizontalHeader().setFont(font)
         self.entry_table.horizontalHeader().setVisible(True)
         self.entry_table.horizontalHeader().setCascadingSectionResizes(True)
         self.entry_table.horizontalHeader().setDefaultSectionSize(160)
@@ -1464,7 +1419,7 @@ class Ui_MainWindow(object):
                 '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN"'
                 ' "http://www.w3.org/TR/REC-html40/strict.dtd">\n<html><head><meta'
                 ' name="qrichtext" content="1" /><style type="text/css">\np, li {'
-                " white-space: pre-wrap; } \nQTableWidget::item{"
+                " white-space: pre-wrap; } \nQTableView::item{"
                 ' selection-background-color: black;}\n</style></head><body style="'
                 " font-family:'Nanum Gothic'; font-size:8pt; font-weight:400;"
                 ' font-style:normal;">\n<p style=" margin-top:0px; margin-bottom:0px;'
@@ -1474,12 +1429,6 @@ class Ui_MainWindow(object):
             )
         )
         self.entry_table.setSortingEnabled(False)
-        item = self.entry_table.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Entry"))
-        item = self.entry_table.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "Number of Images"))
-        item = self.entry_table.horizontalHeaderItem(2)
-        item.setText(_translate("MainWindow", "Duration"))
         self.remove_entry.setToolTip(
             _translate(
                 "MainWindow",
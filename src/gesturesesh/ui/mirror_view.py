@@ -0,0 +1,93 @@
+# mirror_view.py - Extra window showing the session image on another screen
+from __future__ import annotations
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from gesturesesh.memory_budget import MemoryBudget, pixmap_bytes
+
+
+class MirrorView(QtWidgets.QWidget):
+    """
+    Shows whatever the session window shows, fitted to its own size:
+    a projector and a teacher's monitor can follow one session. The
+    session decodes and applies modifiers once and hands every mirror
+    the same pixmap (shared, not copied); each mirror keeps one smooth
+    rescale for its current size and makes a new one only when the image
+    or its size changes.
+    """
+
+    BACKGROUND = QtGui.QColor(30, 56, 78)
+
+    def __init__(self, memory: MemoryBudget | None = None, key: str = "mirror", parent=None):
+        super().__init__(parent)
+        self.memory = memory
+        self.key = key
+        self.source: QtGui.QPixmap | None = None
+        self.scaled: QtGui.QPixmap | None = None
+        self.setWindowTitle("Reference Practice (mirror)")
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent, True)
+        # Closing a mirror from its window button frees it for good
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose, True)
+        self.setMinimumSize(160, 120)
+        self.resize(800, 600)
+
+    def set_source(self, pixmap: QtGui.QPixmap) -> None:
+        self.source = pixmap
+        self.scaled = None
+        self.update()
+
+    def show_on(self, screen: QtGui.QScreen | None) -> None:
+        """Full screen on *screen*; without one, an ordinary window."""
+        if screen is None:
+            self.show()
+            return
+        self.setGeometry(screen.geometry())
+        self.showFullScreen()
+
+    def target_size(self) -> QtCore.QSize:
+        """Size of the source fitted to this window, in device pixels."""
+        ratio = self.devicePixelRatioF()
+        return self.source.size().scaled(
+            round(self.width() * ratio),
+            round(self.height() * ratio),
+            QtCore.Qt.KeepAspectRatio,
+        )
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.BACKGROUND)
+        if self.source is None or self.source.isNull():
+            return
+        target = self.target_size()
+        if self.scaled is None or self.scaled.size() != target:
+            self.scaled = self.source.scaled(
+                target,
+                aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                transformMode=QtCore.Qt.SmoothTransformation,
+            )
+            self.scaled.setDevicePixelRatio(self.devicePixelRatioF())
+            if self.memory is not None:
+                self.memory.hold(self.key, pixmap_bytes(self.scaled))
+        size = self.scaled.size() / self.scaled.devicePixelRatio()
+        painter.drawPixmap(
+            (self.width() - size.width()) // 2,
+            (self.height() - size.height()) // 2,
+            self.scaled,
+        )
+
+    def mouseDoubleClickEvent(self, event):
+        if self.isFullScreen():
+            self.showNormal()
+        else:
+            self.showFullScreen()
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_Escape and self.isFullScreen():
+            self.showNormal()
+            return
+        super().keyPressEvent(event)
+
+    def closeEvent(self, event):
+        if self.memory is not None:
+            self.memory.release(self.key)
+        super().closeEvent(event)
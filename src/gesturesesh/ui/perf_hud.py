@@ -0,0 +1,215 @@
+# perf_hud.py - Live performance readout drawn over the session image
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import dataclass
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from gesturesesh.memory_budget import MemoryBudget
+from gesturesesh.ui.animation_clock import animation_clock
+
+
+@dataclass
+class PerfStats:
+    """
+    Numbers SessionDisplay records as it works. Recording is a few
+    attribute writes, so it stays on whether or not the HUD is showing.
+    """
+
+    transition_ms: float | None = None  # last display_image, start to shown
+    load_ms: float | None = None  # last time spent getting pixels for an image
+    load_source: str = ""  # "decode", "preview", "animation" or "cache"
+    cache_hits: int = 0
+    cache_lookups: int = 0
+    pending_decodes: int = 0  # full-quality decodes queued or running
+    timer_drift_ms: float | None = None  # last countdown tick, late (+) or early (-)
+    max_timer_drift_ms: float = 0.0
+    budget: MemoryBudget | None = None  # images held against the session's ceiling
+    _last_tick: float | None = None
+
+    def record_load(self, source: str, ms: float) -> None:
+        self.cache_lookups += 1
+        if source == "cache":
+            self.cache_hits += 1
+        else:
+            self.load_ms = ms
+            self.load_source = source
+
+    def record_tick(self, now: float, interval_ms: float) -> None:
+        """
+        Note a countdown tick at *now* (seconds, monotonic). Gaps longer
+        than a few intervals mean the timer was paused, not late.
+        """
+        if self._last_tick is not None:
+            gap_ms = (now - self._last_tick) * 1000
+            if gap_ms < interval_ms * 3:
+                self.timer_drift_ms = gap_ms - interval_ms
+                self.max_timer_drift_ms = max(
+                    self.max_timer_drift_ms, abs(self.timer_drift_ms)
+                )
+        self._last_tick = now
+
+    @property
+    def hit_rate(self) -> float | None:
+        if not self.cache_lookups:
+            return None
+        return self.cache_hits / self.cache_lookups
+
+
+def resident_memory() -> tuple[int, bool] | None:
+    """
+    (bytes, is_peak) for this process: the current resident set where the
+    platform reports it cheaply, otherwise the peak. None if unknown.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"), False
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(
+                process, ctypes.byref(counters), counters.cb
+            ):
+                return counters.WorkingSetSize, False
+        except (OSError, AttributeError):
+            pass
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return (peak if sys.platform == "darwin" else peak * 1024), True
+
+
+def _ms(value: float | None) -> str:
+    return "–" if value is None else f"{value:.1f} ms"
+
+
+def format_stats(stats: PerfStats, memory: tuple[int, bool] | None) -> list[str]:
+    """The HUD's lines of text."""
+    rate = stats.hit_rate
+    hits = "–" if rate is None else f"{rate:.0%} of {stats.cache_lookups}"
+    load = _ms(stats.load_ms)
+    if stats.load_source:
+        load += f" ({stats.load_source})"
+    if memory is None:
+        rss = "–"
+    else:
+        rss = f"{memory[0] / 2**20:.0f} MB" + (" peak" if memory[1] else "")
+    drift = "–"
+    if stats.timer_drift_ms is not None:
+        drift = f"{stats.timer_drift_ms:+.1f} ms (max {stats.max_timer_drift_ms:.1f})"
+    lines = [
+        f"transition  {_ms(stats.transition_ms)}",
+        f"load        {load}",
+        f"cache hits  {hits}",
+        f"decoding    {stats.pending_decodes}",
+        f"memory      {rss}",
+        f"timer drift {drift}",
+    ]
+    budget = stats.budget
+    if budget is not None:
+        line = f"budget      {budget.total / 2**20:.0f}/{budget.limit / 2**20:.0f} MB"
+        if budget.last_action:
+            line += f", {budget.last_action} ×{budget.actions[budget.last_action]}"
+        lines.append(line)
+    return lines
+
+
+class PerfHud(QtWidgets.QWidget):
+    """
+    Translucent box of live numbers in the top-left corner of its parent.
+    Reads *stats* at most every REFRESH_MS while visible, and repaints
+    only when the text changes; hidden, it costs nothing.
+    """
+
+    REFRESH_MS = 250
+    MARGIN = 8
+    PADDING = 6
+
+    def __init__(self, stats: PerfStats, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self.stats = stats
+        self._lines: list[str] = []
+        self._clock = animation_clock()
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(QtCore.Qt.WA_NoSystemBackground, True)
+        self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        font = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont)
+        font.setPointSize(9)
+        self.setFont(font)
+        self.destroyed.connect(lambda: self._clock.cancel(self))
+        self.hide()
+
+    def toggle(self) -> None:
+        self.setVisible(not self.isVisible())
+
+    def setVisible(self, visible: bool) -> None:
+        super().setVisible(visible)
+        if visible:
+            self.raise_()
+            self.refresh()
+        else:
+            self._clock.cancel(self)
+
+    def refresh(self) -> None:
+        lines = format_stats(self.stats, resident_memory())
+        if lines != self._lines:
+            self._lines = lines
+            metrics = self.fontMetrics()
+            width = max(metrics.horizontalAdvance(line) for line in lines)
+            self.setGeometry(
+                self.MARGIN,
+                self.MARGIN,
+                width + 2 * self.PADDING,
+                metrics.lineSpacing() * len(lines) + 2 * self.PADDING,
+            )
+            self.update()
+        self._clock.call_later(self, self.REFRESH_MS, self._refresh_if_visible)
+
+    def _refresh_if_visible(self):
+        try:
+            if self.isVisible():
+                self.refresh()
+        except RuntimeError:
+            pass  # deleted with its window
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor(0, 0, 0, 160))
+        painter.drawRoundedRect(QtCore.QRectF(self.rect()), 4, 4)
+        painter.setPen(QtGui.QColor(220, 240, 238))
+        metrics = self.fontMetrics()
+        y = self.PADDING + metrics.ascent()
+        for line in self._lines:
+            painter.drawText(self.PADDING, y, line)
+            y += metrics.lineSpacing()
+        painter.end()
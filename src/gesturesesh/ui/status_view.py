@@ -0,0 +1,243 @@
+# status_view.py - Incremental renderer for the status message queue
+from __future__ import annotations
+
+from PyQt5 import QtGui, QtWidgets
+
+ERROR_RGB = (220, 20, 60)
+TEXT_RGB = (225, 225, 225)
+OLDER_RGB = (102, 102, 102)
+MESSAGE_SPACING = 3  # px above every message but the newest
+LINE_HEIGHT = 110  # percent
+
+
+class StatusView:
+    """
+    Shows status messages newest first in a QTextEdit, one text block per
+    message, in a document of its own.
+
+    Adding or removing a message inserts or deletes one block. Blink and
+    fade steps don't touch the document at all: the animating messages'
+    colour is drawn through QTextEdit extra selections, which are applied
+    at paint time without a relayout, so the cost of an animation frame
+    does not grow with the number of queued messages (unlike rebuilding
+    the whole HTML). Anything else written to the text edit while the view
+    is shown is detected and the document is rebuilt on the next sync.
+    """
+
+    def __init__(self, text_edit: QtWidgets.QTextEdit):
+        self._edit = text_edit
+        # QTextEdit deletes the document it created itself once another one
+        # is set, so plain status text gets a document of ours as well
+        self.plain_document = QtGui.QTextDocument()
+        self.plain_document.setUndoRedoEnabled(False)
+        self.document = QtGui.QTextDocument()
+        self.document.setUndoRedoEnabled(False)
+        self.document.contentsChange.connect(self._on_contents_change)
+        self._editing = False
+        self._stale = False
+        self._attached = False
+        self._messages: list = []  # the queue being shown (newest last)
+        self._order: list = []  # messages as laid out, newest first
+        self._styles: dict = {}  # message -> style key last applied
+        self._texts: dict = {}  # message -> text currently in its block
+        self._dirty: dict = {}  # ordered set of messages to restyle
+        self._animating: dict = {}  # ordered set of messages with an opacity
+
+    # ---------------------------------------------------------------------
+    #                           Public API
+    # ---------------------------------------------------------------------
+    def setFont(self, font: QtGui.QFont) -> None:
+        self.document.setDefaultFont(font)
+        self.plain_document.setDefaultFont(font)
+
+    def is_attached(self) -> bool:
+        return self._attached
+
+    def detach(self) -> None:
+        """Switch the text edit to the plain document (for plain status text)."""
+        if self._attached:
+            self._edit.setExtraSelections([])
+            self._edit.setDocument(self.plain_document)
+            self._attached = False
+
+    def sync(self, messages: list) -> None:
+        """Show *messages* (oldest first), touching only blocks that changed."""
+        self._messages = messages
+        if not self._attached:
+            self._edit.setDocument(self.document)
+            self._attached = True
+        if self._stale:
+            self._rebuild()
+            self._animating = {msg: None for msg in self._order if msg.opacity is not None}
+            self._update_overlays()
+            return
+        wanted = list(reversed(messages))
+        wanted_set = set(wanted)
+        self._editing = True
+        try:
+            for index in range(len(self._order) - 1, -1, -1):
+                if self._order[index] not in wanted_set:
+                    self._remove_block(index)
+            for index, msg in enumerate(wanted):
+                if index < len(self._order) and self._order[index] is msg:
+                    continue
+                if msg in self._texts:  # moved, e.g. a coalesced message
+                    self._remove_block(self._order.index(msg))
+                self._insert_block(index, msg)
+            for index, msg in enumerate(self._order):
+                if self._texts[msg] != msg.display_text:
+                    self._replace_text(index, msg)
+                self._apply_style(index, msg)
+        finally:
+            self._editing = False
+        self._dirty.clear()
+        self._animating = {msg: None for msg in self._order if msg.opacity is not None}
+        self._update_overlays()
+
+    def mark_dirty(self, msg) -> None:
+        """Queue *msg* for restyling on the next flush()."""
+        self._dirty[msg] = None
+
+    def flush(self) -> None:
+        """Redraw the messages marked dirty since the last flush."""
+        if not self._attached:
+            self._dirty.clear()
+            return
+        if self._stale:
+            self.sync(self._messages)
+            return
+        dirty, self._dirty = self._dirty, {}
+        self._editing = True
+        try:
+            for msg in dirty:
+                try:
+                    index = self._order.index(msg)
+                except ValueError:
+                    self._animating.pop(msg, None)
+                    continue  # removed before this frame
+                if msg.opacity is None:
+                    self._animating.pop(msg, None)
+                else:
+                    self._animating[msg] = None
+                self._apply_style(index, msg)
+        finally:
+            self._editing = False
+        self._update_overlays()
+
+    # ---------------------------------------------------------------------
+    #                           Internals
+    # ---------------------------------------------------------------------
+    def _on_contents_change(self, *_):
+        if not self._editing:
+            self._stale = True
+
+    def _rebuild(self):
+        self._editing = True
+        try:
+            self.document.clear()
+            self._order = []
+            self._styles = {}
+            self._texts = {}
+            for index, msg in enumerate(reversed(self._messages)):
+                self._insert_block(index, msg)
+                self._apply_style(index, msg)
+        finally:
+            self._editing = False
+        self._stale = False
+        self._dirty.clear()
+
+    def _insert_block(self, index, msg):
+        text = msg.display_text
+        if not self._order:
+            cursor = QtGui.QTextCursor(self.document)
+            cursor.insertText(text)
+        elif index == 0:
+            cursor = QtGui.QTextCursor(self.document)
+            cursor.insertText(text)
+            cursor.insertBlock()
+        else:
+            block = self.document.findBlockByNumber(index - 1)
+            cursor = QtGui.QTextCursor(block)
+            cursor.movePosition(QtGui.QTextCursor.EndOfBlock)
+            cursor.insertBlock()
+            cursor.insertText(text)
+        self._order.insert(index, msg)
+        self._texts[msg] = text
+        # Neighbouring blocks may have inherited this block's format
+        self._styles.pop(msg, None)
+        for neighbour in self._order[index : index + 2]:
+            self._styles.pop(neighbour, None)
+
+    def _remove_block(self, index):
+        block = self.document.findBlockByNumber(index)
+        cursor = QtGui.QTextCursor(self.document)
+        if len(self._order) == 1:
+            cursor.select(QtGui.QTextCursor.Document)
+        elif index + 1 < len(self._order):
+            cursor.setPosition(block.position())
+            cursor.setPosition(block.next().position(), QtGui.QTextCursor.KeepAnchor)
+        else:  # last block: take the separator before it
+            cursor.setPosition(block.position() - 1)
+            cursor.setPosition(
+                block.position() + block.length() - 1, QtGui.QTextCursor.KeepAnchor
+            )
+        cursor.removeSelectedText()
+        msg = self._order.pop(index)
+        self._styles.pop(msg, None)
+        self._texts.pop(msg, None)
+        if index < len(self._order):
+            self._styles.pop(self._order[index], None)
+
+    def _replace_text(self, index, msg):
+        self._block_cursor(index).insertText(msg.display_text)
+        self._texts[msg] = msg.display_text
+        self._styles.pop(msg, None)
+
+    def _style_key(self, index, msg):
+        """(spaced, bold, rgb) for a message; rgb None keeps the widget colour."""
+        if msg.opacity is not None:
+            return (index > 0, True, ERROR_RGB if msg.is_error else TEXT_RGB)
+        if index == 0:
+            return (False, True, ERROR_RGB if msg.is_error else None)
+        return (True, False, OLDER_RGB)
+
+    def _apply_style(self, index, msg):
+        key = self._style_key(index, msg)
+        if self._styles.get(msg) == key:
+            return
+        self._styles[msg] = key
+        spaced, bold, rgb = key
+
+        char_format = QtGui.QTextCharFormat()
+        char_format.setFontWeight(QtGui.QFont.Bold if bold else QtGui.QFont.Normal)
+        if rgb is None:
+            char_format.clearForeground()
+        else:
+            char_format.setForeground(QtGui.QColor(*rgb))
+
+        block_format = QtGui.QTextBlockFormat()
+        block_format.setTopMargin(MESSAGE_SPACING if spaced else 0)
+        block_format.setLineHeight(LINE_HEIGHT, QtGui.QTextBlockFormat.ProportionalHeight)
+
+        cursor = self._block_cursor(index)
+        cursor.setBlockFormat(block_format)
+        cursor.setCharFormat(char_format)
+
+    def _block_cursor(self, index):
+        """Cursor selecting the text of block *index*."""
+        cursor = QtGui.QTextCursor(self.document.findBlockByNumber(index))
+        cursor.movePosition(QtGui.QTextCursor.EndOfBlock, QtGui.QTextCursor.KeepAnchor)
+        return cursor
+
+    def _update_overlays(self):
+        """Tint the animating messages at their current opacity."""
+        selections = []
+        for msg in self._animating:
+            index = self._order.index(msg)
+            selection = QtWidgets.QTextEdit.ExtraSelection()
+            selection.cursor = self._block_cursor(index)
+            color = QtGui.QColor(*(ERROR_RGB if msg.is_error else TEXT_RGB))
+            color.setAlphaF(max(0.0, min(1.0, msg.opacity)))
+            selection.format.setForeground(color)
+            selections.append(selection)
+        self._edit.setExtraSelections(selections)
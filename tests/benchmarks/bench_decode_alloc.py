@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Allocation benchmark for the image decode path.
+
+Decodes a large PNG with the old read -> bytearray -> np.asarray chain and
+with the memory-mapped loader, and reports for each:
+
+    • peak Python-tracked allocation above the decoded image itself
+    • mean decode time
+
+Usage:
+    python tests/benchmarks/bench_decode_alloc.py --megapixels 24 --json out.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from gesturesesh.image_loader import decode_file
+
+
+def make_image(directory, megapixels):
+    """Write a noisy (poorly compressible) PNG of roughly *megapixels* MP."""
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    path = os.path.join(directory, f"alloc_{megapixels}mp.png")
+    cv2.imwrite(path, pixels)
+    return path
+
+
+def legacy_decode(path):
+    """The pre-mmap loader: three copies of the compressed data."""
+    with open(path, "rb") as f:
+        file_bytes = np.asarray(bytearray(f.read()), dtype=np.uint8)
+    return cv2.imdecode(file_bytes, cv2.IMREAD_UNCHANGED)
+
+
+def measure(decode, path, repeats):
+    tracemalloc.start()
+    image = decode(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    overhead = peak - image.nbytes
+    del image
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decode(path)
+    return {
+        "peak_overhead_bytes": max(0, overhead),
+        "mean_ms": (time.perf_counter() - start) * 1000 / repeats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megapixels", type=float, default=24)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_image(tmp, args.megapixels)
+        size = os.path.getsize(path)
+        results = {
+            "file_bytes": size,
+            "legacy": measure(legacy_decode, path, args.repeats),
+            "mmap": measure(decode_file, path, args.repeats),
+        }
+
+    print(f"PNG: {size / 1e6:.1f} MB ({args.megapixels} MP)")
+    for name in ("legacy", "mmap"):
+        r = results[name]
+        print(
+            f"{name:>7}: {r['peak_overhead_bytes'] / 1e6:8.1f} MB allocated "
+            f"beyond the image, {r['mean_ms']:7.1f} ms per decode"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    # The mapped path should not hold a copy of the compressed file
+    return 0 if results["mmap"]["peak_overhead_bytes"] < size / 4 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Image display pipeline benchmark.
+
+Generates synthetic JPEG, PNG and alpha PNG references at several sizes
+and, for each image_mods combination, times the stages SessionDisplay
+runs for every image:
+
+    • decode:  decode_file()
+    • mods:    SessionDisplay.apply_image_mods() (brightness/contrast,
+               grayscale, threshold, edge, flips)
+    • convert: SessionDisplay.cvimage_to_pixmap() (cv image -> QPixmap)
+    • scale:   the smooth QPixmap rescale to the window, and the fast one
+               used while resizing
+
+plus the peak memory allocated through Python (numpy included, Qt's own
+pixel buffers not) while decoding and while modifying and converting.
+
+Results can be compared with an earlier run; the script exits with 1 if
+any per-image latency (decode + mods + convert + smooth scale) exceeds
+--budget-ms or regresses past --tolerance times its baseline, so it can
+gate CI.
+
+Usage:
+    python tests/benchmarks/bench_image_pipeline.py --json pipeline.json
+    python tests/benchmarks/bench_image_pipeline.py --megapixels 2 12 \\
+        --baseline pipeline.json --budget-ms 500
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+import cv2
+import numpy as np
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from gesturesesh.main import SessionDisplay, ScheduleEntry
+from gesturesesh.image_loader import decode_file
+
+FORMATS = {
+    # name: (extension, channels, imwrite params)
+    "jpeg": (".jpg", 3, [cv2.IMWRITE_JPEG_QUALITY, 90]),
+    "png": (".png", 3, []),
+    "alpha-png": (".png", 4, []),
+}
+
+COMBOS = {
+    "none": {},
+    "grayscale": {"grayscale": True},
+    "grayscale-simple": {"grayscale": True, "grayscale_mode": "simple"},
+    "flip": {"hflip": True, "vflip": True},
+    "brightness-contrast": {"brightness": 20, "contrast": 1.2},
+    "threshold": {"threshold": True},
+    "edge": {"edge": True},
+    "all": {
+        "grayscale": True,
+        "hflip": True,
+        "vflip": True,
+        "brightness": 20,
+        "contrast": 1.2,
+        "threshold": True,
+    },
+}
+
+# Regressions smaller than this are noise, whatever the ratio
+NOISE_MS = 5.0
+
+
+def make_image(directory, fmt, megapixels):
+    """
+    Write a photo-like image (gradients plus grain) of roughly
+    *megapixels* MP in *fmt* and return its path.
+    """
+    ext, channels, params = FORMATS[fmt]
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.empty((height, width, channels), np.uint8)
+    for c in range(3):
+        grain = rng.integers(0, 24, (height, width), dtype=np.uint8)
+        base = (x * (c + 1) / 3 + y * (3 - c) / 3) % 232
+        pixels[..., c] = base.astype(np.uint8) + grain
+    if channels == 4:
+        pixels[..., 3] = (x / 2 + y / 2).astype(np.uint8)
+    path = os.path.join(directory, f"pipeline_{fmt}_{megapixels}mp{ext}")
+    cv2.imwrite(path, pixels, params)
+    return path
+
+
+def median_ms(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def peak_bytes(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_image(display, path, fmt, megapixels, repeats, combos):
+    decode_ms = median_ms(lambda: decode_file(path), repeats)
+    decode_peak = peak_bytes(lambda: decode_file(path))
+    cvimage = decode_file(path)
+    rows = []
+    for name in combos:
+        display.init_image_mods()
+        display.image_mods.update(COMBOS[name])
+        modified = display.apply_image_mods(cvimage)
+        pixmap = display.cvimage_to_pixmap(modified)
+        fit = pixmap.size().scaled(QtCore.QSize(1920, 1080), QtCore.Qt.KeepAspectRatio)
+        row = {
+            "format": fmt,
+            "megapixels": megapixels,
+            "combo": name,
+            "file_bytes": os.path.getsize(path),
+            "decode_ms": decode_ms,
+            "mods_ms": median_ms(lambda: display.apply_image_mods(cvimage), repeats),
+            "convert_ms": median_ms(lambda: display.cvimage_to_pixmap(modified), repeats),
+            "scale_ms": median_ms(
+                lambda: pixmap.scaled(
+                    display.scaling_size,
+                    aspectRatioMode=QtCore.Qt.KeepAspectRatioByExpanding,
+                    transformMode=QtCore.Qt.SmoothTransformation,
+                ),
+                repeats,
+            ),
+            "fast_scale_ms": median_ms(
+                lambda: pixmap.scaled(
+                    fit,
+                    aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                    transformMode=QtCore.Qt.FastTransformation,
+                ),
+                repeats,
+            ),
+            "decode_peak_bytes": decode_peak,
+            "mods_peak_bytes": peak_bytes(
+                lambda: display.cvimage_to_pixmap(display.apply_image_mods(cvimage))
+            ),
+        }
+        row["image_ms"] = (
+            row["decode_ms"] + row["mods_ms"] + row["convert_ms"] + row["scale_ms"]
+        )
+        rows.append(row)
+    return rows
+
+
+def check(rows, baseline, tolerance, budget_ms):
+    """Messages for rows over budget or slower than their baseline."""
+    failures = []
+    previous = {
+        (r["format"], r["megapixels"], r["combo"]): r["image_ms"] for r in baseline
+    }
+    for row in rows:
+        label = f"{row['format']} {row['megapixels']:g} MP {row['combo']}"
+        if budget_ms is not None and row["image_ms"] > budget_ms:
+            failures.append(f"{label}: {row['image_ms']:.1f} ms > budget {budget_ms} ms")
+        before = previous.get((row["format"], row["megapixels"], row["combo"]))
+        if (
+            before is not None
+            and row["image_ms"] > before * tolerance
+            and row["image_ms"] - before > NOISE_MS
+        ):
+            failures.append(f"{label}: {row['image_ms']:.1f} ms, was {before:.1f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[2, 12, 24, 48])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--combos", nargs="+", choices=COMBOS, default=list(COMBOS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="fail if a per-image latency exceeds its baseline by this factor",
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, help="fail if any per-image latency exceeds this"
+    )
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        display = None
+        for megapixels in args.megapixels:
+            for fmt in args.formats:
+                path = make_image(tmp, fmt, megapixels)
+                if display is None:
+                    display = SessionDisplay(
+                        schedule=[ScheduleEntry(1, 600)], items=[path], total=1
+                    )
+                rows.extend(
+                    bench_image(display, path, fmt, megapixels, args.repeats, args.combos)
+                )
+                os.remove(path)
+        display.close()
+
+    print(
+        f"{'format':>10} {'MP':>5} {'combo':>20} {'decode':>8} {'mods':>8} "
+        f"{'convert':>8} {'scale':>8} {'fast':>8} {'image':>8} {'peak MB':>8}"
+    )
+    for r in rows:
+        print(
+            f"{r['format']:>10} {r['megapixels']:>5g} {r['combo']:>20} "
+            f"{r['decode_ms']:8.1f} {r['mods_ms']:8.1f} {r['convert_ms']:8.1f} "
+            f"{r['scale_ms']:8.1f} {r['fast_scale_ms']:8.1f} {r['image_ms']:8.1f} "
+            f"{max(r['decode_peak_bytes'], r['mods_peak_bytes']) / 1e6:8.1f}"
+        )
+
+    baseline = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    failures = check(rows, baseline, args.tolerance, args.budget_ms)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "platform": platform.platform(),
+                    "python": platform.python_version(),
+                    "opencv": cv2.__version__,
+                    "numpy": np.__version__,
+                    "repeats": args.repeats,
+                    "results": rows,
+                },
+                f,
+                indent=2,
+            )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Resize-storm benchmark for SessionDisplay.
+
+Sends a burst of resize events to a SessionDisplay showing a large image,
+the way a window manager does during an interactive drag, and reports:
+
+    • time spent handling each resize event
+    • how many SmoothTransformation rescales were performed
+    • how many programmatic resizes were triggered from resize handling
+
+Usage:
+    python tests/benchmarks/bench_resize_storm.py --events 200 --json out.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+import cv2
+import numpy as np
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from gesturesesh.main import SessionDisplay, ScheduleEntry
+
+
+def make_image(directory, megapixels):
+    """Write a noisy PNG of roughly *megapixels* MP and return its path."""
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    path = os.path.join(directory, f"storm_{megapixels}mp.png")
+    cv2.imwrite(path, pixels)
+    return path
+
+
+class ScaleCounter:
+    """Counts QPixmap.scaled calls by transformation mode."""
+
+    def __init__(self):
+        self.smooth = 0
+        self.fast = 0
+        self._original = QtGui.QPixmap.scaled
+
+    def __enter__(self):
+        counter = self
+
+        def scaled(pixmap, *args, **kwargs):
+            mode = kwargs.get("transformMode", QtCore.Qt.FastTransformation)
+            if len(args) >= 3:
+                mode = args[2]
+            if mode == QtCore.Qt.SmoothTransformation:
+                counter.smooth += 1
+            else:
+                counter.fast += 1
+            return counter._original(pixmap, *args, **kwargs)
+
+        QtGui.QPixmap.scaled = scaled
+        return self
+
+    def __exit__(self, *exc):
+        QtGui.QPixmap.scaled = self._original
+
+
+def run_storm(display, events):
+    """Deliver *events* resize events and let the pipeline settle."""
+    start_size = display.size()
+    programmatic = []
+    original_resize = display.resize
+
+    def counting_resize(*args):
+        programmatic.append(args)
+        return original_resize(*args)
+
+    display.resize = counting_resize
+    durations = []
+    with ScaleCounter() as counter:
+        for i in range(events):
+            new = QtCore.QSize(
+                start_size.width() + 1 + i % 300, start_size.height() + 1 + i % 200
+            )
+            t0 = time.perf_counter()
+            # Resizing a shown window delivers the QResizeEvent synchronously
+            original_resize(new)
+            durations.append(time.perf_counter() - t0)
+        # Wait for the settle timer to fire once
+        deadline = time.perf_counter() + 2.0
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            if counter.smooth > 0 and not display.resize_settle_timer.isActive():
+                break
+            time.sleep(0.005)
+    display.resize = original_resize
+    durations.sort()
+    return {
+        "events": events,
+        "total_ms": sum(durations) * 1000,
+        "median_ms": durations[len(durations) // 2] * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+        "smooth_rescales": counter.smooth,
+        "fast_rescales": counter.fast,
+        "programmatic_resizes": len(programmatic),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SessionDisplay resize-storm benchmark")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--megapixels", type=float, default=12)
+    parser.add_argument(
+        "--free-resize",
+        action="store_true",
+        help="benchmark with free resize (R) enabled instead of fit-to-image",
+    )
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image = make_image(tmp, args.megapixels)
+        display = SessionDisplay(
+            schedule=[ScheduleEntry(1, 600)], items=[image], total=1
+        )
+        display.show()
+        app.processEvents()
+        if args.free_resize:
+            display.toggle_resize()
+        result = run_storm(display, args.events)
+        result["megapixels"] = args.megapixels
+        display.close()
+
+    print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    # One high-quality rescale per storm and no feedback resizes
+    return 0 if result["smooth_rescales"] == 1 and result["programmatic_resizes"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Folder scanner benchmark over synthetic directory trees.
+
+Builds a wide tree (few levels, many files per folder) and a deep one
+(long chains of nested folders) in tmpfs (/dev/shm when available), with
+mixed and upper-case extensions, symlinks to files and sibling folders,
+exact copies and unreadable folders, then times on a MainApp:
+
+    • scan_directories   walking the tree into the selection
+    • check_files        the extension/accessibility filter on every path
+    • remove_dupes       the inode pass plus the background duplicate scan
+    • build_playlist     a shuffled session playlist over the selection,
+                         and drawing every slot of it
+
+For each step it reports files per second and os.stat calls per file
+(counted by wrapping os.stat, which os.path.isfile also goes through).
+
+Usage:
+    python tests/benchmarks/bench_scanner.py --files 10000 100000 --json scan.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+# MainApp reads and writes its config in the user's config folder
+config_home = tempfile.mkdtemp(prefix="gesturesesh-bench-home-")
+os.environ["HOME"] = os.environ["APPDATA"] = config_home
+
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from gesturesesh.main import MainApp, ScheduleEntry
+
+# Extension of the n-th file; the last three are rejected by the scanner
+EXTENSIONS = [".jpg", ".png", ".JPG", ".jpeg", ".webp", ".bmp", ".PNG", ".txt", ".mov", ".db"]
+# One file in this many is an exact copy of the file before it, extension
+# included; coprime to len(EXTENSIONS) so copies cover every extension
+COPY_EVERY = 21
+# One folder in this many is unreadable
+UNREADABLE_EVERY = 50
+
+
+class StatCounter:
+    """Counts os.stat calls while active."""
+
+    def __init__(self):
+        self.calls = 0
+        self._original = os.stat
+
+    def __enter__(self):
+        counter = self
+
+        def stat(*args, **kwargs):
+            counter.calls += 1
+            return counter._original(*args, **kwargs)
+
+        os.stat = stat
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._original
+
+
+def source_index(index):
+    """The file the *index*-th file is made from (itself unless a copy)."""
+    return index - 1 if index % COPY_EVERY == COPY_EVERY - 1 else index
+
+
+def make_tree(root, files, layout):
+    """
+    Create *files* files under *root* and return (folders, expected valid
+    files). Files are sparse, so sizes vary without filling tmpfs.
+    """
+    per_folder = 1000 if layout == "wide" else 20
+    depth = 2 if layout == "wide" else 25
+    folders, valid, unreadable = [], 0, set()
+    folder = root
+    for index in range(files):
+        if index % per_folder == 0:
+            number = index // per_folder
+            # Wide: siblings under a few parents; deep: a chain that restarts every *depth*
+            if layout == "wide":
+                folder = os.path.join(root, f"group{number % 10}", f"folder{number}")
+            elif number % depth == 0:
+                folder = os.path.join(root, f"chain{number // depth}")
+            else:
+                folder = os.path.join(folder, f"level{number % depth}")
+            os.makedirs(folder, exist_ok=True)
+            folders.append(folder)
+            if number % UNREADABLE_EVERY == UNREADABLE_EVERY - 1:
+                unreadable.add(folder)
+        source = source_index(index)
+        ext = EXTENSIONS[source % len(EXTENSIONS)]
+        path = os.path.join(folder, f"img{index}{ext}")
+        with open(path, "wb") as f:
+            f.write(source.to_bytes(8, "little"))
+            f.truncate(4096 + (source * 2654435761) % (files * 64))
+        if ext.lower() not in (".txt", ".mov", ".db") and folder not in unreadable:
+            valid += 1
+    # Symlinks: a file link per folder and a link to the next sibling folder
+    for number, folder in enumerate(folders[:-1]):
+        if number % 10 == 0:
+            target = os.path.join(folder, os.listdir(folder)[0])
+            os.symlink(target, os.path.join(folder, "link_to_first.jpg"))
+            os.symlink(folders[number + 1], os.path.join(folder, "sibling_link"))
+    for folder in unreadable:
+        os.chmod(folder, 0)
+    return folders, valid, unreadable
+
+
+def distinct_contents(paths):
+    """
+    Different files among *paths*. A file's first 8 bytes name the file it
+    was made from, so copies, symlinks and paths through a folder link
+    all share them.
+    """
+    contents = set()
+    for path in paths:
+        with open(path, "rb") as f:
+            contents.add(f.read(8))
+    return len(contents)
+
+
+def timed(files, func):
+    with StatCounter() as counter:
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+    return result, {
+        "seconds": seconds,
+        "files_per_second": files / seconds if seconds else None,
+        "stat_calls_per_file": counter.calls / files,
+    }
+
+
+def bench_tree(window, root, files, layout):
+    folders, expected_valid, unreadable = make_tree(root, files, layout)
+    result = {"layout": layout, "files": files, "folders": len(folders)}
+
+    window.selection = {"files": [], "folders": []}
+    (valid, invalid), result["scan_directories"] = timed(
+        files, lambda: window.scan_directories([root])
+    )
+    result["valid_files"] = valid
+    result["invalid_files"] = invalid
+    result["unreadable_folders_enforced"] = not hasattr(os, "geteuid") or os.geteuid() != 0
+    paths = list(window.selection["files"])
+
+    _, result["check_files"] = timed(files, lambda: window.check_files(paths))
+
+    def remove_dupes():
+        window.remove_dupes()
+        window.dupe_pool.waitForDone()
+        app.processEvents()
+
+    before = len(window.selection["files"])
+    result["expected_duplicates"] = before - distinct_contents(window.selection["files"])
+    _, result["remove_dupes"] = timed(files, remove_dupes)
+    result["duplicates_removed"] = before - len(window.selection["files"])
+
+    window.session_schedule = [ScheduleEntry(len(window.selection["files"]), 30)]
+    window.randomize_selection.setChecked(True)
+
+    def first_slots():
+        playlist = window.build_playlist()
+        return [playlist[i] for i in range(min(100, len(playlist)))]
+
+    _, result["build_playlist"] = timed(files, first_slots)
+    _, result["playlist_all_slots"] = timed(
+        files, lambda: list(window.build_playlist())
+    )
+
+    for folder in unreadable:
+        os.chmod(folder, 0o755)
+    shutil.rmtree(root)
+    # Root reads unreadable folders anyway, so their files count as valid
+    if not result["unreadable_folders_enforced"]:
+        expected_valid = sum(
+            1 for index in range(files)
+            if EXTENSIONS[source_index(index) % len(EXTENSIONS)].lower()
+            not in (".txt", ".mov", ".db")
+        )
+    result["expected_valid_files"] = expected_valid
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--layouts", nargs="+", choices=("wide", "deep"), default=["wide", "deep"])
+    parser.add_argument("--dir", help="where to build trees (default: /dev/shm or temp)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    base = args.dir or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+    window = MainApp()
+    results = []
+    try:
+        for files in args.files:
+            for layout in args.layouts:
+                with tempfile.TemporaryDirectory(dir=base) as tmp:
+                    results.append(
+                        bench_tree(window, os.path.join(tmp, "tree"), files, layout)
+                    )
+    finally:
+        window.close()
+        shutil.rmtree(config_home, ignore_errors=True)
+
+    steps = ("scan_directories", "check_files", "remove_dupes", "build_playlist", "playlist_all_slots")
+    for r in results:
+        print(f"{r['layout']} tree: {r['files']} files in {r['folders']} folders, "
+              f"{r['valid_files']} added, {r['duplicates_removed']} duplicates removed "
+              f"(expected {r['expected_duplicates']})")
+        for step in steps:
+            s = r[step]
+            print(f"  {step:>20}: {s['seconds'] * 1000:9.1f} ms  "
+                  f"{s['files_per_second']:12,.0f} files/s  "
+                  f"{s['stat_calls_per_file']:5.2f} stat/file")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    # Every valid file found. Folder symlinks can add files twice under
+    # another path, so more is fine; fewer means the scanner lost files.
+    # Every copy, and nothing else, removed as a duplicate.
+    ok = all(
+        r["valid_files"] >= r["expected_valid_files"]
+        and r["duplicates_removed"] == r["expected_duplicates"]
+        and (r["expected_duplicates"] > 0 or r["files"] < COPY_EVERY)
+        for r in results
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Schedule-load benchmark.
+
+Loads an N-row preset into a visible table two ways:
+
+    • legacy: a QTableWidget with one QTableWidgetItem per cell, recounting
+      the totals from the cell text on every itemChanged
+    • model:  ScheduleModel.load_preset() behind a QTableView
+
+and then edits one cell. The model should load in roughly linear time
+and edit in constant time.
+
+Usage:
+    python tests/benchmarks/bench_schedule_load.py --rows 100 1000 --json out.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+from PyQt5.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from gesturesesh.schedule import ScheduleModel
+
+
+def legacy_total(table):
+    """The previous update_total: reparse every cell."""
+    images = total = 0
+    for row in range(table.rowCount()):
+        if table.item(row, 1) is None or table.item(row, 2) is None:
+            return
+        count, seconds = int(table.item(row, 1).text()), int(table.item(row, 2).text())
+        images += count
+        total += count * seconds if count > 0 else seconds
+    return images, total
+
+
+def run_legacy(preset):
+    table = QTableWidget(0, 3)
+    table.itemChanged.connect(lambda item: legacy_total(table))
+    table.show()
+    start = time.perf_counter()
+    for _, row_data in sorted(preset.items(), key=lambda x: int(x[0])):
+        row = table.rowCount()
+        table.insertRow(row)
+        for column, value in enumerate(row_data):
+            table.setItem(row, column, QTableWidgetItem(value))
+    app.processEvents()
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    table.item(len(preset) // 2, 1).setText("7")
+    app.processEvents()
+    edit = time.perf_counter() - start
+    table.close()
+    table.deleteLater()
+    return load * 1000, edit * 1000
+
+
+def run_model(preset):
+    model = ScheduleModel()
+    view = QTableView()
+    view.setModel(model)
+    view.show()
+    start = time.perf_counter()
+    model.load_preset(preset)
+    app.processEvents()
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    model.setData(model.index(len(preset) // 2, 1), "7")
+    app.processEvents()
+    edit = time.perf_counter() - start
+    view.close()
+    view.deleteLater()
+    return load * 1000, edit * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>6} {'legacy load ms':>15} {'model load ms':>14} {'legacy edit ms':>15} {'model edit ms':>14}")
+    for rows in args.rows:
+        preset = {str(r): [str(r + 1), "5", "60"] for r in range(rows)}
+        legacy_load, legacy_edit = run_legacy(preset)
+        model_load, model_edit = run_model(preset)
+        results.append(
+            {
+                "rows": rows,
+                "legacy_load_ms": legacy_load,
+                "model_load_ms": model_load,
+                "legacy_edit_ms": legacy_edit,
+                "model_edit_ms": model_edit,
+            }
+        )
+        print(f"{rows:>6} {legacy_load:>15.2f} {model_load:>14.2f} {legacy_edit:>15.3f} {model_edit:>14.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    # A 1,000-row plan should load in well under 100 ms
+    largest = results[-1]
+    return 0 if largest["model_load_ms"] < 100 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Status-render benchmark.
+
+Queues N status messages in a visible QTextEdit and measures one blink
+step (restyle the newest message, then process the resulting repaint)
+two ways:
+
+    • legacy: rebuild the whole HTML and call setHtml
+    • view:   StatusView.flush(), which only retints the animating block
+
+The view's cost per step should stay flat as N grows.
+
+Usage:
+    python tests/benchmarks/bench_status_render.py --counts 1 10 50 200 --json out.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from gesturesesh.main import StatusMessage
+from gesturesesh.ui.status_view import StatusView
+
+
+def legacy_html(messages):
+    """The previous _render_status markup."""
+    html = ['<div style="line-height:1.1;">']
+    for i, msg in enumerate(reversed(messages)):
+        margin = "margin-top:3px;" if i else ""
+        if msg.opacity is not None:
+            css = f"font-weight:bold; color:rgba(225, 225, 225, {msg.opacity}); {margin}"
+        elif i == 0:
+            css = f"font-weight:bold; {margin}"
+        else:
+            css = f"color:rgb(102,102,102); {margin}"
+        html.append(f'<div style="{css}">{msg.text}</div>')
+    html.append("</div>")
+    return "".join(html)
+
+
+def run(count, steps, legacy):
+    edit = QTextEdit()
+    edit.resize(600, 400)
+    edit.show()
+    messages = [StatusMessage(f"{i} files added from 3 folder(s).", 2000) for i in range(count)]
+    view = StatusView(edit)
+    if legacy:
+        edit.setHtml(legacy_html(messages))
+    else:
+        view.sync(messages)
+    app.processEvents()
+    newest = messages[-1]
+    start = time.perf_counter()
+    for step in range(steps):
+        newest.opacity = 0.2 + 0.8 * (step % 20) / 20
+        if legacy:
+            edit.setHtml(legacy_html(messages))
+        else:
+            view.mark_dirty(newest)
+            view.flush()
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000 / steps
+    edit.close()
+    edit.deleteLater()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'messages':>8} {'legacy ms/step':>15} {'view ms/step':>13}")
+    for count in args.counts:
+        legacy = run(count, args.steps, legacy=True)
+        view = run(count, args.steps, legacy=False)
+        results.append({"messages": count, "legacy_ms": legacy, "view_ms": view})
+        print(f"{count:>8} {legacy:>15.3f} {view:>13.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    # Flat within noise: the largest queue may cost at most 3x the smallest
+    flat = results[-1]["view_ms"] <= 3 * max(results[0]["view_ms"], 0.05)
+    return 0 if flat else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
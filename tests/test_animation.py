@@ -0,0 +1,110 @@
+"""
+Tests for gesturesesh.animation: bounded frame cache and streamed playback
+of animated GIF / WebP / APNG references.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.animation import AnimatedImage, FrameCache, is_apng, is_multi_frame
+
+
+def write_animation(path, frames=6, delay=100, size=(24, 32)):
+    anim = cv2.Animation()
+    anim.frames = [np.full((*size, 3), i * 30, np.uint8) for i in range(frames)]
+    anim.durations = [delay] * frames
+    return cv2.imwriteanimation(path, anim)
+
+
+class TestFrameCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        frame = np.zeros((10, 10, 4), np.uint8)  # 400 bytes
+        cache = FrameCache(max_bytes=1000)
+        for i in range(3):
+            cache.put(i, frame.copy())
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(0, cache)
+        cache.get(1)
+        cache.put(3, frame.copy())
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertLessEqual(cache.bytes, 1000)
+
+
+@unittest.skipUnless(hasattr(cv2, "imwriteanimation"), "OpenCV without animation API")
+class TestAnimatedImage(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.gif = os.path.join(self.test_dir, "loop.gif")
+        write_animation(self.gif)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_is_multi_frame(self):
+        self.assertTrue(is_multi_frame(self.gif))
+        single = os.path.join(self.test_dir, "single.gif")
+        write_animation(single, frames=1)
+        self.assertFalse(is_multi_frame(single))
+        still = os.path.join(self.test_dir, "still.png")
+        cv2.imwrite(still, np.zeros((4, 4, 3), np.uint8))
+        self.assertFalse(is_apng(still))
+        self.assertFalse(is_multi_frame(still))
+        self.assertFalse(is_multi_frame(os.path.join(self.test_dir, "missing.gif")))
+
+    def test_webp_animation_flag(self):
+        webp = os.path.join(self.test_dir, "loop.webp")
+        if not write_animation(webp):
+            self.skipTest("OpenCV without animated WebP")
+        self.assertTrue(is_multi_frame(webp))
+        still = os.path.join(self.test_dir, "still.webp")
+        cv2.imwrite(still, np.zeros((4, 4, 3), np.uint8))
+        self.assertFalse(is_multi_frame(still))
+
+    def test_apng_extension(self):
+        apng = os.path.join(self.test_dir, "loop.apng")
+        png = os.path.join(self.test_dir, "loop.png")
+        write_animation(png)
+        os.rename(png, apng)
+        self.assertTrue(is_apng(apng))
+        self.assertTrue(is_multi_frame(apng))
+        anim = AnimatedImage(apng)
+        self.assertEqual(int(anim.frame(2)[0, 0, 0]), 60)
+        self.assertEqual(anim.index_at(250), 2)
+
+    def test_frames_follow_elapsed_time(self):
+        anim = AnimatedImage(self.gif)
+        self.assertEqual(anim.index_at(0), 0)
+        self.assertEqual(anim.index_at(250), 2)
+        # Only the frames needed so far have been decoded
+        self.assertIsNone(anim.duration_ms)
+        self.assertEqual(anim.index_at(650), 0)  # looped
+        self.assertEqual(anim.duration_ms, 600)
+        self.assertEqual(anim.time_to_next_frame(250), 50)
+
+    def test_bounded_cache_rewinds_stream(self):
+        anim = AnimatedImage(self.gif, cache_bytes=2 * 24 * 32 * 3)
+        last = anim.frame(5)
+        self.assertIsNotNone(last)
+        self.assertLessEqual(len(anim.cache), 2)
+        first = anim.frame(0)  # evicted, decoded again from the start
+        # GIF palettes quantize colours, so compare loosely
+        self.assertLess(int(first[0, 0, 0]), 30)
+        self.assertGreater(int(last[0, 0, 0]), 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
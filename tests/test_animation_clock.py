@@ -0,0 +1,113 @@
+"""
+Tests for gesturesesh.ui.animation_clock: progress, looping, batched
+repaints, idle shutdown and delayed callbacks.
+"""
+
+import os
+import sys
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.ui.animation_clock import AnimationClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.ms = 0.0
+
+    def __call__(self):
+        return self.ms / 1000.0
+
+
+class TestAnimationClock(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        self.clock = AnimationClock(now=self.time)
+
+    def advance(self, ms):
+        self.time.ms += ms
+        self.clock.tick()
+
+    def test_progress_and_finish(self):
+        steps, finished = [], []
+        self.clock.start("a", 100, steps.append, lambda: finished.append(True))
+        self.assertTrue(self.clock.is_active())
+        self.advance(25)
+        self.advance(50)
+        self.advance(50)
+        self.assertEqual(steps, [0.25, 0.75, 1.0])
+        self.assertEqual(finished, [True])
+        self.assertFalse(self.clock.is_running("a"))
+        self.assertFalse(self.clock.is_active())
+
+    def test_loops(self):
+        steps = []
+        self.clock.start("loop", 100, steps.append, loops=3)
+        self.advance(150)
+        self.assertEqual(steps, [0.5])
+        self.advance(100)
+        self.assertTrue(self.clock.is_running("loop"))
+        self.advance(100)
+        self.assertFalse(self.clock.is_running("loop"))
+
+    def test_repaints_are_batched_per_frame(self):
+        renders = []
+        render = lambda: renders.append(self.time.ms)
+        for key in range(10):
+            self.clock.start(key, 1000, lambda p: self.clock.request_repaint(render))
+        self.advance(16)
+        self.assertEqual(renders, [16])
+
+    def test_step_ms_limits_steps_and_timer(self):
+        steps = []
+        self.clock.start("pulse", 1000, steps.append, loops=float("inf"), step_ms=50)
+        self.assertEqual(self.clock._frame_timer.interval(), 50)
+        # A frame-rate animation alongside doesn't speed the pulse up
+        self.clock.start("fade", 100, lambda p: None)
+        self.assertEqual(self.clock._frame_timer.interval(), 16)
+        for _ in range(12):
+            self.advance(16)
+        self.assertEqual(len(steps), 4)  # at 0.048, 0.096, 0.144, 0.192 s
+        self.assertFalse(self.clock.is_running("fade"))
+        self.assertEqual(self.clock._frame_timer.interval(), 50)
+        self.clock.stop("pulse")
+
+    def test_stop_skips_finished_callback(self):
+        finished = []
+        self.clock.start("a", 100, lambda p: None, lambda: finished.append(True))
+        self.clock.stop("a")
+        self.advance(200)
+        self.assertEqual(finished, [])
+        self.assertFalse(self.clock.is_active())
+
+    def test_restart_replaces_animation(self):
+        first, second = [], []
+        self.clock.start("a", 100, first.append)
+        self.clock.start("a", 100, second.append)
+        self.advance(50)
+        self.assertEqual((first, second), ([], [0.5]))
+
+    def test_call_later_and_cancel(self):
+        calls = []
+        self.clock.call_later("x", 100, lambda: calls.append("x"))
+        self.clock.call_later("y", 50, lambda: calls.append("y"))
+        self.clock.call_later("z", 10, lambda: calls.append("z"))
+        self.clock.cancel("z")
+        self.time.ms = 60
+        self.clock._run_deadlines()
+        self.assertEqual(calls, ["y"])
+        self.time.ms = 100
+        self.clock._run_deadlines()
+        self.assertEqual(calls, ["y", "x"])
+        self.assertFalse(self.clock._deadline_timer.isActive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for gesturesesh.cli: building a session from command-line
+arguments and the --dry-run listing.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import cli
+from gesturesesh.schedule import ScheduleEntry
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.images = os.path.join(self.dir, "images")
+        self.files = []
+        for index in range(6):
+            path = os.path.join(self.images, f"sub{index % 2}", f"{index}.jpg")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            Path(path).touch()
+            self.files.append(path)
+        self.config_dir = os.path.join(self.dir, "config")
+        os.makedirs(self.config_dir)
+        patcher = patch.object(cli, "get_config_dir", return_value=Path(self.config_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _config(self, config):
+        with open(os.path.join(self.config_dir, "config.json"), "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+    def _run(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                code = cli.main(list(argv))
+            except SystemExit as e:
+                code = e.code
+        return code, out.getvalue().splitlines(), err.getvalue()
+
+    def test_dry_run_lists_slots_with_timings(self):
+        code, lines, _ = self._run(
+            "--folders", self.images, "--plan", "breaks(2m, 2*(2x30s))", "--dry-run"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(lines[0], "4 image(s), 1 break(s), 4:00 total")
+        slots = [line.split() for line in lines[2:]]
+        self.assertEqual([s[1] for s in slots], ["0:00", "0:30", "1:00", "3:00", "3:30"])
+        self.assertEqual([s[2] for s in slots], ["0:30", "0:30", "2:00", "0:30", "0:30"])
+        self.assertEqual(slots[2][3], "(break)")
+        # Unshuffled, images follow the scan order
+        scanned = cli.scan_folders([self.images], {".jpg"}).files
+        self.assertEqual([s[3] for s in slots if s[3] != "(break)"], scanned[:4])
+
+    def test_seed_makes_shuffle_repeatable(self):
+        args = ("--folders", self.images, "--plan", "6x30s", "--shuffle", "--dry-run")
+        first = self._run(*args, "--seed", "42")[1]
+        self.assertEqual(first, self._run(*args, "--seed", "42")[1])
+        self.assertNotEqual(first, self._run(*args, "--seed", "7")[1])
+        shown = sorted(line.split()[3] for line in first[2:])
+        self.assertEqual(shown, sorted(self.files))
+
+    def test_presets(self):
+        self._config({
+            "presets": {
+                "Table": {"0": ["1", "2", "30"], "1": ["2", "0", "60"]},
+                "Plan": "3x1m",
+            },
+            "recent_session": {"recent_preset": 1},
+        })
+        args = cli.build_parser().parse_args(["--files", "a.jpg", "--preset", "Table"])
+        self.assertEqual(
+            cli.resolve_schedule(args, cli.load_config(Path(self.config_dir) / "config.json")),
+            [ScheduleEntry(2, 30), ScheduleEntry(0, 60)],
+        )
+        # Without --preset or --plan the last used preset applies
+        code, lines, _ = self._run("--files", *self.files[:3], "--dry-run")
+        self.assertEqual(code, 0)
+        self.assertEqual(lines[0], "3 image(s), 0 break(s), 3:00 total")
+
+    def test_errors(self):
+        self._config({"presets": {"Short": "2x30s"}})
+        for argv, message in (
+            (["--preset", "Long"], "no preset named 'Long' (presets: Short)"),
+            (["--plan", "ladder("], "error:"),
+            (["--plan", "9x30s"], "9 image(s) scheduled but only 6 found"),
+            ([], "give --preset or --plan"),
+        ):
+            code, _, err = self._run("--folders", self.images, "--dry-run", *argv)
+            self.assertEqual(code, 2)
+            self.assertIn(message, err)
+
+    def test_rejected_files_are_reported(self):
+        missing = os.path.join(self.dir, "missing.jpg")
+        code, lines, err = self._run(
+            "--files", self.files[0], missing, os.path.join(self.dir, "x.txt"),
+            "--plan", "1x30s", "--dry-run",
+        )
+        self.assertEqual(code, 0)
+        self.assertIn("2 file(s) not added", err)
+        self.assertTrue(lines[2].endswith(self.files[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Tests for gesturesesh.decoders: decoder selection by magic bytes and cost,
+reduced-size decoding and the native PSD composite reader.
+"""
+
+import os
+import sys
+import struct
+import unittest
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import decoders
+from gesturesesh.decoders import (
+    Decoder,
+    choose_decoder,
+    decode_buffer,
+    decode_psd,
+    register_decoder,
+    supported_extensions,
+)
+
+
+def pack_bits(row):
+    """PackBits-encode *row* as literal runs of up to 128 bytes."""
+    out = b""
+    for i in range(0, len(row), 128):
+        chunk = row[i : i + 128]
+        out += bytes([len(chunk) - 1]) + chunk
+    return out
+
+
+def make_psd(planes, mode=3, rle=False, extra_sections=b""):
+    """Build a minimal PSD from (channels, height, width) uint8 *planes*."""
+    channels, height, width = planes.shape
+    header = b"8BPS" + struct.pack(">H6xHIIHH", 1, channels, height, width, 8, mode)
+    sections = struct.pack(">I", 0)  # colour mode data
+    sections += struct.pack(">I", len(extra_sections)) + extra_sections  # resources
+    sections += struct.pack(">I", 0)  # layer & mask info
+    if not rle:
+        return header + sections + struct.pack(">H", 0) + planes.tobytes()
+    rows = [pack_bits(row.tobytes()) for plane in planes for row in plane]
+    counts = b"".join(struct.pack(">H", len(r)) for r in rows)
+    return header + sections + struct.pack(">H", 1) + counts + b"".join(rows)
+
+
+class TestDecoderSelection(unittest.TestCase):
+    def setUp(self):
+        self.saved = decoders.registered_decoders()
+
+    def tearDown(self):
+        decoders._registry[:] = self.saved
+        supported_extensions.cache_clear()
+
+    def test_magic_bytes_win_over_extension(self):
+        png = cv2.imencode(".png", np.zeros((4, 4, 3), np.uint8))[1].tobytes()
+        decoder = choose_decoder(".jpg", png[:32])
+        self.assertEqual(decoder.name, "opencv.png")
+        self.assertEqual(decode_buffer(png, ".jpg").shape, (4, 4, 3))
+
+    def test_extension_fallback_without_signature(self):
+        decoder = choose_decoder(".jpeg", b"\0" * 32)
+        self.assertEqual(decoder.name, "opencv-jpeg")
+        self.assertIsNone(choose_decoder(".xyz", b"\0" * 32))
+
+    def test_cheapest_decoder_wins_and_reduce_prefers_reducing(self):
+        calls = []
+        sniff = lambda head: head[:4] == b"TEST"
+
+        def decode(name):
+            def run(data, reduce):
+                calls.append((name, reduce))
+                return np.zeros((2, 2, 3), np.uint8)
+            return run
+
+        register_decoder(Decoder("slow", frozenset({".tst"}), decode("slow"), cost=9, can_reduce=True, sniff=sniff))
+        register_decoder(Decoder("fast", frozenset({".tst"}), decode("fast"), cost=1, sniff=sniff))
+        head = b"TEST" + b"\0" * 28
+        self.assertEqual(choose_decoder(".tst", head).name, "fast")
+        self.assertEqual(choose_decoder(".tst", head, reduce=8).name, "slow")
+        decode_buffer(head, ".tst", reduce=8)
+        self.assertEqual(calls, [("slow", 8)])
+        self.assertIn(".tst", supported_extensions())
+
+    def test_failed_decoder_falls_through(self):
+        def broken(data, reduce):
+            raise ValueError("corrupt")
+
+        sniff = lambda head: head[:4] == b"TEST"
+        register_decoder(Decoder("broken", frozenset({".tst"}), broken, cost=0, sniff=sniff))
+        register_decoder(
+            Decoder("backup", frozenset({".tst"}), lambda d, r: np.ones((1, 1), np.uint8), cost=5, sniff=sniff)
+        )
+        self.assertEqual(decode_buffer(b"TEST" + b"\0" * 28, ".tst").shape, (1, 1))
+
+    def test_decoder_bug_falls_through(self):
+        sniff = lambda head: head[:4] == b"TEST"
+        register_decoder(
+            Decoder("buggy", frozenset({".tst"}), lambda d, r: [][0], cost=0, sniff=sniff)
+        )
+        self.assertIsNone(decode_buffer(b"TEST" + b"\0" * 28, ".tst"))
+
+    def test_unavailable_decoder_is_skipped(self):
+        register_decoder(
+            Decoder("missing", frozenset({".nope"}), lambda d, r: None, available=lambda: False)
+        )
+        self.assertNotIn(".nope", supported_extensions())
+
+    def test_jpeg_reduced_decode(self):
+        jpeg = cv2.imencode(".jpg", np.full((64, 96, 3), 90, np.uint8))[1].tobytes()
+        self.assertEqual(decode_buffer(jpeg, ".jpeg", reduce=8).shape, (8, 12, 3))
+
+    def test_sixteen_bit_images_become_8_bit(self):
+        image = np.full((4, 4, 3), 0xABCD, np.uint16)
+        png = cv2.imencode(".png", image)[1].tobytes()
+        decoded = decode_buffer(png, ".png")
+        self.assertEqual(decoded.dtype, np.uint8)
+        self.assertEqual(int(decoded[0, 0, 0]), 0xAB)
+
+
+class TestPSD(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.planes = rng.integers(0, 256, (3, 5, 300), dtype=np.uint8)
+
+    def expected_bgr(self):
+        return np.dstack([self.planes[2], self.planes[1], self.planes[0]])
+
+    def test_raw_composite(self):
+        image = decode_psd(make_psd(self.planes, extra_sections=b"8BIM" * 3))
+        np.testing.assert_array_equal(image, self.expected_bgr())
+
+    def test_rle_composite(self):
+        image = decode_psd(make_psd(self.planes, rle=True))
+        np.testing.assert_array_equal(image, self.expected_bgr())
+
+    def test_grayscale_and_registry(self):
+        planes = self.planes[:1]
+        data = make_psd(planes, mode=1)
+        np.testing.assert_array_equal(decode_buffer(data, ".psd"), planes[0])
+        self.assertEqual(choose_decoder(".bin", data[:32]).name, "psd-composite")
+
+    def test_too_few_channels_for_the_mode(self):
+        data = make_psd(self.planes[:2], mode=3)
+        with self.assertRaises(ValueError):
+            decode_psd(data)
+        self.assertIsNone(decode_buffer(data, ".psd"))
+
+    def test_unpack_bits_repeat_run(self):
+        # 0xFE repeats the next byte three times
+        self.assertEqual(decoders._unpack_bits(b"\xfe\x07\x01ab", 5), b"\x07\x07\x07ab")
+
+
+if __name__ == "__main__":
+    unittest.main()
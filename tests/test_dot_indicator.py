@@ -0,0 +1,81 @@
+"""
+Tests for gesturesesh.ui.dot_indicator: cached render layers and
+pulse repaints.
+"""
+
+import os
+import sys
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.ui.dot_indicator import DotIndicator
+
+
+class TestDotIndicatorLayers(unittest.TestCase):
+    def setUp(self):
+        self.dots = DotIndicator()
+        self.dots.resize(self.dots.sizeHint())
+        self.dots.setMaximum(6)
+        self.dots.setBreaks([2])
+        self.dots.setValue(3)  # current image is the break
+        self.dots.grab()
+
+    def tearDown(self):
+        self.dots.deleteLater()
+
+    def test_pulse_ticks_reuse_static_layer(self):
+        static = self.dots._static_layer
+        self.assertIsNotNone(static)
+        for step in range(5):
+            self.dots._on_pulse_step(step / 5)
+            self.dots.grab()
+        self.assertIs(self.dots._static_layer, static)
+
+    def test_glow_covers_only_the_break_dot(self):
+        glow = self.dots._glow_rect
+        self.assertFalse(glow.isEmpty())
+        self.assertLess(glow.width(), self.dots.width() / 3)
+
+    def test_state_changes_invalidate_layers(self):
+        for change in (
+            lambda: self.dots.setValue(4),
+            lambda: self.dots.setBreaks([1]),
+            lambda: self.dots.setMaximum(12),
+        ):
+            self.dots.grab()
+            change()
+            self.assertIsNone(self.dots._static_layer)
+
+    def test_resize_rerenders_layers(self):
+        self.dots.resize(self.dots.width() + 10, self.dots.height())
+        self.dots.grab()
+        self.assertEqual(self.dots._static_layer.width(), self.dots.width())
+
+    def test_no_glow_without_pulse_target(self):
+        self.dots.setMaximum(4)
+        self.dots.setBreaks([])
+        self.dots.setValue(2)
+        self.dots.grab()
+        self.assertTrue(self.dots._glow_rect.isEmpty())
+        self.assertFalse(self.dots.isPulsing())
+
+    def test_row_break_pulses(self):
+        self.dots.setMaximum(0)
+        self.dots.setValue(1)
+        self.dots.grab()
+        self.assertFalse(self.dots._glow_rect.isEmpty())
+        self.assertTrue(self.dots.isPulsing())
+        # An endless break pulse repaints at 20 Hz, not every frame
+        self.dots._clock.tick()
+        self.assertEqual(self.dots._clock._frame_timer.interval(), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+"""
+Tests for gesturesesh.duplicates: perceptual hashes, the hash cache,
+near-duplicate grouping and the setup window's Remove duplicates.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import duplicates
+from gesturesesh.duplicates import (
+    EDGE_BYTES,
+    DuplicateScanSignals,
+    DuplicateScanTask,
+    HashCache,
+    exact_duplicate_groups,
+    find_duplicates,
+    group_near_duplicates,
+    hash_files,
+    hash_image,
+    near_pairs,
+)
+from gesturesesh.main import MainApp
+
+
+def _picture(seed, size=256):
+    """A smooth random image, so hashes have structure to work with."""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    return cv2.resize(noise, (size, size), interpolation=cv2.INTER_CUBIC)
+
+
+def _distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class TestHashes(unittest.TestCase):
+    def test_resized_and_reencoded_copies_hash_close(self):
+        image = _picture(1)
+        smaller = cv2.resize(image, (100, 100), interpolation=cv2.INTER_AREA)
+        _, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 40])
+        reencoded = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+        original = hash_image(image)
+        limit = duplicates.NEAR_DUPLICATE_DISTANCE
+        for copy in (smaller, reencoded):
+            dhash, phash = hash_image(copy)
+            self.assertLessEqual(_distance(original[0], dhash), 2 * limit)
+            self.assertLessEqual(_distance(original[1], phash), limit)
+
+    def test_different_pictures_hash_apart(self):
+        for a, b in zip(hash_image(_picture(1)), hash_image(_picture(2))):
+            self.assertGreater(_distance(a, b), 10)
+
+
+class TestSearch(unittest.TestCase):
+    def test_near_pairs_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        hashes = rng.integers(0, 2**63, 300, dtype=np.uint64) * np.uint64(2)
+        hashes[200:250] = hashes[:50] ^ np.uint64(0b1101)  # 3 bits apart
+        for distance in (0, 3, 6):
+            expected = {
+                (i, j)
+                for i in range(len(hashes))
+                for j in range(i + 1, len(hashes))
+                if _distance(int(hashes[i]), int(hashes[j])) <= distance
+            }
+            found = {tuple(map(int, pair)) for pair in near_pairs(hashes, distance)}
+            self.assertEqual(found, expected)
+
+    def test_groups_need_both_hashes_close(self):
+        hashes = [
+            (0b1111, 0b1111),
+            None,
+            (0b0000, 0b0111),  # 4 dHash bits, 1 pHash bit from the first
+            (0b1111, 0xFFFF << 40),  # same dHash, far pHash
+            (0xFF << 8, 0b1111),  # same pHash, far dHash
+            (0b1111, 0b1111),  # identical to the first
+        ]
+        self.assertEqual(group_near_duplicates(hashes, distance=2), [[0, 2, 5]])
+
+    def test_groups_are_transitive_and_keep_order(self):
+        hashes = [(0, 0b0000), (0, 0b0111), (0, 0b0011), (0, 0b0001)]
+        self.assertEqual(group_near_duplicates(hashes, distance=1), [[0, 1, 2, 3]])
+
+
+class TestFiles(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _write(self, name, image):
+        path = os.path.join(self.dir, name)
+        cv2.imwrite(path, image)
+        return path
+
+    def test_find_duplicates_across_folders_and_formats(self):
+        image = _picture(5)
+        os.mkdir(os.path.join(self.dir, "other"))
+        paths = [
+            self._write("a.png", image),
+            self._write("b.png", _picture(6)),
+            self._write(os.path.join("other", "a.jpg"), cv2.resize(image, (128, 128))),
+            os.path.join(self.dir, "missing.png"),
+        ]
+        with open(os.path.join(self.dir, "broken.png"), "wb") as f:
+            f.write(b"not an image")
+        paths.append(os.path.join(self.dir, "broken.png"))
+        self.assertEqual(find_duplicates(paths, workers=1), [[paths[0], paths[2]]])
+
+    def test_cache_skips_unchanged_files(self):
+        path = self._write("a.png", _picture(7))
+        with HashCache(os.path.join(self.dir, "cache", "hashes.sqlite3")) as cache:
+            first = hash_files([path], cache, workers=1)
+            with patch.object(duplicates, "hash_file") as hash_file:
+                self.assertEqual(hash_files([path], cache, workers=1), first)
+                hash_file.assert_not_called()
+            # An edited file is hashed again
+            self._write("a.png", _picture(8))
+            os.utime(path, ns=(0, 10**9))
+            self.assertNotEqual(hash_files([path], cache, workers=1), first)
+
+    def test_process_pool_is_spawned(self):
+        # hash_files runs on a Qt pool thread; forking that process is unsafe
+        paths = [
+            self._write(f"{index}.png", _picture(index, size=32))
+            for index in range(duplicates.POOL_MIN_FILES)
+        ]
+        with patch.object(
+            duplicates, "ProcessPoolExecutor", wraps=duplicates.ProcessPoolExecutor
+        ) as pool:
+            hashes = hash_files(paths, workers=2)
+        self.assertEqual(pool.call_args.kwargs["mp_context"].get_start_method(), "spawn")
+        self.assertEqual(hashes, hash_files(paths, workers=1))
+
+    def test_scan_task_emits_none_on_unexpected_error(self):
+        signals = DuplicateScanSignals()
+        results = []
+        signals.finished.connect(lambda *args: results.append(args))
+        task = DuplicateScanTask(
+            [], 4, signals, cache_path=os.path.join(self.dir, "hashes.sqlite3")
+        )
+        with patch.object(duplicates, "find_duplicates", side_effect=IndexError("bug")):
+            task.run()
+        self.assertEqual(results, [(4, None)])
+
+
+class TestExactDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_groups_identical_contents(self):
+        big = os.urandom(4 * EDGE_BYTES)
+        # Same size and same ends as big, different middle
+        middle = big[:EDGE_BYTES] + os.urandom(2 * EDGE_BYTES) + big[-EDGE_BYTES:]
+        paths = [
+            self._write("a.jpg", big),
+            self._write("b.jpg", b"small"),
+            self._write("c.jpg", middle),
+            self._write("d.jpg", big),
+            self._write("e.jpg", b"small"),
+            self._write("f.jpg", b"other"),
+            os.path.join(self.dir, "missing.jpg"),
+        ]
+        self.assertEqual(exact_duplicate_groups(paths), [[0, 3], [1, 4]])
+
+    def test_reads_only_what_it_must(self):
+        big = os.urandom(4 * EDGE_BYTES)
+        paths = [
+            self._write("a.jpg", big),
+            self._write("b.jpg", big[:-1] + bytes([big[-1] ^ 1])),  # tail differs
+            self._write("c.jpg", os.urandom(100)),  # unique size
+        ]
+        link = os.path.join(self.dir, "link.jpg")
+        os.link(paths[2], link)
+        paths.append(link)
+        with patch.object(duplicates, "edge_digest", wraps=duplicates.edge_digest) as edge, \
+             patch.object(duplicates, "full_digest") as full:
+            self.assertEqual(exact_duplicate_groups(paths), [[2, 3]])
+        self.assertEqual(sorted(call.args[0] for call in edge.call_args_list), paths[:2])
+        full.assert_not_called()
+
+    def test_exact_copies_are_not_decoded(self):
+        data = cv2.imencode(".png", _picture(9))[1].tobytes()
+        paths = [self._write("a.png", data), self._write("b.png", data)]
+        with patch.object(duplicates, "hash_file", wraps=duplicates.hash_file) as hash_file:
+            self.assertEqual(find_duplicates(paths, workers=1), [paths])
+        hash_file.assert_called_once_with(paths[0])
+        self.assertEqual(find_duplicates(paths, near=False), [paths])
+
+
+class TestRemoveDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        home = patch.dict(os.environ, {"HOME": self.dir, "APPDATA": self.dir})
+        home.start()
+        self.addCleanup(home.stop)
+        image = _picture(9)
+        self.files = []
+        for name, picture in (
+            ("a.png", image),
+            ("copy.png", image),
+            ("small.png", cv2.resize(image, (128, 128))),
+        ):
+            path = os.path.join(self.dir, name)
+            cv2.imwrite(path, picture)
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _remove_dupes(self, config):
+        window = MainApp()
+        self.addCleanup(window.close)
+        window.config.update(config)
+        window.selection["files"] = list(self.files)
+        window.remove_dupes()
+        window.dupe_pool.waitForDone()
+        app.processEvents()
+        return window.selection["files"]
+
+    def test_near_duplicates_by_default(self):
+        self.assertEqual(self._remove_dupes({}), self.files[:1])
+
+    def test_exact_copies_only(self):
+        with patch.object(duplicates, "hash_files") as hash_files:
+            files = self._remove_dupes({"near_duplicates": False})
+        self.assertEqual(files, [self.files[0], self.files[2]])
+        hash_files.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -25,7 +25,7 @@ from gesturesesh.ui.session_display import Ui_session_display
 def mock_main_app_setup_ui(self, main_window):
     self.selected_items = MagicMock(spec=QtWidgets.QTextEdit)
     self.preset_loader_box = MagicMock(spec=QtWidgets.QComboBox)
-    self.entry_table = MagicMock(spec=QtWidgets.QTableWidget)
+    self.entry_table = MagicMock(spec=QtWidgets.QTableView)
     self.total_table = MagicMock(spec=QtWidgets.QTableWidget)
     self.randomize_selection = MagicMock(spec=QtWidgets.QPushButton)
     self.set_number_of_images = MagicMock(spec=QtWidgets.QSpinBox)
@@ -374,17 +374,21 @@ class TestMainAppLogic(unittest.TestCase):
             assert set(result["invalid_files"]) == {invalid_txt}
 
 
-    def test_randomize_items_preserves_multiset(self):
-        """randomize_items must keep the exact multiset of files."""
+    def test_randomized_playlist_preserves_multiset(self):
+        """A shuffled playlist keeps the exact multiset of files and leaves the selection alone."""
         items = [f"img_{i}.jpg" for i in range(10)]
         self.app.selection["files"] = items.copy()
-        self.app.randomize_items()
+        self.app.session_schedule = [ScheduleEntry(images=10, time=30)]
+        self.app.randomize_selection.isChecked.return_value = True
+        playlist = self.app.build_playlist()
 
-        assert Counter(self.app.selection["files"]) == Counter(items)
+        assert Counter(playlist) == Counter(items)
+        assert self.app.selection["files"] == items
 
 
-    def test_insert_and_remove_breaks(self):
-        """insert_breaks should add sentinel, remove_breaks should clean it."""
+    def test_playlist_breaks_and_remove_breaks(self):
+        """The playlist shows break slots without touching the selection;
+        remove_breaks cleans sentinels left in older saved selections."""
         self.app.session_schedule = [
             ScheduleEntry(images=2, time=30),
             ScheduleEntry(images=0, time=60),
@@ -392,10 +396,13 @@ class TestMainAppLogic(unittest.TestCase):
         ]
         self.app.has_break = True
         self.app.selection["files"] = ["a.jpg", "b.jpg", "c.jpg"]
+        self.app.randomize_selection.isChecked.return_value = False
 
-        self.app.insert_breaks()
-        assert ":/break/break.png" in self.app.selection["files"]
+        playlist = self.app.build_playlist()
+        assert list(playlist) == ["a.jpg", "b.jpg", ":/break/break.png", "c.jpg"]
+        assert ":/break/break.png" not in self.app.selection["files"]
 
+        self.app.selection["files"].insert(1, ":/break/break.png")
         self.app.remove_breaks()
         assert ":/break/break.png" not in self.app.selection["files"]
 
@@ -409,12 +416,68 @@ class TestMainAppLogic(unittest.TestCase):
         assert self.app.status_messages[0].text == "first"
         assert self.app.status_messages[-1].text == "second"
 
+    def test_status_identical_messages_coalesce(self):
+        """Repeating a visible message bumps its count instead of adding a line."""
+        self.app.status_messages.clear()
+        self.app.show_temporary_status("No duplicates found")
+        self.app.show_temporary_status("other")
+        self.app.show_temporary_status("No duplicates found")
+
+        texts = [m.display_text for m in self.app.status_messages]
+        assert texts == ["other", "No duplicates found (×2)"]
+
+    def test_status_keyed_message_supersedes(self):
+        """A message with the same key replaces the earlier text in place."""
+        self.app.status_messages.clear()
+        for count in (10, 20, 30):
+            self.app.show_temporary_status(f"{count} file(s) added!", key="files-added")
+
+        assert len(self.app.status_messages) == 1
+        assert self.app.status_messages[0].display_text == "30 file(s) added!"
+
+    def test_status_queue_is_bounded(self):
+        """A burst of distinct messages collapses into a summary line."""
+        self.app.status_messages.clear()
+        for i in range(50):
+            self.app.show_temporary_status(f"message {i}")
+
+        limit = self.app.MAX_STATUS_MESSAGES
+        assert len(self.app.status_messages) == limit + 1
+        assert self.app.status_messages[-1].text == "message 49"
+        summary = self.app.status_messages[0]
+        assert summary is self.app.status_overflow
+        assert summary.text == f"+{50 - limit} earlier messages"
+
+    def test_plan_preset_loads_and_stays_compact(self):
+        """A plan preset expands into the schedule and is saved back as the plan."""
+        plan = "breaks(5m, 2*(ladder(30s, 1m, 1m)))"
+        self.app.presets = {"Ladder": plan}
+        self.app.preset_names = ["Ladder"]
+        self.app.config = {}
+        self.app.config_path = Path(self.test_dir) / "config.json"
+        self.app.preset_loader_box.currentText.return_value = "Ladder"
+        self.app.total_table.rowCount.return_value = 1
+        self.app.load()
+        self.assertEqual(
+            self.app.schedule_model.entries(),
+            [ScheduleEntry(2, 30), ScheduleEntry(1, 60), ScheduleEntry(0, 300),
+             ScheduleEntry(2, 30), ScheduleEntry(1, 60)],
+        )
+        with patch("gesturesesh.main.save_config"):
+            MainApp.save(self.app, wait_status=False)
+        self.assertEqual(self.app.presets["Ladder"], plan)
+        # Once edited, the expanded rows are saved instead
+        self.app.schedule_model.remove_rows(0)
+        with patch("gesturesesh.main.save_config"):
+            MainApp.save(self.app, wait_status=False)
+        self.assertEqual(self.app.presets["Ladder"][0], ["1", "1", "60"])
+
 
     def test_start_session_calls_submethods(self):
         """Smoke‑test the orchestration inside start_session."""
         with patch.object(self.app, "grab_schedule") as grab_schedule, \
              patch.object(self.app, "is_valid_session", return_value=True) as is_valid, \
-             patch.object(self.app, "insert_breaks") as insert_breaks, \
+             patch.object(self.app, "build_playlist") as build_playlist, \
              patch.object(self.app, "save_to_recent") as save_recent, \
              patch.object(self.app, "save") as save_preset, \
              patch("gesturesesh.main.SessionDisplay", autospec=True) as Display:
@@ -432,7 +495,7 @@ class TestMainAppLogic(unittest.TestCase):
 
             grab_schedule.assert_called_once()
             is_valid.assert_called_once()
-            insert_breaks.assert_called_once()
+            build_playlist.assert_called_once()
             save_recent.assert_called_once()
             save_preset.assert_called_once()
             Display.assert_called_once()
@@ -0,0 +1,195 @@
+"""
+Tests for grid slots: several images per slot in the schedule and plans,
+the playlist, and gesturesesh.grid's parallel decode into one composite.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import grid
+from gesturesesh.grid import compose, decode_grid, layout, reduce_for
+from gesturesesh.main import SessionDisplay
+from gesturesesh.playlist import BREAK_IMAGE, Playlist
+from gesturesesh.schedule import (
+    ScheduleEntry,
+    ScheduleModel,
+    preset_entries,
+    schedule_totals,
+)
+from gesturesesh.schedule_plan import PlanError, expand_plan
+
+# gesturesesh.main is also the name of the entry-point function
+session_module = sys.modules["gesturesesh.main"]
+
+
+class TestGridSchedule(unittest.TestCase):
+    def test_plan(self):
+        entries = expand_plan("1x30s, breaks(5m, grid(2, 3x1m, 2x2m))")
+        self.assertEqual(
+            entries,
+            [
+                ScheduleEntry(1, 30),
+                ScheduleEntry(3, 60, 2),
+                ScheduleEntry(0, 300),
+                ScheduleEntry(2, 120, 2),
+            ],
+        )
+        self.assertEqual(schedule_totals(entries), (1 + 6 + 4, 30 + 180 + 300 + 240))
+        for plan in ("grid(5, 1x1m)", "grid(1, 1x1m)", "grid(2)"):
+            with self.assertRaises(PlanError):
+                expand_plan(plan)
+
+    def test_model_and_presets(self):
+        model = ScheduleModel()
+        model.append([ScheduleEntry(3, 60, 2), ScheduleEntry(1, 30)])
+        self.assertEqual(model.total_images, 7)
+        index = model.index(0, ScheduleModel.IMAGES)
+        self.assertEqual(model.data(index), "3 (2 per slot)")
+        self.assertEqual(model.data(index, Qt.EditRole), 3)
+        model.setData(index, 4)
+        self.assertEqual(model.total_images, 9)
+        preset = model.to_preset()
+        self.assertEqual(preset[0], ["1", "4", "60", "2"])
+        self.assertEqual(preset[1], ["2", "1", "30"])
+        self.assertEqual(preset_entries(preset), model.entries())
+        model.remove_rows(0)
+        self.assertEqual(model.total_images, 1)
+
+
+class TestGridPlaylist(unittest.TestCase):
+    def setUp(self):
+        self.schedule = [
+            ScheduleEntry(1, 30),
+            ScheduleEntry(2, 60, 3),
+            ScheduleEntry(0, 60),
+            ScheduleEntry(1, 30),
+        ]
+
+    def test_slots_take_several_images(self):
+        playlist = Playlist(list("abcdefghij"), self.schedule)
+        slots = [playlist.slot_files(slot) for slot in range(len(playlist))]
+        self.assertEqual(
+            slots,
+            [["a"], ["b", "c", "d"], ["e", "f", "g"], [BREAK_IMAGE], ["h"], ["i"], ["j"]],
+        )
+        self.assertEqual(playlist[1], "b")
+        self.assertTrue(playlist.is_break(3))
+        # Too few files for the last grid slot: it shows what there is
+        short = Playlist(list("abcde"), self.schedule)
+        self.assertEqual(len(short), 4)
+        self.assertEqual(short.slot_files(2), ["e"])
+
+    def test_skip_replaces_the_whole_slot(self):
+        files = [f"{i}.jpg" for i in range(12)]
+        playlist = Playlist(files, self.schedule, shuffle=True)
+        before = playlist.slot_files(1)
+        self.assertTrue(playlist.skip(1))
+        after = playlist.slot_files(1)
+        self.assertFalse(set(before) & set(after))
+        shown = [path for slot in range(len(playlist)) for path in playlist.slot_files(slot)]
+        self.assertEqual(sorted(p for p in shown if p != BREAK_IMAGE), sorted(files))
+
+
+class TestComposite(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _image(self, name, width, height, color):
+        path = os.path.join(self.dir, name)
+        cv2.imwrite(path, np.full((height, width, 3), color, np.uint8))
+        return path
+
+    def test_layout(self):
+        # Same height in a row, fitted to the width
+        self.assertEqual(layout([(400, 300), (300, 600)], 1000, 1000), [(721, 541), (270, 541)])
+        # Two rows for four; never taller than the row's tallest image
+        shown = layout([(100, 50)] * 4, 1920, 1080)
+        self.assertEqual(shown, [(100, 50)] * 4)
+        self.assertEqual(reduce_for((4000, 3000), (900, 600)), 4)
+        self.assertEqual(reduce_for((4000, 3000), (3000, 2000)), 1)
+        self.assertEqual(reduce_for(None, (10, 10)), 1)
+
+    def test_compose(self):
+        red = np.full((60, 80, 3), (0, 0, 255), np.uint8)
+        gray = np.full((60, 40), 200, np.uint8)
+        canvas = compose([red, gray, None], 1000, 1000, gap=10)
+        self.assertEqual(canvas.shape, (60, 80 + 10 + 40 + 10 + 80, 3))
+        self.assertEqual(tuple(canvas[30, 40]), (0, 0, 255))
+        self.assertEqual(tuple(canvas[30, 110]), (200, 200, 200))
+        self.assertEqual(tuple(canvas[30, 85]), grid.BACKGROUND)
+        self.assertEqual(tuple(canvas[30, 170]), grid.BACKGROUND)  # failed image
+        self.assertIsNone(compose([None, None], 100, 100))
+
+    def test_decode_grid_reduces_in_parallel(self):
+        paths = [
+            self._image("big.png", 1600, 1200, (255, 0, 0)),
+            self._image("small.png", 200, 300, (0, 255, 0)),
+        ]
+        with patch.object(grid, "decode_file", wraps=grid.decode_file) as decode:
+            canvas = decode_grid(paths, 400, 400)
+        self.assertEqual(sorted(call.args[1] for call in decode.call_args_list), [1, 4])
+        self.assertLessEqual(canvas.shape[1], 400)
+        self.assertLessEqual(canvas.shape[0], 400)
+
+
+class TestGridSession(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.files = []
+        for index, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+            path = os.path.join(self.dir, f"{index}.png")
+            cv2.imwrite(path, np.full((90, 120, 3), color, np.uint8))
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_composite_is_cached_and_modified_as_a_unit(self):
+        with patch.object(
+            session_module, "decode_grid", wraps=session_module.decode_grid
+        ) as decode:
+            display = SessionDisplay(
+                schedule=[ScheduleEntry(1, 60, 2), ScheduleEntry(1, 60)],
+                items=self.files,
+                total=2,
+            )
+            self.addCleanup(display.close)
+            self.assertEqual(display.source_path, tuple(self.files[:2]))
+            composite = display.source_image
+            self.assertEqual(composite[45, 10].tolist(), [255, 0, 0])
+            self.assertEqual(composite[45, -10].tolist(), [0, 255, 0])
+            display.grayscale()
+            unflipped = display.apply_image_mods(composite)
+            display.flip_horizontal()
+            self.assertIs(display.source_image, composite)
+            # The flip mirrors the whole composite, not each image in place
+            flipped = display.apply_image_mods(composite)
+            self.assertTrue(np.array_equal(flipped, unflipped[:, ::-1]))
+            self.assertEqual(unflipped.ndim, 2)
+            display.load_next_image()
+            self.assertEqual(display.source_path, self.files[2])
+        self.assertEqual(decode.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Tests for gesturesesh.image_loader: EXIF thumbnail extraction, previews,
+memory-mapped reads and generation-tagged background decodes.
+"""
+
+import os
+import sys
+import mmap
+import struct
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import image_loader
+from gesturesesh.image_loader import (
+    DecodeSignals,
+    DecodeTask,
+    decode_file,
+    decode_pool,
+    decode_preview,
+    mapped_file,
+    read_exif_thumbnail,
+)
+from gesturesesh.main import SessionDisplay
+from gesturesesh.schedule import ScheduleEntry
+
+# gesturesesh.main is also the name of the entry-point function
+session_module = sys.modules["gesturesesh.main"]
+
+
+def exif_jpeg(main, thumb, orientation=1):
+    """Encode *main* as JPEG with *thumb* embedded as the EXIF thumbnail."""
+    thumb_bytes = cv2.imencode(".jpg", thumb)[1].tobytes()
+    # Little-endian TIFF: header, IFD0 (orientation), IFD1 (thumbnail)
+    ifd0 = 8
+    ifd1 = ifd0 + 2 + 12 + 4
+    thumb_offset = ifd1 + 2 + 2 * 12 + 4
+    tiff = b"II*\0" + struct.pack("<I", ifd0)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHIHH", 0x0112, 3, 1, orientation, 0)
+    tiff += struct.pack("<I", ifd1)
+    tiff += struct.pack("<H", 2)
+    tiff += struct.pack("<HHII", 0x0201, 4, 1, thumb_offset)
+    tiff += struct.pack("<HHII", 0x0202, 4, 1, len(thumb_bytes))
+    tiff += struct.pack("<I", 0) + thumb_bytes
+    app1 = b"Exif\0\0" + tiff
+    segment = b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1
+    body = cv2.imencode(".jpg", main)[1].tobytes()
+    return body[:2] + segment + body[2:]
+
+
+class TestExifThumbnail(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.main = np.full((400, 600, 3), 200, np.uint8)
+        self.thumb = np.full((40, 60, 3), 50, np.uint8)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_read_exif_thumbnail(self):
+        data = exif_jpeg(self.main, self.thumb, orientation=6)
+        thumbnail, orientation = read_exif_thumbnail(data)
+        self.assertEqual(orientation, 6)
+        self.assertTrue(thumbnail.startswith(b"\xff\xd8"))
+
+    def test_no_exif(self):
+        data = cv2.imencode(".jpg", self.main)[1].tobytes()
+        self.assertEqual(read_exif_thumbnail(data), (None, 1))
+        self.assertEqual(read_exif_thumbnail(b"not a jpeg"), (None, 1))
+
+    def test_preview_uses_thumbnail_with_orientation(self):
+        path = os.path.join(self.test_dir, "big.jpg")
+        with open(path, "wb") as f:
+            f.write(exif_jpeg(self.main, self.thumb, orientation=6))
+        preview = decode_preview(path)
+        # Rotated 90 degrees, so width and height swap
+        self.assertEqual(preview.shape[:2], (60, 40))
+
+    def test_preview_falls_back_to_reduced_decode(self):
+        path = os.path.join(self.test_dir, "plain.jpg")
+        cv2.imwrite(path, self.main)
+        self.assertEqual(decode_preview(path).shape[:2], (50, 75))
+
+    def test_no_preview_for_png(self):
+        path = os.path.join(self.test_dir, "plain.png")
+        cv2.imwrite(path, self.main)
+        self.assertIsNone(decode_preview(path))
+
+
+class TestMappedFile(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_decode_from_mapped_file(self):
+        path = os.path.join(self.test_dir, "map.png")
+        cv2.imwrite(path, np.full((12, 16, 4), 77, np.uint8))
+        image = decode_file(path)
+        self.assertEqual(image.shape, (12, 16, 4))
+        # The map is closed on exit, so the file can be replaced right away
+        os.replace(path, path + ".old")
+
+    def test_mapped_file_is_not_copied(self):
+        path = os.path.join(self.test_dir, "data.bin")
+        with open(path, "wb") as f:
+            f.write(b"abc" * 100)
+        with mapped_file(path) as data:
+            self.assertIsInstance(data, mmap.mmap)
+            self.assertEqual(data[:3], b"abc")
+
+    def test_empty_file_falls_back_to_bytes(self):
+        path = os.path.join(self.test_dir, "empty.png")
+        open(path, "wb").close()
+        with mapped_file(path) as data:
+            self.assertEqual(data, b"")
+        self.assertIsNone(decode_file(path))
+
+    def test_missing_resource_raises(self):
+        with self.assertRaises(OSError):
+            with mapped_file(":/missing/none.png"):
+                pass
+
+
+class TestDecodeTask(unittest.TestCase):
+    def test_result_carries_generation(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "full.png")
+            cv2.imwrite(path, np.zeros((30, 20, 3), np.uint8))
+            signals = DecodeSignals()
+            results = []
+            signals.finished.connect(lambda *args: results.append(args))
+            DecodeTask(path, 7, signals).run()
+        generation, result_path, cvimage = results[0]
+        self.assertEqual((generation, result_path), (7, path))
+        self.assertEqual(cvimage.shape[:2], (30, 20))
+
+    def test_unexpected_error_emits_none(self):
+        signals = DecodeSignals()
+        results = []
+        signals.finished.connect(lambda *args: results.append(args))
+        with patch.object(image_loader, "decode_file", side_effect=IndexError("bug")):
+            DecodeTask("bad.psd", 3, signals).run()
+        self.assertEqual(results, [(3, "bad.psd", None)])
+
+
+class TestProgressiveSession(unittest.TestCase):
+    def test_large_png_decodes_off_the_ui_thread(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir, ignore_errors=True)
+        path = os.path.join(tempdir, "large.png")
+        cv2.imwrite(path, np.full((400, 640, 3), 200, np.uint8))
+        threads = []
+
+        def decode(path, reduce=1):
+            threads.append(threading.current_thread())
+            return decode_file(path, reduce)
+
+        with patch.object(image_loader, "PROGRESSIVE_MIN_BYTES", 0), patch.object(
+            image_loader, "decode_file", decode
+        ), patch.object(session_module, "decode_file", decode):
+            display = SessionDisplay(
+                schedule=[ScheduleEntry(1, 60)], items=[path], total=1
+            )
+            self.addCleanup(display.close)
+            # A placeholder of the image's shape until the decode lands
+            self.assertTrue(display.source_is_preview)
+            self.assertEqual(display.source_image.shape[:2], (400, 640))
+            size = display.size()
+            # The decode lands while the user is dragging the window
+            display.resize_settle_timer.start()
+            decode_pool().waitForDone()
+            app.processEvents()
+            # The full image drops in without resizing the window, shown
+            # by the settle rescale
+            self.assertEqual(display.size(), size)
+            self.assertEqual(display.image.width(), 640)
+            self.assertTrue(display.resize_settle_timer.isActive())
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertEqual(len(threads), 1)
+        self.assertFalse(display.source_is_preview)
+        self.assertEqual(display.source_image.shape[:2], (400, 640))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Tests for gesturesesh.instance and the requests the running instance
+carries out: hand-off from later launches and remote session commands.
+"""
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QDir
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import cli
+from gesturesesh.instance import InstanceServer, send_message
+
+
+class TestInstanceServer(unittest.TestCase):
+    def setUp(self):
+        self.name = f"gesturesesh-test-{os.getpid()}-{id(self)}"
+        self.requests = []
+        self.server = InstanceServer(self._handler, self.name)
+        self.addCleanup(self.server.close)
+
+    def _handler(self, message):
+        self.requests.append(message)
+        if message["cmd"] == "fail":
+            raise ValueError("no session is running")
+        if message["cmd"] == "crash":
+            raise IndexError("list index out of range")
+        return f"did {message['cmd']}"
+
+    def _send(self, message):
+        """Sends from another thread while this one serves the request."""
+        replies = []
+        client = threading.Thread(
+            target=lambda: replies.append(send_message(message, self.name))
+        )
+        client.start()
+        while client.is_alive():
+            app.processEvents()
+            client.join(0.005)
+        return replies[0]
+
+    def test_requests_and_replies(self):
+        self.assertTrue(self.server.listen())
+        self.assertEqual(self._send({"cmd": "next"}), {"ok": True, "message": "did next"})
+        self.assertEqual(
+            self._send({"cmd": "fail"}), {"ok": False, "error": "no session is running"}
+        )
+        self.assertEqual(self._send({"cmd": "ping"})["ok"], True)
+        self.assertEqual([r["cmd"] for r in self.requests], ["next", "fail"])
+
+    def test_malformed_requests(self):
+        self.assertFalse(self.server.handle(b"next\n")["ok"])
+        self.assertFalse(self.server.handle(b'["next"]\n')["ok"])
+        self.assertFalse(self.server.handle(b'{"cmd": 3}\n')["ok"])
+        self.assertEqual(self.requests, [])
+
+    def test_unexpected_errors_are_replies(self):
+        self.assertEqual(
+            self.server.handle(b'{"cmd": "crash"}\n'),
+            {"ok": False, "error": "crash failed: list index out of range"},
+        )
+
+    def test_nobody_listening(self):
+        self.assertIsNone(send_message({"cmd": "next"}, self.name))
+
+    def test_second_server_defers_to_the_first(self):
+        self.assertTrue(self.server.listen())
+        replies = []
+        client = threading.Thread(
+            target=lambda: replies.append(InstanceServer(self._handler, self.name).listen())
+        )
+        client.start()
+        while client.is_alive():
+            app.processEvents()
+            client.join(0.005)
+        self.assertEqual(replies, [False])
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+    def test_stale_socket_is_replaced(self):
+        # What a crashed instance leaves behind: a socket file nobody serves
+        path = os.path.join(QDir.tempPath(), self.name)
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(path)
+        stale.close()
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        self.assertTrue(self.server.listen())
+        self.assertEqual(self._send({"cmd": "next"})["ok"], True)
+
+
+class TestRemoteControl(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        for index in range(3):
+            cv2.imwrite(
+                os.path.join(self.dir, f"{index}.png"),
+                rng.integers(0, 256, (30, 40, 3), dtype=np.uint8),
+            )
+        self.control = cli.RemoteControl()
+        self.addCleanup(self._close_sessions)
+
+    def _close_sessions(self):
+        for session in cli.open_sessions():
+            session.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _open(self, **fields):
+        args = cli.build_parser().parse_args(["--folders", self.dir, "--plan", "3x1m"])
+        message = cli.open_message(args)
+        message.update(fields)
+        return self.control.handle(message)
+
+    def test_open_starts_a_session_and_commands_drive_it(self):
+        self.assertEqual(self._open(), "")
+        session = self.control.active_session()
+        self.assertIsNotNone(session)
+        self.assertEqual(session.playlist_position, 0)
+        self.control.handle({"cmd": "next"})
+        self.assertEqual(session.playlist_position, 1)
+        seconds = session.time_seconds
+        self.control.handle({"cmd": "+30s"})
+        self.assertEqual(session.time_seconds, seconds + 30)
+        self.control.handle({"cmd": "pause"})
+        self.assertFalse(session.timer.isActive())
+        with self.assertRaisesRegex(ValueError, "unknown command 'dance'"):
+            self.control.handle({"cmd": "dance"})
+
+    def test_a_new_open_replaces_the_session(self):
+        self._open()
+        first = self.control.active_session()
+        self._open(plan="2x30s")
+        self.assertEqual(cli.open_sessions(), [self.control.active_session()])
+        self.assertIsNot(self.control.active_session(), first)
+
+    def test_bad_requests(self):
+        with self.assertRaisesRegex(ValueError, "no session is running"):
+            self.control.handle({"cmd": "next"})
+        with self.assertRaisesRegex(ValueError, "only 3 found"):
+            self._open(plan="4x30s")
+        with self.assertRaisesRegex(ValueError, "invalid 'folders'"):
+            self._open(folders=self.dir)
+        self.assertEqual(cli.open_sessions(), [])
+
+    def test_open_message_makes_paths_absolute(self):
+        args = cli.build_parser().parse_args(
+            ["--folders", "refs", "--files", "a.png", "--shuffle", "--seed", "4"]
+        )
+        message = cli.open_message(args)
+        self.assertEqual(message["folders"], [os.path.abspath("refs")])
+        self.assertEqual(message["files"], [os.path.abspath("a.png")])
+        parsed = cli.args_from_message(message)
+        self.assertEqual((parsed.shuffle, parsed.seed), (True, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
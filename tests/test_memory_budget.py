@@ -0,0 +1,168 @@
+"""
+Tests for gesturesesh.memory_budget: the session's memory ceiling and how
+the session window degrades when it runs out.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.image_loader import decode_file
+from gesturesesh.main import SessionDisplay, ScheduleEntry
+from gesturesesh.ui.perf_hud import format_stats
+from gesturesesh.memory_budget import (
+    DEFAULT_BUDGET_MB,
+    MIN_BUDGET_MB,
+    MIN_FRAME_CACHE_BYTES,
+    ImagePlan,
+    MemoryBudget,
+    budget_from_config,
+)
+
+MB = 2**20
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_fitting_image_is_kept_in_full(self):
+        budget = MemoryBudget(100 * MB)
+        self.assertEqual(budget.plan_image(2000, 1500), ImagePlan())
+
+    def test_degrades_cheapest_first_as_room_runs_out(self):
+        budget = MemoryBudget(100 * MB)
+        width, height = 4000, 3000  # 12 MP: 36 MB source + 48 MB pixmap
+        screen = 1920 * 1080
+        # Full size fits in an empty budget
+        self.assertEqual(budget.plan_image(width, height, 3, screen), ImagePlan())
+        # Frames take 30 MB: the pixmap drops to screen size first
+        budget.hold("frames", 30 * MB)
+        self.assertEqual(
+            budget.plan_image(width, height, 3, screen), ImagePlan(1, False)
+        )
+        # Then decodes are reduced, ever further
+        budget.hold("frames", 80 * MB)
+        self.assertEqual(
+            budget.plan_image(width, height, 3, screen), ImagePlan(2, False)
+        )
+        budget.hold("frames", 94 * MB)
+        self.assertEqual(
+            budget.plan_image(width, height, 3, screen), ImagePlan(4, False)
+        )
+        # Exhausted: the smallest decode is shown anyway
+        budget.hold("frames", 100 * MB)
+        self.assertEqual(
+            budget.plan_image(width, height, 3, screen), ImagePlan(8, False)
+        )
+
+    def test_current_image_does_not_count_against_the_next(self):
+        budget = MemoryBudget(100 * MB)
+        budget.hold("source", 36 * MB)
+        budget.hold("pixmap", 48 * MB)
+        self.assertEqual(budget.plan_image(4000, 3000), ImagePlan())
+        self.assertEqual(budget.total, 84 * MB)
+        self.assertEqual(budget.peak, 84 * MB)
+        budget.release("pixmap")
+        self.assertEqual(budget.total, 36 * MB)
+        self.assertEqual(budget.peak, 84 * MB)
+
+    def test_frame_cache_gets_what_is_left(self):
+        budget = MemoryBudget(100 * MB)
+        self.assertEqual(budget.frame_cache_bytes(20 * MB), 20 * MB)
+        budget.hold("source", 80 * MB)
+        self.assertEqual(budget.frame_cache_bytes(20 * MB), 10 * MB)
+        budget.hold("source", 100 * MB)
+        self.assertEqual(budget.frame_cache_bytes(20 * MB), MIN_FRAME_CACHE_BYTES)
+
+    def test_degradations_are_counted(self):
+        budget = MemoryBudget(MB)
+        budget.note("reduced decode", reduce=2)
+        budget.note("reduced decode", reduce=4)
+        budget.note("screen-size pixmap")
+        self.assertEqual(budget.actions["reduced decode"], 2)
+        self.assertEqual(budget.last_action, "screen-size pixmap")
+
+    def test_budget_from_config(self):
+        self.assertEqual(budget_from_config({}).limit, DEFAULT_BUDGET_MB * MB)
+        self.assertEqual(budget_from_config({"memory_budget_mb": 512}).limit, 512 * MB)
+        self.assertEqual(budget_from_config({"memory_budget_mb": 1}).limit, MIN_BUDGET_MB * MB)
+        self.assertEqual(
+            budget_from_config({"memory_budget_mb": "lots"}).limit, DEFAULT_BUDGET_MB * MB
+        )
+        for value in (float("inf"), float("-inf"), float("nan")):
+            with self.subTest(value=value):
+                self.assertEqual(
+                    budget_from_config({"memory_budget_mb": value}).limit,
+                    DEFAULT_BUDGET_MB * MB,
+                )
+
+
+class TestSessionUnderPressure(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        pixels = cv2.resize(
+            rng.integers(0, 256, (12, 16, 3), dtype=np.uint8), (400, 300)
+        )
+        self.png = os.path.join(self.dir, "a.png")
+        self.jpg = os.path.join(self.dir, "b.jpg")
+        cv2.imwrite(self.png, pixels)
+        cv2.imwrite(self.jpg, pixels)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _session(self, budget):
+        display = SessionDisplay(
+            schedule=[ScheduleEntry(2, 60)],
+            items=[self.png, self.jpg],
+            total=2,
+            memory_budget=budget,
+        )
+        self.addCleanup(display.close)
+        return display
+
+    def test_reduced_decodes(self):
+        for path in (self.png, self.jpg):  # resized after decoding / by libjpeg
+            self.assertEqual(decode_file(path, reduce=2).shape, (150, 200, 3))
+            self.assertEqual(decode_file(path, reduce=8).shape, (38, 50, 3))
+
+    def test_room_to_spare_decodes_in_full(self):
+        display = self._session(MemoryBudget(64 * MB))
+        self.assertEqual(display.source_image.shape, (300, 400, 3))
+        self.assertEqual(display.image.width(), 400)
+        self.assertFalse(display.memory.actions)
+        self.assertGreater(display.memory.held["source"], 0)
+
+    def test_exhausted_budget_reduces_decodes(self):
+        # 400x300 needs about 840 KB kept in full; a 1/2 decode fits in 300 KB
+        budget = MemoryBudget(300 * 1024)
+        display = self._session(budget)
+        self.assertEqual(display.image_plan, ImagePlan(2, False))
+        self.assertEqual(display.source_image.shape, (150, 200, 3))
+        self.assertEqual(budget.actions["reduced decode"], 1)
+        self.assertLessEqual(budget.held["source"] + budget.held["pixmap"], budget.limit)
+        # Modifiers reuse the reduced source rather than decoding again
+        display.grayscale()
+        self.assertEqual(display.source_image.shape, (150, 200, 3))
+        self.assertEqual(budget.actions["reduced decode"], 1)
+        # Pressure shows up in the performance overlay
+        self.assertTrue(
+            any("reduced decode" in line for line in format_stats(display.perf, None))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for gesturesesh.ui.mirror_view: mirror windows fed by one session
+window without decoding anything twice.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QEvent, QSize
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.main import SessionDisplay, ScheduleEntry
+
+# gesturesesh.main is also the name of the entry-point function
+session_module = sys.modules["gesturesesh.main"]
+
+
+class TestMirrorView(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.files = []
+        for index in range(2):
+            path = os.path.join(self.dir, f"{index}.png")
+            cv2.imwrite(path, rng.integers(0, 256, (300, 400, 3), dtype=np.uint8))
+            self.files.append(path)
+        self.display = SessionDisplay(
+            schedule=[ScheduleEntry(2, 60)], items=self.files, total=2
+        )
+        self.addCleanup(self.display.close)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_mirrors_share_the_session_pixmap(self):
+        with patch.object(
+            session_module, "decode_file", wraps=session_module.decode_file
+        ) as decode:
+            self.display.toggle_mirrors()
+            self.assertEqual(len(self.display.mirrors), 1)  # one screen here
+            mirror = self.display.mirrors[0]
+            self.assertEqual(mirror.source.cacheKey(), self.display.image.cacheKey())
+            self.display.load_next_image()
+            self.assertEqual(mirror.source.cacheKey(), self.display.image.cacheKey())
+            self.display.grayscale()
+            self.assertEqual(mirror.source.cacheKey(), self.display.image.cacheKey())
+        self.assertEqual(decode.call_count, 1)  # the second image, once
+
+    def test_each_mirror_scales_for_its_own_size(self):
+        self.display.toggle_mirrors()
+        mirror = self.display.mirrors[0]
+        mirror.showNormal()
+        mirror.resize(300, 150)
+        mirror.grab()
+        ratio = mirror.devicePixelRatioF()
+        self.assertEqual(mirror.scaled.size(), QSize(round(200 * ratio), round(150 * ratio)))
+        scaled = mirror.scaled
+        mirror.grab()
+        self.assertIs(mirror.scaled, scaled)  # repaints reuse the rescale
+        self.assertEqual(self.display.memory.held["mirror 0"], 200 * 150 * 4)
+
+    def test_toggle_and_close_remove_mirrors(self):
+        self.display.toggle_mirrors()
+        self.display.toggle_mirrors()
+        self.assertEqual(self.display.mirrors, [])
+        self.assertNotIn("mirror 0", self.display.memory.held)
+        self.display.run_remote_command("mirror")
+        self.assertEqual(len(self.display.mirrors), 1)
+        self.display.close()
+        self.assertEqual(self.display.mirrors, [])
+
+    def test_mirror_closed_from_its_window_is_dropped(self):
+        self.display.toggle_mirrors()
+        mirror = self.display.mirrors[0]
+        mirror.close()
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertEqual(self.display.mirrors, [])
+        self.assertNotIn("mirror 0", self.display.memory.held)
+        # One press opens a new mirror, fed by the session again
+        self.display.toggle_mirrors()
+        self.assertEqual(len(self.display.mirrors), 1)
+        self.assertIsNot(self.display.mirrors[0], mirror)
+        self.display.load_next_image()
+        self.assertEqual(
+            self.display.mirrors[0].source.cacheKey(), self.display.image.cacheKey()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for gesturesesh.ui.perf_hud: the session performance counters and
+their overlay.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.ui import perf_hud
+from gesturesesh.ui.perf_hud import PerfHud, PerfStats, format_stats, resident_memory
+
+
+class TestPerfStats(unittest.TestCase):
+    def test_loads_count_towards_hit_rate(self):
+        stats = PerfStats()
+        self.assertIsNone(stats.hit_rate)
+        stats.record_load("decode", 12.5)
+        stats.record_load("cache", 0.01)
+        stats.record_load("cache", 0.01)
+        stats.record_load("preview", 3.0)
+        self.assertEqual(stats.hit_rate, 0.5)
+        # Cache hits keep the last real load on show
+        self.assertEqual((stats.load_source, stats.load_ms), ("preview", 3.0))
+
+    def test_timer_drift_ignores_pauses(self):
+        stats = PerfStats()
+        stats.record_tick(10.0, 500)
+        self.assertIsNone(stats.timer_drift_ms)
+        stats.record_tick(10.52, 500)
+        self.assertAlmostEqual(stats.timer_drift_ms, 20, places=3)
+        stats.record_tick(11.01, 500)
+        self.assertAlmostEqual(stats.timer_drift_ms, -10, places=3)
+        stats.record_tick(40.0, 500)  # resumed after a pause
+        self.assertAlmostEqual(stats.timer_drift_ms, -10, places=3)
+        self.assertAlmostEqual(stats.max_timer_drift_ms, 20, places=3)
+
+    def test_format_stats(self):
+        self.assertTrue(all("–" in line for line in format_stats(PerfStats(), None)[:3]))
+        stats = PerfStats(transition_ms=41.0, pending_decodes=2)
+        stats.record_load("decode", 30.25)
+        lines = format_stats(stats, (300 * 2**20, True))
+        self.assertIn("41.0 ms", lines[0])
+        self.assertIn("30.2 ms (decode)", lines[1])
+        self.assertIn("0% of 1", lines[2])
+        self.assertIn("2", lines[3])
+        self.assertIn("300 MB peak", lines[4])
+
+    def test_resident_memory(self):
+        memory = resident_memory()
+        self.assertIsNotNone(memory)
+        self.assertGreater(memory[0], 1 << 20)
+
+
+class TestPerfHud(unittest.TestCase):
+    def setUp(self):
+        self.parent = QWidget()
+        self.parent.resize(400, 300)
+        self.stats = PerfStats()
+        self.hud = PerfHud(self.stats, self.parent)
+
+    def tearDown(self):
+        self.parent.deleteLater()
+
+    def test_hidden_until_toggled(self):
+        self.parent.show()
+        self.assertFalse(self.hud.isVisible())
+        self.hud.toggle()
+        self.assertTrue(self.hud.isVisible())
+        self.assertGreater(self.hud.width(), 0)
+        self.hud.grab()
+        self.hud.toggle()
+        self.assertFalse(self.hud.isVisible())
+
+    def test_repaints_only_when_text_changes(self):
+        self.parent.show()
+        self.hud.show()
+        with patch.object(self.hud, "update") as update, \
+             patch.object(perf_hud, "resident_memory", return_value=(1 << 20, False)):
+            self.hud.refresh()
+            self.hud.refresh()
+            self.assertEqual(update.call_count, 1)
+            self.stats.transition_ms = 5.0
+            self.hud.refresh()
+            self.assertEqual(update.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
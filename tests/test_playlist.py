@@ -0,0 +1,82 @@
+"""
+Tests for gesturesesh.playlist: break slots, the lazy shuffle and skip.
+"""
+
+import os
+import random
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.playlist import BREAK_IMAGE, Playlist
+from gesturesesh.schedule import ScheduleEntry
+
+
+class CountingList(list):
+    """A selection that records which indices were read."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads = set()
+
+    def __getitem__(self, index):
+        self.reads.add(index)
+        return super().__getitem__(index)
+
+
+class TestPlaylist(unittest.TestCase):
+    def test_break_slots_follow_the_schedule(self):
+        schedule = [
+            ScheduleEntry(2, 30),
+            ScheduleEntry(0, 60),
+            ScheduleEntry(2, 30),
+            ScheduleEntry(0, 60),
+            ScheduleEntry(0, 60),
+            ScheduleEntry(1, 30),
+        ]
+        playlist = Playlist(list("abcde"), schedule)
+        self.assertEqual(
+            list(playlist), ["a", "b", BREAK_IMAGE, "c", "d", BREAK_IMAGE, BREAK_IMAGE, "e"]
+        )
+        self.assertTrue(playlist.is_break(5))
+        self.assertEqual(playlist[-1], "e")
+        with self.assertRaises(IndexError):
+            playlist[8]
+
+    def test_selection_is_not_copied_or_modified(self):
+        files = CountingList(f"{i}.jpg" for i in range(100_000))
+        playlist = Playlist(files, [ScheduleEntry(3, 30)], shuffle=True, rng=random.Random(1))
+        self.assertEqual(files.reads, set())
+        shown = [playlist[i] for i in range(3)]
+        self.assertEqual(len(files.reads), 3)
+        self.assertEqual(list.__getitem__(files, slice(0, 3)), ["0.jpg", "1.jpg", "2.jpg"])
+        self.assertEqual(len(set(shown)), 3)
+
+    def test_shuffle_is_a_permutation(self):
+        files = [f"{i}.jpg" for i in range(50)]
+        playlist = Playlist(files, [ScheduleEntry(25, 30), ScheduleEntry(0, 60)], shuffle=True)
+        images = [path for path in playlist if path != BREAK_IMAGE]
+        self.assertEqual(Counter(images), Counter(files))
+        self.assertNotEqual(images, files)  # 1 in 50! chance of a false failure
+
+    def test_skip_swaps_in_a_later_image(self):
+        files = [f"{i}.jpg" for i in range(10)]
+        for shuffle in (False, True):
+            playlist = Playlist(files, [ScheduleEntry(10, 30)], shuffle=shuffle, rng=random.Random(3))
+            before = playlist[4]
+            earlier = playlist[:4]
+            self.assertTrue(playlist.skip(4))
+            self.assertNotEqual(playlist[4], before)
+            self.assertEqual(playlist[:4], earlier)
+            self.assertEqual(Counter(playlist), Counter(files))
+            self.assertFalse(playlist.skip(9))
+
+    def test_skip_on_break_is_refused(self):
+        playlist = Playlist(["a", "b"], [ScheduleEntry(0, 60), ScheduleEntry(2, 30)])
+        self.assertFalse(playlist.skip(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
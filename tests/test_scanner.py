@@ -0,0 +1,91 @@
+"""
+Tests for gesturesesh.scanner: the recursive folder scan behind Open
+Folders and the command line.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.scanner import scan_folders
+
+EXTENSIONS = {".jpg", ".png"}
+
+
+class TestScanFolders(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for root, dirs, _ in os.walk(self.dir):
+            for name in dirs:
+                os.chmod(os.path.join(root, name), 0o755)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _touch(self, *parts):
+        path = os.path.join(self.dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Path(path).touch()
+        return path
+
+    def test_walk_order_and_filtering(self):
+        top = self._touch("a.jpg")
+        upper = self._touch("B.PNG")
+        self._touch("notes.txt")
+        nested = self._touch("sub", "deeper", "c.png")
+        sibling = self._touch("sub", "d.jpg")
+        result = scan_folders([self.dir], EXTENSIONS)
+        # A folder's files come before its subfolders'
+        self.assertEqual(sorted(result.files[:2]), sorted([top, upper]))
+        self.assertEqual(result.files[2:], [sibling, nested])
+        self.assertEqual(result.invalid, 1)
+        self.assertEqual(result.missing, [])
+
+    def test_missing_roots_are_reported(self):
+        file = self._touch("a.jpg")
+        missing = os.path.join(self.dir, "gone")
+        result = scan_folders([missing, file], EXTENSIONS)
+        self.assertEqual(result.files, [])
+        self.assertEqual(result.missing, [missing, file])
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "needs symlinks")
+    def test_linked_folders_are_walked_once(self):
+        image = self._touch("real", "a.jpg")
+        os.symlink(os.path.join(self.dir, "real"), os.path.join(self.dir, "zz_link"))
+        os.symlink(self.dir, os.path.join(self.dir, "real", "loop"))
+        result = scan_folders([self.dir, os.path.join(self.dir, "real")], EXTENSIONS)
+        self.assertEqual(result.files, [image])
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "needs symlinks")
+    def test_broken_links_are_invalid(self):
+        os.symlink(os.path.join(self.dir, "gone.jpg"), os.path.join(self.dir, "a.jpg"))
+        result = scan_folders([self.dir], EXTENSIONS)
+        self.assertEqual((result.files, result.invalid), ([], 1))
+
+    def test_files_are_not_stat_ed(self):
+        for index in range(20):
+            self._touch("sub", f"{index}.jpg")
+        with patch("os.stat", wraps=os.stat) as stat:
+            result = scan_folders([self.dir], EXTENSIONS)
+        self.assertEqual(len(result.files), 20)
+        # The root's isdir check, then one per folder
+        self.assertEqual(stat.call_count, 3)
+
+    @unittest.skipIf(
+        not hasattr(os, "geteuid") or os.geteuid() == 0, "root reads any folder"
+    )
+    def test_unreadable_folders_are_skipped(self):
+        image = self._touch("a.jpg")
+        self._touch("locked", "b.jpg")
+        os.chmod(os.path.join(self.dir, "locked"), 0)
+        self.assertEqual(scan_folders([self.dir], EXTENSIONS).files, [image])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for gesturesesh.schedule: the schedule table model, its running
+totals, batched updates and preset round-trips.
+"""
+
+import os
+import sys
+import unittest
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.schedule import ScheduleEntry, ScheduleModel
+
+
+class TestScheduleModel(unittest.TestCase):
+    def setUp(self):
+        self.model = ScheduleModel()
+        self.totals = []
+        self.model.totals_changed.connect(lambda images, time: self.totals.append((images, time)))
+
+    def cell(self, row, column):
+        return self.model.data(self.model.index(row, column))
+
+    def test_cells_and_headers(self):
+        self.model.append([ScheduleEntry(10, 30), ScheduleEntry(0, 120)])
+        self.assertEqual(
+            [[self.cell(r, c) for c in range(3)] for r in range(2)],
+            [["1", "10", "30"], ["2", "0", "120"]],
+        )
+        self.assertEqual(
+            [self.model.headerData(c, Qt.Horizontal) for c in range(3)],
+            ["Entry", "Number of Images", "Duration"],
+        )
+        self.assertFalse(self.model.flags(self.model.index(0, 0)) & Qt.ItemIsEditable)
+        self.assertTrue(self.model.flags(self.model.index(0, 1)) & Qt.ItemIsEditable)
+
+    def test_totals_follow_edits(self):
+        self.model.append([ScheduleEntry(10, 30), ScheduleEntry(0, 120), ScheduleEntry(1, 180)])
+        self.assertEqual((self.model.total_images, self.model.total_time), (11, 600))
+        self.assertTrue(self.model.setData(self.model.index(1, 1), "2"))  # break -> 2 images
+        self.assertEqual((self.model.total_images, self.model.total_time), (13, 720))
+        self.model.remove_rows(0)
+        self.assertEqual((self.model.total_images, self.model.total_time), (3, 420))
+        self.assertEqual(self.totals[-1], (3, 420))
+        self.assertEqual(self.cell(0, 0), "1")  # renumbered
+
+    def test_set_data_rejects_invalid_values(self):
+        self.model.append([ScheduleEntry(5, 30)])
+        self.assertFalse(self.model.setData(self.model.index(0, 1), "abc"))
+        self.assertFalse(self.model.setData(self.model.index(0, 1), "-1"))
+        self.assertFalse(self.model.setData(self.model.index(0, 2), "0"))
+        self.assertFalse(self.model.setData(self.model.index(0, 0), "7"))
+        self.assertEqual(self.model.entries(), [ScheduleEntry(5, 30)])
+
+    def test_bulk_changes_signal_once(self):
+        inserts, resets = [], []
+        self.model.rowsInserted.connect(lambda *args: inserts.append(args[1:]))
+        self.model.modelReset.connect(lambda: resets.append(True))
+        self.model.append([ScheduleEntry(1, 60)] * 1000)
+        self.assertEqual(inserts, [(0, 999)])
+        self.assertEqual(len(self.totals), 1)
+        self.model.load_preset({str(r): [str(r + 1), "2", "30"] for r in range(1000)})
+        self.assertEqual(resets, [True])
+        self.assertEqual(self.totals[-1], (2000, 60000))
+
+    def test_swap_rows_keeps_entry_numbers(self):
+        self.model.append([ScheduleEntry(1, 30), ScheduleEntry(2, 60)])
+        self.assertTrue(self.model.swap_rows(0, 1))
+        self.assertEqual([self.cell(0, c) for c in range(3)], ["1", "2", "60"])
+        self.assertFalse(self.model.swap_rows(0, -1))
+        self.assertFalse(self.model.swap_rows(1, 2))
+
+    def test_preset_round_trip(self):
+        self.model.append([ScheduleEntry(10, 30), ScheduleEntry(0, 120)])
+        preset = self.model.to_preset()
+        self.assertEqual(preset, {0: ["1", "10", "30"], 1: ["2", "0", "120"]})
+        # Config files store the row keys as strings, out of order after JSON edits
+        other = ScheduleModel()
+        other.load_preset({"1": preset[1], "0": preset[0]})
+        self.assertEqual(other.entries(), self.model.entries())
+
+    def test_bad_preset_leaves_schedule_alone(self):
+        self.model.append([ScheduleEntry(3, 30)])
+        with self.assertRaises(ValueError):
+            self.model.load_preset({"0": ["1", "x", "30"]})
+        self.assertEqual(self.model.entries(), [ScheduleEntry(3, 30)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for gesturesesh.schedule_plan: plan syntax, the ladder/pyramid/
+repeat/break generators and expansion limits.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.schedule import ScheduleEntry, schedule_totals
+from gesturesesh.schedule_plan import (
+    MAX_PLAN_ENTRIES,
+    PlanError,
+    expand_plan,
+    iter_plan,
+    parse_duration,
+)
+
+
+def pairs(entries):
+    return [(entry.images, entry.time) for entry in entries]
+
+
+class TestSchedulePlan(unittest.TestCase):
+    def test_durations(self):
+        self.assertEqual(parse_duration("45"), 45)
+        self.assertEqual(parse_duration("1m30s"), 90)
+        self.assertEqual(parse_duration("1h"), 3600)
+        with self.assertRaises(PlanError):
+            parse_duration("1x")
+
+    def test_plain_list_and_breaks(self):
+        self.assertEqual(
+            pairs(expand_plan("20x30s, break 1m30s, 10X1m")),
+            [(20, 30), (0, 90), (10, 60)],
+        )
+
+    def test_ladder_keeps_rungs_equal_length(self):
+        self.assertEqual(
+            pairs(expand_plan("ladder(30s, 10m, 10m)")),
+            [(20, 30), (10, 60), (5, 120), (2, 300), (1, 600)],
+        )
+
+    def test_pyramid(self):
+        self.assertEqual(
+            pairs(expand_plan("pyramid(10x1m, 5x2m, 2x5m)")),
+            [(10, 60), (5, 120), (2, 300), (5, 120), (10, 60)],
+        )
+
+    def test_breaks_between_blocks(self):
+        # Between rungs...
+        self.assertEqual(
+            pairs(expand_plan("breaks(1m, ladder(30s, 1m, 1m))")),
+            [(2, 30), (0, 60), (1, 60)],
+        )
+        # ...or, grouped and repeated, between whole ladders
+        self.assertEqual(
+            pairs(expand_plan("breaks(5m, 2*(ladder(30s, 1m, 1m)))")),
+            [(2, 30), (1, 60), (0, 300), (2, 30), (1, 60)],
+        )
+
+    def test_expansion_is_lazy(self):
+        entries = iter_plan("1000000*(1x1s)")
+        self.assertEqual(next(entries), ScheduleEntry(1, 1))
+        with self.assertRaises(PlanError):
+            expand_plan("1000000*(1x1s)")
+        self.assertEqual(len(expand_plan(f"{MAX_PLAN_ENTRIES}*(1x1s)")), MAX_PLAN_ENTRIES)
+
+    def test_entries_are_independent(self):
+        entries = expand_plan("pyramid(1x1m, 2x2m)")
+        entries[0].images = 9
+        self.assertEqual(entries[2].images, 1)
+
+    def test_syntax_errors(self):
+        for plan in ("", "20x", "20x30s)", "ladder(1m, 30s, 1m)", "spiral(1x1m)", "5x0s"):
+            with self.subTest(plan=plan), self.assertRaises(PlanError):
+                expand_plan(plan)
+
+    def test_schedule_totals(self):
+        entries = expand_plan("breaks(5m, 3*(ladder(30s, 10m, 10m)))")
+        self.assertEqual(schedule_totals(entries), (3 * 38, 3 * 3000 + 2 * 300))
+        self.assertEqual(schedule_totals([]), (0, 0))
+        with self.assertRaisesRegex(ValueError, "entry 2"):
+            schedule_totals([ScheduleEntry(1, 30), ScheduleEntry(-1, 30)])
+
+    def test_large_numbers_are_plan_errors(self):
+        for plan in (
+            "1x99999999999999999999s",
+            "99999999999999999999x1s",
+            "4000000000x4000000000s",
+            "10001x1s",
+            "1x25h",
+        ):
+            with self.subTest(plan=plan), self.assertRaises(PlanError):
+                expand_plan(plan)
+        self.assertEqual(pairs(expand_plan("10000x24h")), [(10000, 86400)])
+        for entries in (
+            [ScheduleEntry(10**20, 1)],
+            [ScheduleEntry(4_000_000_000, 4_000_000_000)] * 2,
+        ):
+            with self.subTest(entries=entries), self.assertRaises(ValueError):
+                schedule_totals(entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Tests for gesturesesh.snapshot: the setup window's warm-start snapshot
+and the background check of a restored selection against its folders.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.main import MainApp
+from gesturesesh.schedule import ScheduleEntry
+from gesturesesh.snapshot import (
+    HEADER,
+    Snapshot,
+    read_snapshot,
+    recent_digest,
+    reconcile,
+    snapshot_path,
+    write_snapshot,
+)
+from gesturesesh.update_checker import get_config_dir, save_config
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.images = os.path.join(self.dir, "images")
+        self.files = [self._touch("a", f"{index}.jpg") for index in range(4)]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _touch(self, *parts):
+        path = os.path.join(self.images, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Path(path).touch()
+        return path
+
+
+class TestSnapshotFile(SnapshotTestCase):
+    def test_round_trip(self):
+        path = Path(self.dir) / "snapshot.bin"
+        snapshot = Snapshot(
+            folders=[self.images],
+            files=self.files + ["/odd/na\udcffme.jpg"],  # undecodable on disk
+            schedule=[ScheduleEntry(2, 30), ScheduleEntry(0, 300), ScheduleEntry(3, 60, 2)],
+            preset_index=3,
+            randomized=True,
+            recent="abc",
+            excluded=[self.files[0]],
+        )
+        write_snapshot(path, snapshot)
+        self.assertEqual(read_snapshot(path), snapshot)
+        write_snapshot(path, Snapshot())
+        self.assertEqual(read_snapshot(path), Snapshot())
+
+    def test_unusable_files_are_ignored(self):
+        path = Path(self.dir) / "snapshot.bin"
+        self.assertIsNone(read_snapshot(path))
+        write_snapshot(path, Snapshot(files=self.files))
+        data = path.read_bytes()
+        for broken in (b"", data[:HEADER.size - 1], data[:-1], b"XXXX" + data[4:]):
+            path.write_bytes(broken)
+            self.assertIsNone(read_snapshot(path))
+
+    def test_reconcile(self):
+        added = self._touch("b", "new.png")
+        os.remove(self.files[0])
+        loose = os.path.join(self.dir, "loose.jpg")
+        Path(loose).touch()
+        gone = os.path.join(self.dir, "gone.jpg")
+        files, scanned = reconcile(
+            self.files + [loose, gone], [], [self.images], {".jpg", ".png"}
+        )
+        self.assertEqual(files, self.files[1:] + [loose, added])
+        self.assertEqual(sorted(scanned), sorted(self.files[1:] + [added]))
+
+    def test_reconcile_keeps_dropped_files_out(self):
+        copy = self._touch("b", "copy.jpg")
+        files, _ = reconcile(self.files, [copy], [self.images], {".jpg"})
+        self.assertEqual(files, self.files)
+
+    def test_digest_ignores_the_file_list(self):
+        recent = {"folders": ["a"], "files": ["x"], "recent_preset": 1, "randomized": False}
+        self.assertEqual(recent_digest(recent), recent_digest(dict(recent, files=[])))
+        self.assertNotEqual(recent_digest(recent), recent_digest(dict(recent, recent_preset=2)))
+
+
+class TestWarmStart(SnapshotTestCase):
+    def setUp(self):
+        super().setUp()
+        home = patch.dict(os.environ, {"HOME": self.dir, "APPDATA": self.dir})
+        home.start()
+        self.addCleanup(home.stop)
+        self.recent = {
+            "folders": [self.images],
+            "files": [],
+            "recent_preset": 1,
+            "randomized": True,
+        }
+        self._save_config()
+
+    def _save_config(self):
+        save_config(
+            get_config_dir() / "config.json",
+            {"recent_session": self.recent, "presets": {"One": "1x30s", "Two": "2x1m"}},
+        )
+
+    def _window(self):
+        window = MainApp()
+        window.reconcile_pool.waitForDone()
+        app.processEvents()
+        return window
+
+    def test_restores_the_closed_window_then_catches_up(self):
+        window = self._window()
+        self.assertEqual(sorted(window.selection["files"]), sorted(self.files))
+        window.schedule_model.append([ScheduleEntry(5, 45)])
+        window.close()
+        schedule = window.schedule_model.entries()
+        self.assertEqual(schedule[-1], ScheduleEntry(5, 45))
+        self.assertTrue(snapshot_path().exists())
+
+        added = self._touch("b", "new.jpg")
+        os.remove(self.files[0])
+        window = MainApp()
+        # Shown as closed, before any scan
+        self.assertEqual(window.schedule_model.entries(), schedule)
+        self.assertEqual(window.preset_loader_box.currentIndex(), 1)
+        self.assertIn(self.files[0], window.selection["files"])
+        window.reconcile_pool.waitForDone()
+        app.processEvents()
+        self.assertEqual(
+            sorted(window.selection["files"]), sorted(self.files[1:] + [added])
+        )
+
+    def test_changes_made_meanwhile_are_kept(self):
+        self._window().close()
+        added = self._touch("b", "new.jpg")
+        window = MainApp()
+        extra = os.path.join(self.dir, "extra.jpg")
+        window.selection["files"].append(extra)
+        window.reconcile_pool.waitForDone()
+        app.processEvents()
+        self.assertIn(added, window.selection["files"])
+        self.assertEqual(window.selection["files"][-1], extra)
+        # A cleared selection stays cleared
+        window.close()
+        self._touch("b", "newer.jpg")
+        window = MainApp()
+        window.remove_items()
+        window.reconcile_pool.waitForDone()
+        app.processEvents()
+        self.assertEqual(window.selection["files"], [])
+
+    def test_dropped_files_stay_dropped(self):
+        window = self._window()
+        window.selection["files"].remove(self.files[0])  # as Remove duplicates does
+        window.close()
+        added = self._touch("b", "new.jpg")
+        window = self._window()
+        self.assertEqual(window.selection["files"], self.files[1:] + [added])
+        window.close()
+        window = self._window()
+        self.assertEqual(window.selection["files"], self.files[1:] + [added])
+
+    def test_newer_recent_session_wins(self):
+        self._window().close()
+        # A session was started with other settings and the app didn't exit
+        self.recent["recent_preset"] = 0
+        self._save_config()
+        window = self._window()
+        self.assertEqual(window.preset_loader_box.currentIndex(), 0)
+        self.assertEqual(window.schedule_model.entries(), [ScheduleEntry(1, 30)])
+
+
+if __name__ == "__main__":
+    unittest.main()
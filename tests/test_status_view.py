@@ -0,0 +1,109 @@
+"""
+Tests for gesturesesh.ui.status_view: one block per status message,
+incremental restyling and recovery from outside edits.
+"""
+
+import os
+import sys
+import unittest
+
+from PyQt5 import QtGui, QtWidgets
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.main import StatusMessage
+from gesturesesh.ui.status_view import StatusView
+
+
+def block_texts(document):
+    return document.toPlainText().split("\n")
+
+
+def block_color(document, number):
+    block = document.findBlockByNumber(number)
+    return block.begin().fragment().charFormat().foreground().color()
+
+
+class TestStatusView(unittest.TestCase):
+    def setUp(self):
+        self.edit = QtWidgets.QTextEdit()
+        self.view = StatusView(self.edit)
+        self.messages = [StatusMessage(f"msg {i}", 1000) for i in range(3)]
+
+    def tearDown(self):
+        self.edit.deleteLater()
+
+    def test_newest_first_one_block_each(self):
+        self.view.sync(self.messages)
+        self.assertIs(self.edit.document(), self.view.document)
+        self.assertEqual(block_texts(self.view.document), ["msg 2", "msg 1", "msg 0"])
+        self.assertEqual(self.view.document.blockCount(), 3)
+
+    def test_add_and_remove_messages(self):
+        self.view.sync(self.messages)
+        self.messages.append(StatusMessage("new", 1000, is_error=True))
+        del self.messages[1]
+        self.view.sync(self.messages)
+        self.assertEqual(block_texts(self.view.document), ["new", "msg 2", "msg 0"])
+        self.assertEqual(block_color(self.view.document, 0).red(), 220)
+        self.assertEqual(block_color(self.view.document, 1).red(), 102)
+        self.messages[:] = self.messages[:1]
+        self.view.sync(self.messages)
+        self.assertEqual(block_texts(self.view.document), ["msg 0"])
+
+    def test_coalesced_message_moves_and_updates(self):
+        self.view.sync(self.messages)
+        oldest = self.messages.pop(0)
+        oldest.count = 2
+        self.messages.append(oldest)
+        self.view.sync(self.messages)
+        self.assertEqual(block_texts(self.view.document), ["msg 0 (×2)", "msg 2", "msg 1"])
+        self.assertEqual(self.view.document.blockCount(), 3)
+
+    def test_fade_steps_leave_document_alone(self):
+        self.view.sync(self.messages)
+        self.messages[1].opacity = 1.0
+        self.view.mark_dirty(self.messages[1])
+        self.view.flush()  # switches the message to its animated style
+        changes = []
+        self.view.document.contentsChange.connect(lambda *args: changes.append(args))
+        for opacity in (0.8, 0.5):
+            self.messages[1].opacity = opacity
+            self.view.mark_dirty(self.messages[1])
+            self.view.flush()
+        self.assertEqual(changes, [])
+        (selection,) = self.edit.extraSelections()
+        self.assertEqual(selection.cursor.selectedText(), "msg 1")
+        self.assertAlmostEqual(selection.format.foreground().color().alphaF(), 0.5, places=2)
+
+    def test_finished_animation_clears_tint(self):
+        self.view.sync(self.messages)
+        self.messages[2].opacity = 0.3
+        self.view.sync(self.messages)
+        self.assertEqual(len(self.edit.extraSelections()), 1)
+        self.messages[2].opacity = None
+        self.view.mark_dirty(self.messages[2])
+        self.view.flush()
+        self.assertEqual(self.edit.extraSelections(), [])
+
+    def test_outside_edit_triggers_rebuild(self):
+        self.view.sync(self.messages)
+        self.edit.setText("Cannot save an empty schedule!")
+        self.view.flush()
+        self.assertEqual(block_texts(self.view.document), ["msg 2", "msg 1", "msg 0"])
+
+    def test_detach_switches_to_plain_document(self):
+        self.view.sync(self.messages)
+        self.view.detach()
+        self.assertIs(self.edit.document(), self.view.plain_document)
+        self.view.sync(self.messages)
+        self.assertIs(self.edit.document(), self.view.document)
+
+
+if __name__ == "__main__":
+    unittest.main()
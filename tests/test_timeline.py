@@ -0,0 +1,94 @@
+"""
+Tests for gesturesesh.timeline: Fenwick prefix sums and the session
+timeline's remaining-time, next-break and position queries.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh.schedule import ScheduleEntry
+from gesturesesh.timeline import FenwickTree, SessionTimeline, format_duration
+
+
+class TestFenwickTree(unittest.TestCase):
+    def test_matches_naive_sums(self):
+        rng = random.Random(7)
+        values = [rng.randint(0, 100) for _ in range(257)]
+        tree = FenwickTree(values)
+        for _ in range(200):
+            index = rng.randrange(len(values))
+            delta = rng.randint(-5, 30)
+            if values[index] + delta < 0:
+                continue
+            values[index] += delta
+            tree.add(index, delta)
+            count = rng.randrange(len(values) + 1)
+            self.assertEqual(tree.prefix(count), sum(values[:count]))
+            target = rng.uniform(0, sum(values))
+            found = tree.search(target)
+            self.assertLessEqual(sum(values[:found]), target)
+            if found < len(values):
+                self.assertGreater(sum(values[: found + 1]), target)
+
+
+class TestSessionTimeline(unittest.TestCase):
+    def setUp(self):
+        # Slots: 30 30 | break 120 | 60 60 60 | break 300 | 600
+        self.timeline = SessionTimeline(
+            [
+                ScheduleEntry(2, 30),
+                ScheduleEntry(0, 120),
+                ScheduleEntry(3, 60),
+                ScheduleEntry(0, 300),
+                ScheduleEntry(1, 600),
+            ]
+        )
+
+    def test_layout(self):
+        self.assertEqual(len(self.timeline), 8)
+        self.assertEqual(self.timeline.total, 1260)
+        self.assertEqual(self.timeline.start(3), 180)
+        self.assertTrue(self.timeline.is_break(2))
+        self.assertFalse(self.timeline.is_break(3))
+
+    def test_remaining_and_next_break(self):
+        self.timeline.seek(0)
+        self.assertEqual(self.timeline.remaining(20), 1250)
+        self.assertEqual(self.timeline.until_next_break(20), 50)
+        self.timeline.seek(2)  # on a break, the next one is later
+        self.assertEqual(self.timeline.until_next_break(120), 300)
+        self.timeline.seek(7)
+        self.assertIsNone(self.timeline.until_next_break(600))
+        self.assertEqual(self.timeline.remaining(10), 10)
+        self.assertEqual(self.timeline.elapsed(10), 1250)
+
+    def test_position_at(self):
+        self.assertEqual(self.timeline.position_at(0), 0)
+        self.assertEqual(self.timeline.position_at(59), 1)
+        self.assertEqual(self.timeline.position_at(60), 2)
+        self.assertEqual(self.timeline.position_at(10_000), 7)
+
+    def test_extend_keeps_offsets_correct(self):
+        self.timeline.seek(3)
+        self.timeline.extend(3, 30)  # +30 s on the current image
+        self.assertEqual(self.timeline.total, 1290)
+        self.assertEqual(self.timeline.remaining(90), 1290 - 180)
+        self.assertEqual(self.timeline.until_next_break(90), 90 + 120)
+        self.assertEqual(self.timeline.start(6), 390)
+        self.assertEqual(self.timeline.position_at(275), 4)
+        # Seeking away and back recomputes the same answers
+        self.timeline.seek(0)
+        self.timeline.seek(3)
+        self.assertEqual(self.timeline.until_next_break(90), 210)
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(75), "1:15")
+        self.assertEqual(format_duration(3725), "1:02:05")
+
+
+if __name__ == "__main__":
+    unittest.main()
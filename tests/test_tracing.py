@@ -0,0 +1,79 @@
+"""
+Tests for gesturesesh.tracing: opt-in spans written as Chrome trace events.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from gesturesesh import tracing
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.previous = tracing.tracer()
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "trace.json")
+
+    def tearDown(self):
+        tracing._tracer = self.previous
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_disabled_tracing_leaves_code_alone(self):
+        tracing.disable()
+
+        def work():
+            return 1
+
+        self.assertIs(tracing.traced()(work), work)
+        self.assertIs(tracing.span("a"), tracing.span("b"))
+        tracing.instant("nothing")
+        tracing.write()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_spans_are_written_as_trace_events(self):
+        tracing.enable(self.path)
+
+        @tracing.traced()
+        def decode(value):
+            with tracing.span("inner", size=value):
+                return value * 2
+
+        self.assertEqual(decode(21), 42)
+        tracing.instant("image", position=3)
+        with self.assertRaises(ZeroDivisionError):
+            tracing.traced("failing")(lambda: 1 / 0)()
+        tracing.write()
+
+        with open(self.path, encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        by_name = {event["name"]: event for event in events}
+        outer = by_name["TestTracing.test_spans_are_written_as_trace_events.<locals>.decode"]
+        inner = by_name["inner"]
+        self.assertEqual(outer["ph"], "X")
+        self.assertEqual(inner["args"], {"size": 21})
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+        self.assertEqual(by_name["image"]["ph"], "i")
+        self.assertIn("failing", by_name)  # recorded even when it raises
+        self.assertEqual(by_name["thread_name"]["ph"], "M")
+
+    def test_requested_path(self):
+        requested = tracing._requested_path
+        self.assertIsNone(requested([], {}))
+        self.assertIsNone(requested([], {tracing.ENV_VAR: "0"}))
+        self.assertEqual(requested([], {tracing.ENV_VAR: "1"}), tracing.DEFAULT_TRACE_FILE)
+        self.assertEqual(requested([], {tracing.ENV_VAR: "s.json"}), "s.json")
+        self.assertEqual(requested(["--trace"], {}), tracing.DEFAULT_TRACE_FILE)
+        self.assertEqual(requested(["--trace", "--other"], {}), tracing.DEFAULT_TRACE_FILE)
+        self.assertEqual(requested(["--trace", "a.json"], {}), "a.json")
+        self.assertEqual(requested(["--trace=b.json"], {tracing.ENV_VAR: "c.json"}), "b.json")
+
+
+if __name__ == "__main__":
+    unittest.main()